@@ -1,99 +1,268 @@
+import cache_resultados
+import escrita
+import esparso
 import heapq
-from collections import defaultdict, deque
+import instrumentacao
+import multiprocessing
+import operator
+import os
+from array import array
+from bisect import bisect_left
+from collections import deque
+from itertools import repeat
 
 #CONTAGEM DE COMPONENTES CONEXAS
 
 #GRAFO NÃO DIRECIONADO
+@instrumentacao.medido()
+@cache_resultados.memorizar()
 def comp_conexas(grafo):
-    visitados = set() # nos visitados
-    componentes = [] # componentes conexas
-
-    for vertice in grafo.nodes:
-        if vertice not in visitados:
-            componente = []
-            fila = [vertice] #inicio da DFS 
-            while fila:
-                atual = heapq.heappop(fila) # pilha utilizando heapq
-                if atual not in visitados:
-                    visitados.add(atual) # marca o nó como já visitado
-                    componente.append(atual)
-                    for vizinho in grafo.adj_list[atual]:
-                        if isinstance(vizinho, tuple): # pega apenas o vizinho se vier tupla
-                            vizinho = vizinho[0]
-                        if vizinho not in visitados:
-                            heapq.heappush(fila, vizinho)
-            componentes.append(componente)
+    # agrupa os vértices pela raiz no union-find mantido pelo grafo
+    componentes = agrupar_componentes(grafo, rotular_conexas(grafo))
+    instrumentacao.contar('vertices', len(grafo.names))
     return componentes
 
+def agrupar_componentes(grafo, rotulos):
+    """
+    Listas de nomes de cada componente a partir de (rotulo, tamanhos) de
+    rotular_conexas ou rotular_fortemente_conexas, calculados antes (por
+    exemplo, numa tarefa do pipeline que outras seções reaproveitam).
+    """
+    rotulo, tamanhos = rotulos
+    componentes = [[] for _ in range(len(tamanhos))]
+    for nome, c in zip(grafo.names, rotulo):
+        componentes[c].append(nome)
+    return componentes
+
+@instrumentacao.medido()
+def rotular_conexas(grafo):
+    """
+    Rótulos compactos das componentes conexas (fracamente conexas, se o grafo
+    for direcionado) a partir do union-find do grafo: O(V+E) para montá-lo,
+    se ainda não existe, e mais uma passada O(V) para numerar.
+
+    Retorna (rotulo, tamanhos) no formato de rotular_fortemente_conexas, com
+    as componentes numeradas na ordem do primeiro vértice de cada uma. Fica
+    guardado no grafo até a próxima alteração (não altere os arrays).
+    """
+    rotulos = grafo._derivados.get('rotulos_conexas')
+    if rotulos is not None:
+        return rotulos
+    if esparso.usar(grafo):
+        rotulos = grafo._derivados['rotulos_conexas'] = esparso.rotular_conexas(grafo)
+        return rotulos
+    uf = grafo.components()
+    n = len(grafo.names)
+    instrumentacao.contar('vertices', n)
+    rotulo = array('i', [-1]) * n
+    da_raiz = array('i', [-1]) * n # raiz do union-find -> id compacto
+    tamanhos = array('i')
+    for i in range(n):
+        raiz = uf.find(i)
+        c = da_raiz[raiz]
+        if c == -1:
+            c = da_raiz[raiz] = len(tamanhos)
+            tamanhos.append(uf.size[raiz])
+        rotulo[i] = c
+    rotulos = grafo._derivados['rotulos_conexas'] = (rotulo, tamanhos)
+    return rotulos
+
 
 # GRAFO DIRECIONADO
-#Primeira DFS para o grafo original
-def dfs_gerar_ordem(grafo, vertice, visitados, pilha):
-    fila = [vertice] #simula pilha para DFS
-    caminho = [] # ordem de visita dos vertices com base do vertice inicial
-
-    while fila:
-        atual = heapq.heappop(fila) #vertice com menor prioridade
-        if atual not in visitados:
-            visitados.add(atual) 
-            caminho.append(atual)
-            for vizinho in grafo.adj_list[atual]:
-                if isinstance(vizinho, tuple):
-                    vizinho = vizinho[0]
-                if vizinho not in visitados:
-                    heapq.heappush(fila, vizinho)
-    pilha.extend(caminho[::-1])  # adiciona o caminho percorrido na pilha em ordem inversa
-
-#grafo transposto (inverte as arestas)
-def transpor_grafo(grafo):
-    grafo_transposto = defaultdict(list) #novo grafo com arestas invertidas
-    for u in grafo.nodes:
-        for v in grafo.adj_list[u]:
-            if isinstance(v, tuple):
-                v = v[0]
-            grafo_transposto[v].append(u)
-    
-    return grafo_transposto
-
-#dfs no grafo transposto
-def dfs_transposto(grafo, vertice, visitados, componente):
-    fila = [vertice]
-    while fila:
-        atual = heapq.heappop(fila)
-        if atual not in visitados:
-            visitados.add(atual)
-            componente.append(atual)
-            for vizinho in grafo[atual]:
-                if isinstance(vizinho, tuple):
-                    vizinho = vizinho[0]
-                if vizinho not in visitados:
-                    heapq.heappush(fila, vizinho)
-
-#Função principal do Kosaraju, retorna fortemente conexas
+@instrumentacao.medido()
+def rotular_fortemente_conexas(grafo):
+    """
+    Algoritmo de Tarjan iterativo direto sobre os arrays do grafo, em O(V+E).
+
+    Retorna (rotulo, tamanhos): rotulo[i] é o id da componente fortemente
+    conexa do vértice de id i e tamanhos[c] é o número de vértices da
+    componente c. As componentes saem em ordem topológica reversa.
+    Usa só alguns arrays de inteiros por vértice (sem grafo transposto).
+    Fica guardado no grafo até a próxima alteração (não altere os arrays).
+    """
+    rotulos = grafo._derivados.get('rotulos_fortemente_conexas')
+    if rotulos is not None:
+        return rotulos
+    if esparso.usar(grafo):
+        rotulos = grafo._derivados['rotulos_fortemente_conexas'] = esparso.rotular_fortemente_conexas(grafo)
+        return rotulos
+    offsets, targets, _ = grafo.csr()
+    n = len(grafo.names)
+    instrumentacao.contar('vertices', n)
+    instrumentacao.contar('arestas', len(targets))
+    indice = array('i', [-1]) * n     # ordem de descoberta (-1 = não visitado)
+    low = array('i', [0]) * n         # menor índice alcançável pela subárvore
+    rotulo = array('i', [-1]) * n     # componente de cada vértice (-1 = ainda na pilha)
+    prox = array('q', offsets[:n])    # próxima aresta a examinar de cada vértice
+    pilha = array('i')                # pilha de Tarjan
+    chamadas = array('i')             # simula a pilha de recursão da DFS
+    tamanhos = array('i')
+    contador = 0
+
+    for raiz in range(n):
+        if indice[raiz] != -1:
+            continue
+        indice[raiz] = low[raiz] = contador
+        contador += 1
+        pilha.append(raiz)
+        chamadas.append(raiz)
+
+        while chamadas:
+            v = chamadas[-1]
+            k, fim = prox[v], offsets[v + 1]
+            desceu = False
+            while k < fim:
+                w = targets[k]
+                k += 1
+                if indice[w] == -1:
+                    # "chamada recursiva": continua de w e volta para v depois
+                    prox[v] = k
+                    indice[w] = low[w] = contador
+                    contador += 1
+                    pilha.append(w)
+                    chamadas.append(w)
+                    desceu = True
+                    break
+                if rotulo[w] == -1 and indice[w] < low[v]:  # w ainda na pilha
+                    low[v] = indice[w]
+            if desceu:
+                continue
+
+            prox[v] = k
+            chamadas.pop()
+            if low[v] == indice[v]:
+                # v é raiz de uma componente: desempilha até ele
+                c = len(tamanhos)
+                tamanho = 0
+                while True:
+                    w = pilha.pop()
+                    rotulo[w] = c
+                    tamanho += 1
+                    if w == v:
+                        break
+                tamanhos.append(tamanho)
+            if chamadas:
+                u = chamadas[-1]
+                if low[v] < low[u]:
+                    low[u] = low[v]
+
+    rotulos = grafo._derivados['rotulos_fortemente_conexas'] = (rotulo, tamanhos)
+    return rotulos
+
+#Retorna as fortemente conexas como listas de nomes
+@instrumentacao.medido()
+@cache_resultados.memorizar()
 def comp_fortemente_conexas(grafo):
-    visitados = set() # conjunto de vertices visitados na primeira DFS
-    pilha = [] 
+    return agrupar_componentes(grafo, rotular_fortemente_conexas(grafo)) # retorna todas as componentes achadas
 
-    # Percorre todo o grafo original
-    for vertice in grafo.nodes:
-        if vertice not in visitados:
-            dfs_gerar_ordem(grafo, vertice, visitados, pilha)
-    
-    # Transpõe o grafo
-    grafo_transposto = transpor_grafo(grafo)
+# ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚
 
-    visitados.clear()  # limpa o conjunto de visitados para a segunda DFS
-    componentes = []   # lista final com todas as componentes fortemente conexas
+# CAMINHOS MÍNIMOS
 
-    # Percorre grafo transposto em ordem inversa
-    while pilha:
-        vertice = pilha.pop()
-        if vertice not in visitados:
-            componente = []
-            dfs_transposto(grafo_transposto, vertice, visitados, componente)
-            componentes.append(componente)
+MAX_PESO_BALDES = 1 << 16 # maior peso inteiro que ainda usa a fila de baldes
 
-    return componentes # retorna todas as componentes achadas
+def peso_maximo_baldes(grafo):
+    """
+    Maior peso C do grafo se todos os pesos são inteiros entre 1 e
+    MAX_PESO_BALDES (caso das contagens de colaboração), senão None.
+    """
+    faixa = grafo.weight_range()
+    if faixa is None:
+        return None
+    menor, maior = faixa
+    if isinstance(menor, int) and menor >= 1 and maior <= MAX_PESO_BALDES:
+        return maior
+    return None
+
+def caminhos_minimos(grafo, s, alvo=None):
+    """
+    Dijkstra a partir do vértice de id s, contando os caminhos mínimos.
+    Com pesos inteiros pequenos usa a fila de baldes de Dial (C + 1 baldes
+    circulares, O(E + maior distância)); com outros pesos, heap binário.
+    Se alvo for dado, para assim que ele é fixado.
+
+    Retorna (ordem, distancia, sigma): os vértices fixados em ordem de
+    distância, e listas indexadas por id com a distância (inf se não foi
+    alcançado) e o número de caminhos mínimos de s até cada vértice.
+    """
+    n = len(grafo.names)
+    distancia = [float('inf')] * n
+    sigma = [0] * n # numero de caminhos mais curtos de s ate v
+    distancia[s] = 0
+    sigma[s] = 1
+    ordem = []
+    maior = peso_maximo_baldes(grafo)
+    if maior is None:
+        _dijkstra_heap(grafo, s, alvo, distancia, sigma, ordem)
+    else:
+        _dijkstra_baldes(grafo, s, alvo, maior, distancia, sigma, ordem)
+    return ordem, distancia, sigma
+
+def _dijkstra_heap(grafo, s, alvo, distancia, sigma, ordem):
+    visitado = bytearray(len(grafo.names))
+    neighbors = grafo.neighbors
+    heap = [(0, s)]
+    while heap:
+        dist_v, v = heapq.heappop(heap)
+        if visitado[v]:
+            continue
+        visitado[v] = 1
+        ordem.append(v)
+        if v == alvo:
+            return
+        sigma_v = sigma[v]
+        for w, peso in neighbors(v):
+            if visitado[w]:
+                continue
+            nova = dist_v + peso
+            # Se encontrou um caminho mais curto
+            if nova < distancia[w]:
+                distancia[w] = nova
+                sigma[w] = sigma_v
+                heapq.heappush(heap, (nova, w))
+            # Se encontrou um caminho de mesmo comprimento
+            elif nova == distancia[w]:
+                sigma[w] += sigma_v
+
+def _dijkstra_baldes(grafo, s, alvo, maior, distancia, sigma, ordem):
+    # as distâncias pendentes ficam sempre em [d, d + maior], então maior + 1
+    # baldes circulares bastam; entradas velhas (distância já melhorada) são
+    # descartadas ao esvaziar o balde
+    neighbors = grafo.neighbors
+    n_baldes = maior + 1
+    baldes = [None] * n_baldes # cada balde só vira lista quando recebe alguém
+    baldes[0] = [s]
+    pendentes = 1
+    d = 0
+    while pendentes:
+        i = d % n_baldes
+        balde = baldes[i]
+        if balde:
+            baldes[i] = None
+            pendentes -= len(balde)
+            for v in balde:
+                if distancia[v] != d:
+                    continue
+                ordem.append(v)
+                if v == alvo:
+                    return
+                sigma_v = sigma[v]
+                # pesos >= 1: vizinho já fixado nunca melhora nem empata
+                for w, peso in neighbors(v):
+                    nova = d + peso
+                    dist_w = distancia[w]
+                    if nova < dist_w:
+                        distancia[w] = nova
+                        sigma[w] = sigma_v
+                        j = nova % n_baldes
+                        if baldes[j] is None:
+                            baldes[j] = [w]
+                        else:
+                            baldes[j].append(w)
+                        pendentes += 1
+                    elif nova == dist_w:
+                        sigma[w] += sigma_v
+        d += 1
 
 # ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚
 
@@ -102,8 +271,10 @@ def comp_fortemente_conexas(grafo):
 
 def mst_prim(graph, start):
     """
-    Implementação do algoritmo de Prim usando heapq para encontrar a MST
-    da componente que contém o vértice start.
+    Árvore Geradora Mínima da componente que contém o vértice start.
+    A floresta do grafo inteiro é calculada uma vez com Prim de heap indexado
+    (floresta_geradora_minima) e as chamadas seguintes, para qualquer
+    vértice, só consultam o resultado.
     """
     if graph.directed:
         raise ValueError("Esta função só funciona com grafos não direcionados")
@@ -114,37 +285,188 @@ def mst_prim(graph, start):
     
     print(f"Calculando Árvore Geradora Mínima a partir do vértice '{start}'...")
     
-    # Encontra a componente conexa que contém start
-    component = get_component_nodes(graph, start)
-    if len(component) <= 1:
+    agm, custo_total = mst_do_vertice(graph, start, metodo='prim')
+    if not agm:
         print(f"Vértice '{start}' está isolado")
         return [], 0
-    
-    # Implementação de Prim com heapq
-    visitado = set()
-    agm = []
-    custo_total = 0
-    fila = []
-
-    # Inicializa com o vértice start
-    visitado.add(start)
-    for viz, peso in graph.adj_list.get(start, []):
-        if viz in component:  # Só adiciona arestas para vértices da componente
-            heapq.heappush(fila, (peso, start, viz))
-
-    while fila and len(visitado) < len(component):
-        peso, u, v = heapq.heappop(fila)
-        if v not in visitado:
-            visitado.add(v)
-            agm.append((u, v, peso))
-            custo_total += peso
-            for viz, p in graph.adj_list.get(v, []):
-                if viz in component and viz not in visitado:  # Só adiciona arestas para vértices da componente
-                    heapq.heappush(fila, (p, v, viz))
 
     print(f"Árvore Geradora Mínima calculada com custo total: {custo_total}")
     return agm, custo_total
 
+def mst_do_vertice(grafo, vertice, metodo='kruskal'):
+    """
+    (arestas, custo) da árvore geradora mínima da componente de vertice,
+    com as arestas como (nome, nome, peso). Vértice isolado ou fora do
+    grafo: ([], 0).
+    """
+    s = grafo.node_id(vertice)
+    if s is None:
+        return [], 0
+    floresta = floresta_geradora_minima(grafo, metodo)
+    c = floresta['componente'][s]
+    nomes = grafo.names
+    arestas = [(nomes[u], nomes[v], peso) for u, v, peso in floresta['arestas'][c]]
+    return arestas, floresta['custo'][c]
+
+def floresta_geradora_minima(grafo, metodo='kruskal'):
+    """
+    Floresta geradora mínima do grafo inteiro (uma árvore por componente).
+    metodo: 'kruskal' (arestas ordenadas + união-busca) ou 'prim' (heap
+    indexado com diminuição de chave).
+
+    Retorna dict com:
+      'componente': array id do vértice -> índice da componente
+      'arestas': por componente, lista de (id, id, peso)
+      'custo': por componente, soma dos pesos
+    O resultado fica guardado no grafo até a próxima aresta ou vértice novo,
+    e em disco pelo cache_resultados.
+    """
+    if grafo.directed:
+        raise ValueError("Esta função só funciona com grafos não direcionados")
+    chave = ('floresta_geradora_minima', metodo)
+    floresta = grafo._derivados.get(chave)
+    if floresta is None:
+        floresta = grafo._derivados[chave] = _calcular_floresta(grafo, metodo)
+    return floresta
+
+@instrumentacao.medido()
+@cache_resultados.memorizar()
+def _calcular_floresta(grafo, metodo):
+    if metodo == 'kruskal':
+        arestas = esparso.kruskal(grafo) if esparso.usar(grafo) else _kruskal(grafo)
+    elif metodo == 'prim':
+        arestas = _prim_indexado(grafo)
+    else:
+        raise ValueError(f"Método desconhecido: {metodo}")
+    instrumentacao.contar('vertices', len(grafo.names))
+    instrumentacao.contar('arestas_floresta', len(arestas))
+    return _separar_por_componente(grafo, arestas)
+
+def _arestas_ordenadas(grafo):
+    # cada aresta uma vez (u < v, laços de fora), em arrays paralelos,
+    # e a ordem dos índices por peso
+    offsets, targets, weights = grafo.csr()
+    origens = array('i')
+    destinos = array('i')
+    pesos = []
+    for u in range(len(grafo.names)):
+        a, b = offsets[u], offsets[u + 1]
+        inicio = bisect_left(targets, u + 1, a, b) # linhas do CSR são ordenadas
+        if inicio < b:
+            origens.extend(repeat(u, b - inicio))
+            destinos.extend(targets[inicio:b])
+            pesos.extend(weights[inicio:b])
+    ordem = sorted(range(len(pesos)), key=pesos.__getitem__)
+    return origens, destinos, pesos, ordem
+
+def _kruskal(grafo):
+    # Kruskal: arestas em ordem de peso, união-busca descarta as que fecham ciclo
+    from grafos import UniaoBusca
+    n = len(grafo.names)
+    origens, destinos, pesos, ordem = _arestas_ordenadas(grafo)
+    uf = UniaoBusca(n)
+    find = uf.find
+    faltam = n - grafo.n_components() # arestas numa floresta geradora
+    agm = []
+    for k in ordem:
+        if not faltam:
+            break
+        u, v = origens[k], destinos[k]
+        if find(u) != find(v):
+            uf.union(u, v)
+            agm.append((u, v, pesos[k]))
+            faltam -= 1
+    return agm
+
+def _prim_indexado(grafo):
+    """
+    Prim sobre todas as componentes com heap binário indexado: cada vértice
+    aparece no máximo uma vez no heap e a chave só diminui (posicao[v] diz
+    onde ele está), então o heap nunca passa de V entradas.
+    """
+    n = len(grafo.names)
+    infinito = float('inf')
+    chave = [infinito] * n # menor peso de aresta ligando v à árvore
+    pai = array('i', [-1]) * n
+    posicao = array('i', [-1]) * n # -1: fora do heap
+    na_arvore = bytearray(n)
+    heap = []
+    neighbors = grafo.neighbors
+    agm = []
+
+    def subir(k):
+        v = heap[k]
+        while k > 0:
+            p = (k - 1) >> 1
+            if chave[heap[p]] <= chave[v]:
+                break
+            heap[k] = heap[p]
+            posicao[heap[k]] = k
+            k = p
+        heap[k] = v
+        posicao[v] = k
+
+    def descer(k):
+        v = heap[k]
+        tamanho = len(heap)
+        while True:
+            f = 2 * k + 1
+            if f >= tamanho:
+                break
+            if f + 1 < tamanho and chave[heap[f + 1]] < chave[heap[f]]:
+                f += 1
+            if chave[v] <= chave[heap[f]]:
+                break
+            heap[k] = heap[f]
+            posicao[heap[k]] = k
+            k = f
+        heap[k] = v
+        posicao[v] = k
+
+    for raiz in range(n):
+        if na_arvore[raiz]:
+            continue
+        chave[raiz] = 0
+        heap.append(raiz)
+        posicao[raiz] = 0
+        while heap:
+            u = heap[0]
+            ultimo = heap.pop()
+            if heap:
+                heap[0] = ultimo
+                descer(0)
+            posicao[u] = -1
+            na_arvore[u] = 1
+            if pai[u] >= 0:
+                agm.append((pai[u], u, chave[u]))
+            for v, peso in neighbors(u):
+                if na_arvore[v] or peso >= chave[v]:
+                    continue
+                chave[v] = peso
+                pai[v] = u
+                if posicao[v] < 0:
+                    heap.append(v)
+                    subir(len(heap) - 1)
+                else:
+                    subir(posicao[v]) # diminuição de chave
+    return agm
+
+def _separar_por_componente(grafo, arestas):
+    # agrupa as arestas da floresta pela componente (em ordem do menor id)
+    uf = grafo.components()
+    n = len(grafo.names)
+    componente = array('i', bytes(4 * n))
+    indice = {}
+    for v in range(n):
+        componente[v] = indice.setdefault(uf.find(v), len(indice))
+    por_componente = [[] for _ in range(len(indice))]
+    custo = [0] * len(indice)
+    for u, v, peso in arestas:
+        c = componente[u]
+        por_componente[c].append((u, v, peso))
+        custo[c] += peso
+    return {'componente': componente, 'arestas': por_componente, 'custo': custo}
+
 def get_component_nodes(graph, start_node):
     """
     Encontra todos os nós da componente conexa que contém start_node.
@@ -153,34 +475,41 @@ def get_component_nodes(graph, start_node):
     if start_node not in graph.nodes:
         return set()
     
-    component = set()
-    queue = [start_node]
-    component.add(start_node)
+    inicio = graph.node_id(start_node)
+    if esparso.usar(graph):
+        return {graph.names[i] for i in esparso.alcancaveis(graph, inicio)}
+    visitado = bytearray(len(graph.names))
+    visitado[inicio] = 1
+    queue = deque([inicio])
     
     while queue:
-        current = queue.pop(0)
-        for neighbor, weight in graph.adj_list[current]:
-            if neighbor not in component:
-                component.add(neighbor)
+        current = queue.popleft()
+        for neighbor in graph.neighbor_ids(current):
+            if not visitado[neighbor]:
+                visitado[neighbor] = 1
                 queue.append(neighbor)
     
-    return component
+    return {graph.names[i] for i in range(len(visitado)) if visitado[i]}
 
 
 def get_mst_info_string(node_x, mst_edges, total_cost):
     """Retorna informações sobre a MST como string para salvar em arquivo"""
-    info = f"𓂃༞♡ Árvore Geradora Mínima para '{node_x}' ♡༞𓂃\n"
-    info += f"Número de arestas na MST: {len(mst_edges)}\n"
-    info += f"Custo total da MST: {total_cost}\n\n"
+    return escrita.em_texto(escrever_mst, node_x, mst_edges, total_cost)
+
+def escrever_mst(saida, node_x, mst_edges, total_cost):
+    """Escreve as informações da MST em saida (escrita.Saida), uma aresta por vez"""
+    saida.escrever(f"𓂃༞♡ Árvore Geradora Mínima para '{node_x}' ♡༞𓂃\n")
+    saida.escrever(f"Número de arestas na MST: {len(mst_edges)}\n")
+    saida.escrever(f"Custo total da MST: {total_cost}\n\n")
+    saida.registro('mst', vertice=node_x, arestas=len(mst_edges), custo=total_cost)
     
     if mst_edges:
-        info += "Arestas da MST:\n"
+        saida.escrever("Arestas da MST:\n")
         for u, v, weight in mst_edges:
-            info += f"  {u} -- {weight} -- {v}\n"
+            saida.escrever(f"  {u} -- {weight} -- {v}\n")
+            saida.registro('aresta', u=u, v=v, peso=weight)
     else:
-        info += "Nenhuma MST encontrada (nó isolado ou não existe no grafo)\n"
-    
-    return info
+        saida.escrever("Nenhuma MST encontrada (nó isolado ou não existe no grafo)\n")
 
 # ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚
 
@@ -201,15 +530,14 @@ def degree_centrality(graph, node):
         return 0.0
     
     # Calcula o grau do nó
+    i = graph.node_id(node)
     if graph.directed:
         # Para grafo direcionado: grau de entrada + grau de saída
-        out_degree = len(graph.adj_list.get(node, []))
-        in_degree = sum(1 for adj_list in graph.adj_list.values() 
-                       for neighbor, _ in adj_list if neighbor == node)
-        degree = out_degree + in_degree
+        # (o grau de entrada vem do índice mantido pelo grafo, O(1))
+        degree = graph.degree(i) + graph.in_degree(i)
     else:
         # Para grafo não direcionado: número de vizinhos
-        degree = len(graph.adj_list.get(node, []))
+        degree = graph.degree(i)
     
     # Número máximo de conexões possíveis (n-1)
     max_degree = len(graph.nodes) - 1
@@ -226,41 +554,52 @@ def print_degree_centrality(graph, node):
     print(f"\n ˗ˋˏ ♡ ˎˊ˗ Centralidade de Grau para '{node}'  ˗ˋˏ ♡ ˎˊ˗")
     print(f"Centralidade: {centrality:.4f}")
     
+    i = graph.node_id(node)
+    if i is None:
+        out_degree = in_degree = 0
+    else:
+        out_degree = graph.degree(i)
+        in_degree = graph.in_degree(i)
+
     if graph.directed:
-        out_degree = len(graph.adj_list.get(node, []))
-        in_degree = sum(1 for adj_list in graph.adj_list.values() 
-                       for neighbor, _ in adj_list if neighbor == node)
         print(f"Grau de saída: {out_degree}")
         print(f"Grau de entrada: {in_degree}")
         print(f"Grau total: {out_degree + in_degree}")
     else:
-        degree = len(graph.adj_list.get(node, []))
-        print(f"Grau: {degree}")
+        print(f"Grau: {out_degree}")
     
     print(f"Número total de nós no grafo: {len(graph.nodes)}")
     print(f"Grau máximo possível: {len(graph.nodes) - 1}")
 
 def get_degree_centrality_string(graph, node):
     """Retorna a centralidade de grau de um nó como string"""
+    return escrita.em_texto(escrever_centralidade_grau, graph, node)
+
+def escrever_centralidade_grau(saida, graph, node):
+    """Escreve a centralidade de grau de um nó em saida (escrita.Saida)"""
     centrality = degree_centrality(graph, node)
-    info = f"˗ˋˏ ♡ ˎˊ˗ Centralidade de Grau para '{node}'  ˗ˋˏ ♡ ˎˊ˗\n"
-    info += f"Centralidade: {centrality:.4f}\n"
+    saida.escrever(f"˗ˋˏ ♡ ˎˊ˗ Centralidade de Grau para '{node}'  ˗ˋˏ ♡ ˎˊ˗\n")
+    saida.escrever(f"Centralidade: {centrality:.4f}\n")
     
+    i = graph.node_id(node)
+    if i is None:
+        out_degree = in_degree = 0
+    else:
+        out_degree = graph.degree(i)
+        in_degree = graph.in_degree(i)
+
     if graph.directed:
-        out_degree = len(graph.adj_list.get(node, []))
-        in_degree = sum(1 for adj_list in graph.adj_list.values() 
-                       for neighbor, _ in adj_list if neighbor == node)
-        info += f"Grau de saída: {out_degree}\n"
-        info += f"Grau de entrada: {in_degree}\n"
-        info += f"Grau total: {out_degree + in_degree}\n"
+        saida.escrever(f"Grau de saída: {out_degree}\n")
+        saida.escrever(f"Grau de entrada: {in_degree}\n")
+        saida.escrever(f"Grau total: {out_degree + in_degree}\n")
     else:
-        degree = len(graph.adj_list.get(node, []))
-        info += f"Grau: {degree}\n"
-    
-    info += f"Número total de nós no grafo: {len(graph.nodes)}\n"
-    info += f"Grau máximo possível: {len(graph.nodes) - 1}\n\n"
+        saida.escrever(f"Grau: {out_degree}\n")
     
-    return info
+    saida.escrever(f"Número total de nós no grafo: {len(graph.nodes)}\n")
+    saida.escrever(f"Grau máximo possível: {len(graph.nodes) - 1}\n\n")
+    saida.registro('centralidade_grau', vertice=node, direcionado=graph.directed, centralidade=centrality,
+                   grau_saida=out_degree, grau_entrada=in_degree if graph.directed else out_degree,
+                   vertices=len(graph.nodes))
 
 # Função de teste para centralidade
 def test_degree_centrality():
@@ -286,150 +625,447 @@ def test_degree_centrality():
 
 #CENTRALIDADE DE INTERMEDIAÇÃO
 
-def betweenness_centrality(grafo, vertice_alvo):
+@cache_resultados.memorizar(ignorar=('workers', 'chunk_size'), semente='semente')
+def betweenness_centrality(grafo, vertice_alvo, workers=1, chunk_size=16, max_sources=500, semente=None):
     """
     Calcula a centralidade de intermediação de um vértice no grafo ponderado,
     retornando um valor normalizado entre 0 e 1.
     
-    grafo: dict {vertice: lista de (vizinho, peso)}
+    grafo: Grafo (ou dict {vertice: lista de (vizinho, peso)})
     vertice_alvo: vértice para o cálculo da centralidade
+    workers: número de processos (None = todos os núcleos)
+    chunk_size: quantos vértices fonte cada tarefa do pool processa
+    max_sources: máximo de vértices fonte (amostrados se o grafo for maior)
+    semente: semente da amostra de fontes (None = sorteio novo a cada
+    chamada, e o resultado não vai para o cache)
     
     Usa algoritmo de Brandes para grafos ponderados (Dijkstra).
     """
+    grafo = _como_grafo(grafo)
+    alvo = grafo.node_id(vertice_alvo)
     #verifica se o vertice alvo está no grafo, se não retorna 0
-    if vertice_alvo not in grafo:
+    if alvo is None:
         print(f"Vértice '{vertice_alvo}' não encontrado no grafo")
         return 0.0
     
-    vertices = list(grafo.keys())
-    n = len(vertices)
+    n = len(grafo.names)
     if n < 3:
         return 0.0  # centralidade = 0 para grafos muito pequenos
-    
-    centralidade = 0.0 # acumulador de centralidade
 
     # Otimização: para grafos grandes, limitar o número de vértices fonte
-    max_sources = min(500, n)  # máximo 500 vértices fonte para grafos ponderados
+    max_sources = min(max_sources, n)
     
     # Se o grafo é muito grande, amostrar vértices fonte
     if n > max_sources:
         import random
-        vertices_fonte = random.sample(vertices, max_sources)
+        vertices_fonte = random.Random(semente).sample(range(n), max_sources)
         # Sempre incluir o vértice alvo se não estiver na amostra
-        if vertice_alvo not in vertices_fonte:
-            vertices_fonte[0] = vertice_alvo
+        if alvo not in vertices_fonte:
+            vertices_fonte[0] = alvo
     else:
-        vertices_fonte = vertices
-
-    for s in vertices_fonte:
-        # Inicializa estruturas para Dijkstra de Brandes
-        pilha = []
-        predecessores = defaultdict(list)
-        sigma = defaultdict(int) # numero de caminhos mais curtos de s ate v
-        distancia = defaultdict(lambda: float('inf')) # distancia de s ate v
-        sigma[s] = 1
-        distancia[s] = 0
-
-        # Dijkstra com heap para encontrar caminhos mais curtos
-        heap = [(0, s)]
-        visitados = set()
-        
-        while heap:
-            dist_v, v = heapq.heappop(heap)
-            
-            if v in visitados:
-                continue
-                
-            visitados.add(v)
-            pilha.append(v)
-            
-            for w, peso in grafo.get(v, []):
-                if w in visitados:
-                    continue
-                    
-                # Se encontrou um caminho mais curto
-                if distancia[w] > dist_v + peso:
-                    distancia[w] = dist_v + peso
-                    sigma[w] = sigma[v]
-                    predecessores[w] = [v]
-                    heapq.heappush(heap, (distancia[w], w))
-                # Se encontrou um caminho de mesmo comprimento
-                elif distancia[w] == dist_v + peso:
-                    sigma[w] += sigma[v]
-                    predecessores[w].append(v)
-
-        delta = defaultdict(float) #inicia dependencias a zero
-        while pilha:
-            w = pilha.pop() #processa os vértices na ordem inversa do Dijkstra
-            for v in predecessores[w]:
-                if sigma[w] != 0: #evita divisão por zero
-                    # Atualiza a dependência de v com base na dependência de w e nos caminhos mínimos
-                    delta[v] += (sigma[v] / sigma[w]) * (1 + delta[w])
-            # se w é o vertice alvo, soma o delta para a centralidade
-            if w == vertice_alvo and w != s:
-                centralidade += delta[w]
+        vertices_fonte = list(range(n))
+
+    centralidade = dependencias(grafo, vertices_fonte, workers, chunk_size)[alvo]
 
     #normaliza para que o resultado fique entre 0 e 1
+    return centralidade * _normalizacao_brandes(n, max_sources)
+
+def _normalizacao_brandes(n, max_sources):
     # Ajusta a normalização baseado no número de vértices fonte usados
     if n > max_sources:
         # Para amostragem, ajusta a normalização
-        normalizacao = (max_sources / n) / ((n - 1) * (n - 2)) if n > 2 else 1
+        return (max_sources / n) / ((n - 1) * (n - 2)) if n > 2 else 1
+    return 1 / ((n - 1) * (n - 2)) if n > 2 else 1
+
+@cache_resultados.memorizar(ignorar=('workers', 'chunk_size'), semente='semente')
+def betweenness_todos(grafo, max_sources=500, workers=1, chunk_size=16, fontes=None, semente=None):
+    """
+    Centralidade de intermediação de TODOS os vértices a partir de uma única
+    varredura de Brandes (cada passada já calcula a dependência de todos).
+    Mesma normalização de betweenness_centrality.
+
+    fontes: ids dos vértices fonte; por padrão todos, ou uma amostra de
+    max_sources vértices se o grafo for maior, sorteada com semente (como
+    em betweenness_centrality).
+    Retorna um array indexado pelo id do vértice (ver top_k).
+    """
+    grafo = _como_grafo(grafo)
+    n = len(grafo.names)
+    if n < 3:
+        return array('d', bytes(8 * n))
+    if fontes is None:
+        if n > max_sources:
+            import random
+            fontes = random.Random(semente).sample(range(n), max_sources)
+        else:
+            fontes = range(n)
+    fontes = list(fontes)
+
+    fator = _normalizacao_brandes(n, len(fontes))
+    return array('d', (x * fator for x in dependencias(grafo, fontes, workers, chunk_size)))
+
+def top_k(grafo, valores, k=10):
+    """
+    Os k maiores valores de um array indexado por id, como lista de
+    (nome, valor) em ordem decrescente. O(V log k), sem ordenar tudo.
+    """
+    melhores = heapq.nlargest(k, range(len(valores)), key=valores.__getitem__)
+    return [(grafo.names[i], valores[i]) for i in melhores]
+
+def top_betweenness(grafo, k=10, max_sources=500, workers=1, chunk_size=16, semente=None):
+    """Top k vértices por intermediação, a partir de uma só varredura."""
+    return top_k(grafo, betweenness_todos(grafo, max_sources, workers, chunk_size, semente=semente), k)
+
+def brandes_fonte(grafo, s, ponderado=True):
+    """
+    Uma passada de Brandes a partir do vértice de id s: Dijkstra se ponderado,
+    BFS (todas as arestas com peso 1) se não.
+    Retorna (ordem, delta): os vértices alcançados em ordem de distância e a
+    dependência de s em cada vértice (lista indexada por id).
+    """
+    if not ponderado:
+        return _brandes_bfs(grafo, s)
+    n = len(grafo.names)
+    ordem, distancia, sigma = caminhos_minimos(grafo, s)
+
+    # processa os vértices na ordem inversa do Dijkstra; os predecessores de w
+    # no DAG de caminhos mínimos são os v com distancia[v] + peso == distancia[w]
+    delta = [0.0] * n #inicia dependencias a zero
+    predecessors = grafo.predecessors
+    for w in reversed(ordem):
+        coef = (1 + delta[w]) / sigma[w]
+        dist_w = distancia[w]
+        for v, peso in predecessors(w):
+            if distancia[v] + peso == dist_w and v != w:
+                delta[v] += sigma[v] * coef
+    return ordem, delta
+
+def _brandes_bfs(grafo, s):
+    # versão não ponderada de brandes_fonte (caminhos com menos arestas)
+    n = len(grafo.names)
+    distancia = [-1] * n
+    sigma = [0] * n
+    distancia[s] = 0
+    sigma[s] = 1
+    ordem = [s]
+    neighbor_ids = grafo.neighbor_ids
+
+    # a própria lista 'ordem' serve de fila da BFS
+    for v in ordem:
+        proxima = distancia[v] + 1
+        sigma_v = sigma[v]
+        for w in neighbor_ids(v):
+            if distancia[w] < 0:
+                distancia[w] = proxima
+                ordem.append(w)
+            if distancia[w] == proxima:
+                sigma[w] += sigma_v
+
+    delta = [0.0] * n
+    predecessors = grafo.predecessors
+    for w in reversed(ordem):
+        coef = (1 + delta[w]) / sigma[w]
+        anterior = distancia[w] - 1
+        for v, _ in predecessors(w):
+            if distancia[v] == anterior:
+                delta[v] += sigma[v] * coef
+    return ordem, delta
+
+def _acumular_fontes(grafo, fontes, ponderado=True):
+    # soma das dependências de várias fontes (sem contar a própria fonte)
+    total = array('d', bytes(8 * len(grafo.names)))
+    for s in fontes:
+        ordem, delta = brandes_fonte(grafo, s, ponderado)
+        for w in ordem:
+            if w != s:
+                total[w] += delta[w]
+    return total
+
+_grafo_worker = None # grafo compartilhado (somente leitura) de cada processo do pool
+
+def _iniciar_worker(grafo):
+    global _grafo_worker
+    _grafo_worker = grafo
+
+def _acumular_worker(tarefa):
+    fontes, ponderado = tarefa
+    return _acumular_fontes(_grafo_worker, fontes, ponderado)
+
+@instrumentacao.medido()
+def dependencias(grafo, fontes, workers=1, chunk_size=16, ponderado=True):
+    """
+    Soma das dependências de Brandes de todos os vértices fonte (ids), como
+    array indexado por id. Com workers > 1 as fontes são divididas em blocos
+    de chunk_size entre processos que compartilham o grafo (fork, ou o mesmo
+    snapshot mapeado), e os vetores parciais são somados no final.
+    ponderado=False usa BFS (caminhos com menos arestas) em vez de Dijkstra.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    fontes = list(fontes)
+    instrumentacao.contar('fontes', len(fontes))
+    if workers <= 1 or len(fontes) <= chunk_size:
+        return _acumular_fontes(grafo, fontes, ponderado)
+
+    # deixa tudo pronto antes de criar os processos, para não repetir em cada um
+    grafo.finalize()
+    if grafo.directed:
+        grafo._reverse_index()
+
+    blocos = [(fontes[i:i + chunk_size], ponderado) for i in range(0, len(fontes), chunk_size)]
+    metodos = multiprocessing.get_all_start_methods()
+    contexto = multiprocessing.get_context('fork' if 'fork' in metodos else None)
+    total = array('d', bytes(8 * len(grafo.names)))
+    with contexto.Pool(min(workers, len(blocos)), initializer=_iniciar_worker, initargs=(grafo,)) as pool:
+        for parcial in pool.imap_unordered(_acumular_worker, blocos):
+            total = array('d', map(operator.add, total, parcial))
+    return total
+
+def _como_grafo(grafo):
+    # aceita também o formato antigo {vertice: [(vizinho, peso), ...]}
+    if hasattr(grafo, 'neighbors'):
+        return grafo
+    from grafos import Grafo
+    novo = Grafo(directed=True)
+    for u, vizinhos in grafo.items():
+        novo.add_node(u)
+        for v, peso in vizinhos:
+            novo.add_edge(u, v, peso)
+    return novo.finalize()
+
+@instrumentacao.medido()
+@cache_resultados.memorizar(semente='semente')
+def betweenness_adaptativa(grafo, epsilon=0.01, delta=0.1, max_amostras=None, semente=None, ponderado=False):
+    """
+    Intermediação aproximada de todos os vértices com garantia de erro,
+    amostrando caminhos mínimos (Riondato-Kornaropoulos) com a parada
+    adaptativa do KADABRA.
+
+    A cada amostra sorteia um par (u, v), sorteia um caminho mínimo de u até v
+    (uniforme entre todos) e soma 1 nos vértices internos. A estimativa de cada
+    vértice é a fração das amostras em que ele foi interno, que aproxima a
+    intermediação normalizada por n(n-1).
+
+    Para assim que o limite de erro de todos os vértices fica <= epsilon (com
+    probabilidade >= 1 - delta). Se isso não acontecer antes, para em omega
+    amostras, onde o limite de Riondato-Kornaropoulos já garante epsilon.
+    max_amostras limita o custo; nesse caso o erro atingido pode ser maior.
+
+    Retorna (valores, info): valores é um array indexado por id e info traz
+    'amostras', 'omega', 'diametro_vertices', 'epsilon', 'delta' e
+    'epsilon_atingido' (limite de erro realmente garantido).
+    """
+    import math
+    import random
+
+    grafo = _como_grafo(grafo)
+    n = len(grafo.names)
+    contagem = array('d', bytes(8 * n))
+    info = {'amostras': 0, 'omega': 0, 'diametro_vertices': 0,
+            'epsilon': epsilon, 'delta': delta, 'epsilon_atingido': 0.0}
+    if n < 3:
+        return contagem, info
+
+    rng = random.Random(semente)
+    diametro = _limite_diametro_vertices(grafo, ponderado)
+    termo = math.floor(math.log2(max(diametro - 2, 1))) + 1
+    c = 0.5 # constante universal do limite de Riondato-Kornaropoulos
+    omega = math.ceil(c / epsilon ** 2 * (termo + math.log(2 / delta)))
+    limite = omega if max_amostras is None else min(omega, max_amostras)
+    # metade de delta fica com omega; a outra metade é dividida entre os
+    # 2n limites unilaterais (inferior e superior de cada vértice)
+    log_v = math.log(4 * n / delta)
+
+    def erro(b, tau):
+        # maior entre os limites inferior (f) e superior (g) do KADABRA
+        a = omega / tau
+        f = log_v / tau * (1 / 3 - a + math.sqrt((1 / 3 - a) ** 2 + 2 * b * omega / log_v))
+        g = log_v / tau * (1 / 3 + a + math.sqrt((1 / 3 + a) ** 2 + 2 * b * omega / log_v))
+        return max(f, g)
+
+    if grafo.directed:
+        grafo._reverse_index()
+    amostrar = _amostrar_caminho_dijkstra if ponderado else _amostrar_caminho_bfs
+    maior = 0.0 # maior contagem até agora (os limites crescem com a estimativa)
+    tau = 0
+    atingido = float('inf')
+    while tau < limite:
+        tau += 1
+        u = rng.randrange(n)
+        v = rng.randrange(n - 1)
+        if v >= u:
+            v += 1
+        for w in amostrar(grafo, u, v, rng):
+            contagem[w] += 1
+            if contagem[w] > maior:
+                maior = contagem[w]
+        # o limite só depende da maior estimativa, então a checagem é O(1)
+        atingido = erro(maior / tau, tau)
+        if atingido <= epsilon:
+            break
+
+    if tau >= omega:
+        atingido = min(atingido, epsilon)
     else:
-        normalizacao = 1 / ((n - 1) * (n - 2)) if n > 2 else 1
-    
-    centralidade_normalizada = centralidade * normalizacao
+        # limite de Riondato-Kornaropoulos para tau amostras, se for melhor
+        atingido = min(atingido, math.sqrt(c * (termo + math.log(2 / delta)) / tau))
 
-    return centralidade_normalizada
+    info.update(amostras=tau, omega=omega, diametro_vertices=diametro, epsilon_atingido=atingido)
+    instrumentacao.contar('amostras', tau)
+    return array('d', (x / tau for x in contagem)), info
 
-def get_betweenness_centrality_string(graph, node):
+def _limite_diametro_vertices(grafo, ponderado):
+    """
+    Limite superior para o número de vértices no maior caminho mínimo.
+    Não direcionado e sem peso: 2 * excentricidade + 1, com uma BFS por
+    componente. Nos outros casos, o tamanho da maior componente (fraca).
+    """
+    if ponderado or grafo.directed:
+        return max(grafo.component_sizes(), default=1)
+    n = len(grafo.names)
+    visto = bytearray(n)
+    diametro = 1
+    neighbor_ids = grafo.neighbor_ids
+    for raiz in range(n):
+        if visto[raiz]:
+            continue
+        visto[raiz] = 1
+        nivel = [raiz]
+        excentricidade = -1
+        while nivel:
+            excentricidade += 1
+            proximo = []
+            for v in nivel:
+                for w in neighbor_ids(v):
+                    if not visto[w]:
+                        visto[w] = 1
+                        proximo.append(w)
+            nivel = proximo
+        diametro = max(diametro, 2 * excentricidade + 1)
+    return diametro
+
+def _amostrar_caminho_bfs(grafo, u, v, rng):
+    """
+    Sorteia um caminho mínimo (em arestas) de u até v, uniforme entre todos,
+    com BFS bidirecional balanceada (expande o lado de fronteira mais barata).
+    Retorna os vértices internos do caminho (vazio se v for inalcançável).
+    """
+    frente = ({u: 0}, {u: 1}, [u], grafo.neighbor_ids, _ids_predecessores(grafo))
+    tras = ({v: 0}, {v: 1}, [v], _ids_predecessores(grafo), grafo.neighbor_ids)
+
+    while frente[2] and tras[2]:
+        custo_frente = sum(map(grafo.degree, frente[2]))
+        custo_tras = sum(map(grafo.in_degree, tras[2]))
+        lado, outro = (frente, tras) if custo_frente <= custo_tras else (tras, frente)
+        dist, sigma, fronteira, vizinhos, _ = lado
+        dist_outro, sigma_outro = outro[0], outro[1]
+
+        proxima = []
+        contatos = []
+        for x in fronteira:
+            nivel = dist[x] + 1
+            for y in vizinhos(x):
+                if y in dist_outro:
+                    contatos.append((x, y))
+                if y not in dist:
+                    dist[y] = nivel
+                    sigma[y] = 0
+                    proxima.append(y)
+                if dist[y] == nivel:
+                    sigma[y] += sigma[x]
+        lado[2][:] = proxima
+
+        if contatos:
+            # os caminhos mínimos cruzam pelas arestas de contato que chegam no
+            # nível mais baixo do outro lado; cada caminho passa por uma só
+            menor = min(dist_outro[y] for _, y in contatos)
+            contatos = [(x, y) for x, y in contatos if dist_outro[y] == menor]
+            pesos = [sigma[x] * sigma_outro[y] for x, y in contatos]
+            x, y = rng.choices(contatos, weights=pesos)[0]
+            internos = _voltar(lado, x, rng) + _voltar(outro, y, rng)
+            return [w for w in internos if w != u and w != v]
+    return []
+
+def _ids_predecessores(grafo):
+    # função id -> ids dos predecessores (no não direcionado, os vizinhos)
+    if not grafo.directed:
+        return grafo.neighbor_ids
+    return lambda i: [j for j, _ in grafo.predecessors(i)]
+
+def _voltar(lado, w, rng):
+    # sorteia o trecho de w até a origem do lado, proporcional a sigma
+    dist, sigma, _, _, anteriores = lado
+    caminho = [w]
+    while dist[w] > 0:
+        alvo = dist[w] - 1
+        opcoes = [p for p in anteriores(w) if dist.get(p, -1) == alvo]
+        w = rng.choices(opcoes, weights=[sigma[p] for p in opcoes])[0]
+        caminho.append(w)
+    return caminho
+
+def _amostrar_caminho_dijkstra(grafo, u, v, rng):
+    # versão ponderada: Dijkstra a partir de u até fixar v, e volta sorteando
+    # predecessores proporcionalmente a sigma
+    ordem, distancia, sigma = caminhos_minimos(grafo, u, alvo=v)
+    if not ordem or ordem[-1] != v:
+        return []
+    fixado = set(ordem)
+
+    internos = []
+    w = v
+    while w != u:
+        opcoes = [p for p, peso in grafo.predecessors(w)
+                  if p in fixado and distancia[p] + peso == distancia[w]]
+        w = rng.choices(opcoes, weights=[sigma[p] for p in opcoes])[0]
+        if w != u:
+            internos.append(w)
+    return internos
+
+def get_betweenness_centrality_string(graph, node, workers=1):
     """Retorna a centralidade de intermediação de um nó como string"""
-    # Converte defaultdict para dict regular para evitar problemas
-    grafo_dict = dict(graph.adj_list)
-    centrality = betweenness_centrality(grafo_dict, node)
-    info = f"˗ˋˏ ♡ ˎˊ˗ Centralidade de Intermediação para '{node}'  ˗ˋˏ ♡ ˎˊ˗\n"
-    info += f"Centralidade: {centrality:.6f}\n\n"
-    
-    return info
+    return escrita.em_texto(escrever_centralidade_intermediacao, graph, node, workers)
+
+def escrever_centralidade_intermediacao(saida, graph, node, workers=1):
+    """Escreve a centralidade de intermediação de um nó em saida (escrita.Saida)"""
+    centrality = betweenness_centrality(graph, node, workers=workers)
+    saida.escrever(f"˗ˋˏ ♡ ˎˊ˗ Centralidade de Intermediação para '{node}'  ˗ˋˏ ♡ ˎˊ˗\n")
+    saida.escrever(f"Centralidade: {centrality:.6f}\n\n")
+    saida.registro('centralidade_intermediacao', vertice=node, centralidade=centrality)
 
 # ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚
 
 #CENTRALIDADE DE PROXIMIDADE
 
+@instrumentacao.medido()
+@cache_resultados.memorizar()
 def closeness_centrality(grafo, vertices=None):
     """
     Calcula a centralidade de proximidade para grafos ponderados.
-    Usa Dijkstra para encontrar as distâncias mínimas.
+    Usa Dijkstra (caminhos_minimos) para encontrar as distâncias mínimas.
     """
+    grafo = _como_grafo(grafo)
     if vertices is None:
         #se não tiver conjunto de vertices especifico utiliza todos do grafo
-        vertices = list(grafo.keys())
+        vertices = grafo.names
+    if esparso.usar(grafo):
+        return esparso.closeness_centrality(grafo, vertices)
     
-    n = len(grafo) # numero total de vértices no grafo
+    n = len(grafo.names) # numero total de vértices no grafo
     centralidade = {} 
     
     for v in vertices:
-        # Dijkstra para calcular todas as distancias mínimas a partir de v
-        distancia = {v: 0} # armazena a distancia de v ate cada vertice alcançavel
-        heap = [(0, v)] # heap para Dijkstra iniciando em v
-        visitados = set()
-        
-        while heap:
-            dist_u, u = heapq.heappop(heap)
-            
-            if u in visitados:
-                continue
-                
-            visitados.add(u)
-            
-            for w, peso in grafo.get(u, []):
-                if w not in distancia or distancia[w] > dist_u + peso:
-                    distancia[w] = dist_u + peso
-                    heapq.heappush(heap, (distancia[w], w))
+        s_id = grafo.node_id(v)
+        if s_id is None:
+            centralidade[v] = 0.0
+            continue
+        # distancias mínimas a partir de v (só dos vértices alcançados)
+        ordem, distancia, _ = caminhos_minimos(grafo, s_id)
+        instrumentacao.contar('fontes')
         
         # número de nós alcançados (exceto ele mesmo)
-        reach = len(distancia) - 1
+        reach = len(ordem) - 1
         # soma das distâncias para os nós alcançados
-        total_dist = sum(distancia.values())
+        total_dist = sum(distancia[w] for w in ordem)
         
         if reach > 0 and total_dist > 0:
             # fórmula da centralidade de proximidade (quanto menor a soma das distancias, maior a centralidade)
@@ -445,15 +1081,320 @@ def closeness_centrality(grafo, vertices=None):
 
 def get_closeness_centrality_string(graph, node):
     """Retorna a centralidade de proximidade de um nó como string"""
-    # Converte defaultdict para dict regular para evitar problemas
-    grafo_dict = dict(graph.adj_list)
-    centralidades = closeness_centrality(grafo_dict, [node])
+    return escrita.em_texto(escrever_centralidade_proximidade, graph, node)
+
+def escrever_centralidade_proximidade(saida, graph, node):
+    """Escreve a centralidade de proximidade de um nó em saida (escrita.Saida)"""
+    centralidades = closeness_centrality(graph, [node])
     centrality = centralidades.get(node, 0.0)
     
-    info = f"˗ˋˏ ♡ ˎˊ˗ Centralidade de Proximidade para '{node}'  ˗ˋˏ ♡ ˎˊ˗\n"
-    info += f"Centralidade: {centrality:.6f}\n\n"
-    
-    return info
+    saida.escrever(f"˗ˋˏ ♡ ˎˊ˗ Centralidade de Proximidade para '{node}'  ˗ˋˏ ♡ ˎˊ˗\n")
+    saida.escrever(f"Centralidade: {centrality:.6f}\n\n")
+    saida.registro('centralidade_proximidade', vertice=node, centralidade=centrality)
 
+@instrumentacao.medido()
+@cache_resultados.memorizar()
+def top_k_closeness(grafo, k=10):
+    """
+    Top k EXATO de proximidade (BFS, sem pesos), com a mesma fórmula das
+    análises: (alcançados - 1) / (soma das distâncias + inalcançáveis * N).
 
-# ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚
\ No newline at end of file
+    Os candidatos são visitados em ordem decrescente de grau e cada BFS para
+    assim que um limite superior da proximidade fica abaixo do k-ésimo melhor
+    valor já encontrado. O limite supõe que todos os vértices que ainda podem
+    ser alcançados estão o mais perto possível: o próximo nível tem no máximo
+    a soma dos graus do nível atual e o resto fica um nível depois.
+
+    Retorna lista de (nome, proximidade) em ordem decrescente.
+    """
+    n = len(grafo.names)
+    if n == 0 or k <= 0:
+        return []
+    alcance = _limite_alcance(grafo)
+    degree = grafo.degree
+    neighbor_ids = grafo.neighbor_ids
+    # no não direcionado cada vértice de um nível gasta uma aresta com o nível anterior
+    volta = 0 if grafo.directed else 1
+
+    def proximidade(r, soma):
+        total = soma + (n - r) * n # penaliza os inalcançáveis
+        return (r - 1) / total if total > 0 else 0
+
+    melhores = [] # heap mínimo com (proximidade, -ordem, id) dos k melhores
+    marca = array('i', [-1]) * n # ordem da BFS que visitou cada vértice por último
+    candidatos = sorted(range(n), key=degree, reverse=True)
+
+    for ordem, v in enumerate(candidatos):
+        r_max = alcance[v]
+        limiar = melhores[0][0] if len(melhores) == k else -1.0
+        if proximidade(r_max, r_max - 1) < limiar:
+            instrumentacao.contar('candidatos_descartados')
+            continue # nem com todos a distância 1 entraria no top k
+
+        marca[v] = ordem
+        nivel = [v]
+        visitados, soma, d = 1, 0, 0
+        podado = False
+        while nivel:
+            restantes = r_max - visitados
+            if restantes > 0 and limiar >= 0:
+                cabem = sum(map(degree, nivel)) - (volta * len(nivel) if d else 0)
+                cabem = min(restantes, cabem)
+                limite = soma + cabem * (d + 1) + (restantes - cabem) * (d + 2)
+                if proximidade(r_max, limite) < limiar:
+                    podado = True
+                    break
+
+            d += 1
+            proximo = []
+            for x in nivel:
+                for y in neighbor_ids(x):
+                    if marca[y] != ordem:
+                        marca[y] = ordem
+                        proximo.append(y)
+            visitados += len(proximo)
+            soma += d * len(proximo)
+            nivel = proximo
+
+        if podado:
+            instrumentacao.contar('bfs_podadas')
+            continue
+        instrumentacao.contar('bfs_completas')
+        item = (proximidade(visitados, soma), -ordem, v)
+        if len(melhores) < k:
+            heapq.heappush(melhores, item)
+        elif item > melhores[0]:
+            heapq.heapreplace(melhores, item)
+
+    melhores.sort(reverse=True)
+    return [(grafo.names[v], valor) for valor, _, v in melhores]
+
+def _limite_alcance(grafo):
+    """
+    Limite superior, por vértice, de quantos vértices ele alcança (contando
+    ele mesmo). Não direcionado: tamanho da componente (exato). Direcionado:
+    tamanho da fortemente conexa + limites das componentes que ela aponta na
+    condensação (pode contar a mais, nunca a menos).
+    """
+    n = len(grafo.names)
+    if not grafo.directed:
+        uf = grafo.components()
+        return [uf.size[uf.find(i)] for i in range(n)]
+
+    rotulo, tamanhos = rotular_fortemente_conexas(grafo)
+    # Tarjan numera as componentes em ordem topológica reversa: quem é
+    # apontado tem id menor, então basta percorrer em ordem crescente
+    membros = [[] for _ in tamanhos]
+    for i in range(n):
+        membros[rotulo[i]].append(i)
+    limite = [0] * len(tamanhos)
+    for c, vertices in enumerate(membros):
+        apontadas = {rotulo[j] for i in vertices for j in grafo.neighbor_ids(i)}
+        apontadas.discard(c)
+        limite[c] = min(n, tamanhos[c] + sum(limite[a] for a in apontadas))
+    return [limite[rotulo[i]] for i in range(n)]
+
+
+# ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚
+
+# CAMINHOS ENTRE DOIS VÉRTICES
+
+def _ids_do_par(grafo, origem, destino):
+    ids = []
+    for v in (origem, destino):
+        i = grafo.node_id(v)
+        if i is None:
+            raise ValueError(f"Vértice não encontrado: {v}")
+        ids.append(i)
+    return ids
+
+def _cadeia(grafo, pai_origem, pai_destino, a, b):
+    # nomes do caminho origem ... a, b ... destino (a e b podem ser o mesmo vértice)
+    ida = []
+    while a != -1:
+        ida.append(a)
+        a = pai_origem[a]
+    ida.reverse()
+    if ida[-1] == b:
+        b = pai_destino[b]
+    while b != -1:
+        ida.append(b)
+        b = pai_destino[b]
+    return [grafo.names[i] for i in ida]
+
+def separacao(grafo, origem, destino):
+    """
+    Menor cadeia (em número de arestas, sem pesos) de origem até destino,
+    como lista de nomes: len(cadeia) - 1 é o grau de separação. None se
+    não houver caminho.
+
+    BFS bidirecional: a cada passo expande um nível inteiro do lado com a
+    fronteira menor, até as duas buscas se encontrarem. Explora em torno de
+    2·b^(d/2) vértices em vez dos b^d de uma BFS a partir da origem.
+    No grafo direcionado a busca do destino anda pelos predecessores.
+    """
+    s, t = _ids_do_par(grafo, origem, destino)
+    if s == t:
+        return [origem]
+    pais = ({s: -1}, {t: -1})
+    fronteiras = ([s], [t])
+    vizinhos = (grafo.neighbor_ids,
+                (lambda i: [j for j, _ in grafo.predecessors(i)]) if grafo.directed else grafo.neighbor_ids)
+    while fronteiras[0] and fronteiras[1]:
+        lado = 0 if len(fronteiras[0]) <= len(fronteiras[1]) else 1
+        pai, outro = pais[lado], pais[1 - lado]
+        proxima = []
+        encontro = None
+        for u in fronteiras[lado]:
+            for w in vizinhos[lado](u):
+                if w in pai:
+                    continue
+                pai[w] = u
+                if w in outro:
+                    # qualquer encontro neste nível tem o mesmo comprimento
+                    encontro = w
+                    break
+                proxima.append(w)
+            if encontro is not None:
+                break
+        if encontro is not None:
+            instrumentacao.contar('visitados', len(pais[0]) + len(pais[1]))
+            return _cadeia(grafo, pais[0], pais[1], encontro, encontro)
+        fronteiras = (proxima, fronteiras[1]) if lado == 0 else (fronteiras[0], proxima)
+    return None
+
+def caminho_ponderado(grafo, origem, destino, marcos=None):
+    """
+    Caminho de menor peso total de origem até destino (Dijkstra
+    bidirecional). Retorna (lista de nomes, custo), ou (None, inf) se não
+    houver caminho.
+
+    As duas buscas avançam alternadamente pelo lado de menor distância e
+    param quando a soma dos topos das duas filas alcança o melhor caminho
+    já visto. Com marcos (ver preparar_marcos) a busca é guiada por limites
+    inferiores da distância (ALT: A*, marcos e desigualdade triangular) e
+    visita bem menos vértices no componente gigante.
+    """
+    s, t = _ids_do_par(grafo, origem, destino)
+    if s == t:
+        return [origem], 0
+    if marcos is not None:
+        if grafo.directed:
+            raise ValueError("Os marcos só funcionam com grafos não direcionados")
+        potencial = _potencial_alt(marcos, s, t)
+    else:
+        potencial = None
+
+    # distâncias reduzidas (com o potencial) guiam as filas; as reais dão o custo
+    reduzida = ({s: 0}, {t: 0})
+    real = ({s: 0}, {t: 0})
+    pais = ({s: -1}, {t: -1})
+    fixados = (set(), set())
+    filas = ([(0, s)], [(0, t)])
+    vizinhos = (grafo.neighbors, grafo.predecessors if grafo.directed else grafo.neighbors)
+    melhor, custo, encontro = float('inf'), float('inf'), None
+
+    while filas[0] and filas[1]:
+        if filas[0][0][0] + filas[1][0][0] >= melhor:
+            break
+        lado = 0 if filas[0][0][0] <= filas[1][0][0] else 1
+        d, u = heapq.heappop(filas[lado])
+        if u in fixados[lado]:
+            continue
+        fixados[lado].add(u)
+        dist, dist_real, pai = reduzida[lado], real[lado], pais[lado]
+        outra, outra_real = reduzida[1 - lado], real[1 - lado]
+        # potencial do lado de trás é o negativo do da frente
+        p_u = 0 if potencial is None else (potencial(u) if lado == 0 else -potencial(u))
+        for w, peso in vizinhos[lado](u):
+            if w in fixados[lado]:
+                continue
+            p_w = 0 if potencial is None else (potencial(w) if lado == 0 else -potencial(w))
+            nova = d + peso - p_u + p_w
+            if nova < dist.get(w, float('inf')):
+                dist[w] = nova
+                dist_real[w] = dist_real[u] + peso
+                pai[w] = u
+                heapq.heappush(filas[lado], (nova, w))
+            if w in outra and nova + outra[w] < melhor:
+                melhor = nova + outra[w]
+                custo = dist_real[u] + peso + outra_real[w]
+                encontro = (u, w) if lado == 0 else (w, u)
+
+    instrumentacao.contar('fixados', len(fixados[0]) + len(fixados[1]))
+    if encontro is None:
+        return None, float('inf')
+    return _cadeia(grafo, pais[0], pais[1], *encontro), custo
+
+def preparar_marcos(grafo, k=8):
+    """
+    Marcos (landmarks) para caminho_ponderado: k vértices espalhados pelo
+    grafo e a distância de cada um a todos os vértices (um Dijkstra por
+    marco, k·V números). O primeiro é o vértice de maior grau e cada
+    seguinte é o mais distante dos já escolhidos (na componente deles).
+    Só para grafos não direcionados.
+
+    Retorna dict com 'ids' (dos marcos) e 'distancias' (um array por marco,
+    inf onde o marco não alcança). Fica guardado no grafo até a próxima
+    alteração e em disco pelo cache_resultados.
+    """
+    if grafo.directed:
+        raise ValueError("Esta função só funciona com grafos não direcionados")
+    chave = ('marcos', k)
+    marcos = grafo._derivados.get(chave)
+    if marcos is None:
+        marcos = grafo._derivados[chave] = _calcular_marcos(grafo, k)
+    return marcos
+
+@instrumentacao.medido()
+@cache_resultados.memorizar()
+def _calcular_marcos(grafo, k):
+    n = len(grafo.names)
+    ids, distancias = [], []
+    if n == 0:
+        return {'ids': ids, 'distancias': distancias}
+    proximo = max(range(n), key=grafo.degree)
+    menor = [float('inf')] * n # distância de cada vértice ao marco mais próximo
+    for _ in range(min(k, n)):
+        distancia = caminhos_minimos(grafo, proximo)[1]
+        ids.append(proximo)
+        distancias.append(array('d', distancia))
+        for v, d in enumerate(distancia):
+            if d < menor[v]:
+                menor[v] = d
+        # mais distante dos marcos, entre os que eles alcançam
+        proximo = max(range(n), key=lambda v: menor[v] if menor[v] != float('inf') else -1)
+        if menor[proximo] in (0, float('inf')):
+            break
+    instrumentacao.contar('marcos', len(ids))
+    return {'ids': ids, 'distancias': distancias}
+
+def _potencial_alt(marcos, s, t):
+    """
+    Potencial médio (Goldberg e Harrelson) para o Dijkstra bidirecional:
+    p(v) = (limite(v, t) - limite(s, v)) / 2, com limite(a, b) =
+    max |d(m, a) - d(m, b)| sobre os marcos m que alcançam os dois. A frente
+    usa p e a busca de trás usa -p, então os pesos reduzidos das duas são
+    os mesmos e nunca negativos.
+    """
+    inf = float('inf')
+    uteis = [(d, d[s], d[t]) for d in marcos['distancias'] if d[s] != inf and d[t] != inf]
+    calculado = {}
+
+    def potencial(v):
+        p = calculado.get(v)
+        if p is None:
+            ate_t = ate_s = 0
+            for d, ds, dt in uteis:
+                dv = d[v]
+                if dv == inf:
+                    continue
+                a = abs(dt - dv)
+                b = abs(dv - ds)
+                if a > ate_t:
+                    ate_t = a
+                if b > ate_s:
+                    ate_s = b
+            p = calculado[v] = (ate_t - ate_s) / 2
+        return p
+    return potencial
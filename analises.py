@@ -1,6 +1,12 @@
 import algoritmos
+import cache_resultados
+import escrita
+import heapq
+import math
 import random
-from collections import defaultdict, deque
+from array import array
+from bisect import bisect_left
+from collections import Counter
 
 # =========================
 # Funções rápidas e otimizadas SEM .neighbors
@@ -14,281 +20,347 @@ def graph_adjlist_neighbors(graph, node):
 
 def analyze_degree_distribution(graph, graph_name, sample_size=1000):
     """
-    Analisa a distribuição de graus usando amostragem.
+    Analisa a distribuição de graus de TODOS os vértices (ver distribuicao_graus).
+    sample_size: ignorado; fica só para não quebrar quem ainda o passa (a
+    distribuição não é mais amostrada).
     """
-    nodes = list(graph.nodes)
-    if len(nodes) > sample_size:
-        sample = random.sample(nodes, sample_size)
-    else:
-        sample = nodes
-    
-    # Para cada nó no sample, grau = tamanho da lista de adjacência (sem peso)
-    degrees = [len(graph_adjlist_neighbors(graph, n)) for n in sample]
-    if degrees:
-        avg = sum(degrees) / len(degrees)
-        max_deg = max(degrees)
-        min_deg = min(degrees)
-    else:
-        avg = max_deg = min_deg = 0
-    
-    info = f"{graph_name} (AMOSTRA DE {len(sample)} NÓS):\n"
-    info += f"- Grau médio: {avg:.2f}\n- Grau máximo: {max_deg}\n- Grau mínimo: {min_deg}\n"
-    info += f"- Top 5 graus: {sorted(degrees, reverse=True)[:5]}\n\n"
-    return info
+    return escrita.em_texto(escrever_distribuicao_graus, graph, graph_name)
+
+def escrever_distribuicao_graus(saida, graph, graph_name):
+    """
+    Como analyze_degree_distribution, escrevendo em saida (escrita.Saida):
+    um resumo por tipo de grau no texto e, nos registros, também o
+    histograma e a CCDF completos.
+    """
+    distribuicao = distribuicao_graus(graph)
+    saida.escrever(f"{graph_name} (TODOS OS {len(graph.names)} NÓS):\n")
+    for tipo, est in distribuicao.items():
+        if len(distribuicao) > 1:
+            saida.escrever(f"Grau de {_ROTULOS_GRAU[tipo]}:\n")
+        saida.escrever(f"- Grau médio: {est['media']:.2f}\n- Grau máximo: {est['maximo']}\n- Grau mínimo: {est['minimo']}\n")
+        heterogeneidade = "alta heterogeneidade" if est['cv'] > 1.0 else "baixa heterogeneidade"
+        saida.escrever(f"- Desvio padrão: {est['desvio']:.2f}; coeficiente de variação (CV): {est['cv']:.2f} ({heterogeneidade})\n")
+        saida.escrever(f"- Top 5 graus: {est['top5']}\n")
+        saida.escrever(f"- Hubs (grau > média + 3 desvios): {est['hubs']} nós\n")
+        ajuste = est['lei_de_potencia']
+        if ajuste is None:
+            saida.escrever("- Lei de potência: poucos vértices com grau positivo para ajustar\n")
+        else:
+            saida.escrever(f"- Lei de potência (máxima verossimilhança): alfa = {ajuste['alfa']:.2f}, "
+                           f"k_min = {ajuste['kmin']}, cauda com {ajuste['n_cauda']} nós, KS = {ajuste['ks']:.3f}\n")
+        pontos = []
+        k = 1
+        while k <= est['maximo']: # k = 1, 2, 4, 8...
+            pontos.append(f"{k}: {ccdf_em(est['ccdf'], k):.4f}")
+            k *= 2
+        saida.escrever(f"- CCDF P(grau >= k): {', '.join(pontos)}\n")
+
+        resumo = {chave: valor for chave, valor in est.items() if chave not in ('histograma', 'ccdf')}
+        saida.registro('distribuicao_graus', grafo=graph_name, grau=tipo, **resumo)
+        for (k, quantidade), (_, p) in zip(est['histograma'], est['ccdf']):
+            saida.registro('histograma_graus', grafo=graph_name, grau=tipo, k=k, vertices=quantidade, ccdf=p)
+    saida.escrever("\n")
+
+_ROTULOS_GRAU = {'grau': 'grau', 'saida': 'saída', 'entrada': 'entrada'}
+
+def ccdf_em(ccdf, k):
+    """P(grau >= k) a partir da lista ccdf de estatisticas_graus (qualquer k)."""
+    i = bisect_left(ccdf, (k,))
+    return ccdf[i][1] if i < len(ccdf) else 0.0
+
+def distribuicao_graus(graph):
+    """
+    Distribuição exata dos graus, lida dos arrays do grafo em uma passada
+    O(V) (degrees() para a saída, graus de entrada mantidos pelo grafo).
+    Não direcionado: {'grau': ...}; direcionado: {'saida': ..., 'entrada': ...},
+    cada um com as estatísticas de estatisticas_graus.
+    """
+    saida = Counter(graph.degrees())
+    if not graph.directed:
+        return {'grau': estatisticas_graus(saida)}
+    return {'saida': estatisticas_graus(saida), 'entrada': estatisticas_graus(Counter(graph.in_degrees()))}
+
+def estatisticas_graus(histograma):
+    """
+    Estatísticas a partir do histograma {grau: número de vértices}, em
+    O(graus distintos): vertices, media, desvio, cv (desvio / média),
+    minimo, maximo, top5, hubs (grau > média + 3 desvios), histograma e
+    ccdf (listas de (k, ...) em ordem de k, com P(grau >= k)) e
+    lei_de_potencia (ver ajustar_lei_de_potencia).
+    """
+    graus = sorted(histograma)
+    n = sum(histograma.values())
+    if not n:
+        return {'vertices': 0, 'media': 0.0, 'desvio': 0.0, 'cv': 0.0, 'minimo': 0, 'maximo': 0,
+                'top5': [], 'hubs': 0, 'histograma': [], 'ccdf': [], 'lei_de_potencia': None}
+    media = sum(k * c for k, c in histograma.items()) / n
+    desvio = math.sqrt(max(0.0, sum(k * k * c for k, c in histograma.items()) / n - media * media))
+
+    top5 = []
+    for k in reversed(graus):
+        top5.extend([k] * min(histograma[k], 5 - len(top5)))
+        if len(top5) == 5:
+            break
+    ccdf = []
+    restantes = n
+    for k in graus:
+        ccdf.append((k, restantes / n))
+        restantes -= histograma[k]
+
+    return {
+        'vertices': n,
+        'media': media,
+        'desvio': desvio,
+        'cv': desvio / media if media else 0.0,
+        'minimo': graus[0],
+        'maximo': graus[-1],
+        'top5': top5,
+        'hubs': sum(c for k, c in histograma.items() if k > media + 3 * desvio),
+        'histograma': [(k, histograma[k]) for k in graus],
+        'ccdf': ccdf,
+        'lei_de_potencia': ajustar_lei_de_potencia(histograma),
+    }
+
+MIN_CAUDA = 10 # menor cauda aceita no ajuste da lei de potência
+
+def ajustar_lei_de_potencia(histograma, kmin=None):
+    """
+    Ajuste de P(k) ~ k^-alfa por máxima verossimilhança (Clauset, Shalizi e
+    Newman, 2009), na aproximação discreta:
+        alfa = 1 + n / soma(ln(k / (kmin - 1/2))), para os k >= kmin.
+    Sem kmin, testa cada grau distinto e fica com o que minimiza a distância
+    de Kolmogorov-Smirnov entre a CCDF da cauda e a do modelo (caudas com
+    menos de MIN_CAUDA vértices são ignoradas).
+
+    Retorna dict com alfa, kmin, n_cauda e ks, ou None sem cauda suficiente.
+    """
+    graus = sorted(k for k in histograma if k > 0)
+    if kmin is not None:
+        graus = [k for k in graus if k >= kmin]
+    # somas das caudas (do maior grau para o menor): vértices e soma de ln k
+    n_cauda = [0] * (len(graus) + 1)
+    soma_log = [0.0] * (len(graus) + 1)
+    for i in range(len(graus) - 1, -1, -1):
+        c = histograma[graus[i]]
+        n_cauda[i] = n_cauda[i + 1] + c
+        soma_log[i] = soma_log[i + 1] + c * math.log(graus[i])
+
+    melhor = None
+    candidatos = range(len(graus)) if kmin is None else range(min(1, len(graus)))
+    for i in candidatos:
+        n = n_cauda[i]
+        if n < MIN_CAUDA and kmin is None:
+            break
+        k0 = graus[i]
+        soma = soma_log[i] - n * math.log(k0 - 0.5)
+        if soma <= 0:
+            continue
+        alfa = 1 + n / soma
+        # KS entre as CCDFs empírica e do modelo, nos graus da cauda
+        ks = 0.0
+        for j in range(i, len(graus)):
+            modelo = ((graus[j] - 0.5) / (k0 - 0.5)) ** (1 - alfa)
+            ks = max(ks, abs(n_cauda[j] / n - modelo))
+        if melhor is None or ks < melhor['ks']:
+            melhor = {'alfa': alfa, 'kmin': k0, 'n_cauda': n, 'ks': ks}
+    return melhor
 
 def analyze_component_distribution(undirected_graph, directed_graph, sample_size=1000):
     """
-    Analisa componentes no grafo não direcionado usando BFS a partir de amostras.
+    Distribuição exata dos tamanhos de componentes de TODOS os vértices
+    (ver distribuicao_componentes).
+    sample_size: ignorado; fica só para não quebrar quem ainda o passa (as
+    componentes não são mais amostradas).
     """
-    nodes = list(undirected_graph.nodes)
-    if len(nodes) > sample_size:
-        sample = random.sample(nodes, sample_size)
-    else:
-        sample = nodes
-    
-    visited = set()
-    comp_sizes = []
-    for n in sample:
-        if n not in visited:
-            queue = deque([n])
-            size = 0
-            while queue:
-                v = queue.popleft()
-                if v not in visited:
-                    visited.add(v)
-                    size += 1
-                    for w in graph_adjlist_neighbors(undirected_graph, v):
-                        if w not in visited:
-                            queue.append(w)
-            comp_sizes.append(size)
-    
-    giant = max(comp_sizes) if comp_sizes else 0
-    comp_small = sum(1 for s in comp_sizes if s <= 3)
-    info = f"Componentes (AMOSTRA DE {len(sample)} NÓS):\n"
-    info += f"- Maior componente: {giant} nós\n"
-    info += f"- Componentes pequenas (<=3 nós): {comp_small}\n\n"
-    return info
+    return escrita.em_texto(escrever_distribuicao_componentes, undirected_graph, directed_graph)
+
+def escrever_distribuicao_componentes(saida, undirected_graph, directed_graph, rotulos=None):
+    """
+    Como analyze_component_distribution, escrevendo em saida (escrita.Saida):
+    um resumo por tipo de componente no texto e, nos registros, também o
+    histograma de tamanhos. Os rótulos (componente de cada vértice, por id)
+    e os tamanhos vão anexados à seção como arrays compactos
+    (rotulos_<tipo>, tamanhos_<tipo>; ver escrita.ler_array).
+    rotulos: como em distribuicao_componentes.
+    """
+    for tipo, (rotulo, tamanhos, est) in distribuicao_componentes(undirected_graph, directed_graph, rotulos).items():
+        grafo_nome, descricao = _ROTULOS_COMPONENTE[tipo]
+        saida.escrever(f"{grafo_nome}, {descricao} (TODOS OS {est['vertices']} NÓS):\n")
+        saida.escrever(f"- Componentes: {est['componentes']}\n")
+        saida.escrever(f"- Maior componente: {est['maior']} nós ({100 * est['fracao_gigante']:.2f}% dos nós)\n")
+        if tipo == 'fortemente_conexas':
+            saida.escrever(f"- Componentes de 1 nó: {est['unitarias']}\n")
+        else:
+            saida.escrever(f"- Nós isolados: {est['unitarias']}\n")
+        saida.escrever(f"- Componentes pequenas (<=3 nós): {est['pequenas']}\n")
+        saida.escrever(f"- Tamanhos (tamanho: componentes): "
+                       f"{', '.join(f'{t}: {c}' for t, c in est['histograma'])}\n\n")
+
+        grafo = 'direcionado' if tipo != 'conexas' else 'nao_direcionado'
+        resumo = {chave: valor for chave, valor in est.items() if chave != 'histograma'}
+        saida.registro('distribuicao_componentes', grafo=grafo, conexao=tipo, **resumo)
+        for tamanho, quantidade in est['histograma']:
+            saida.registro('histograma_componentes', grafo=grafo, conexao=tipo, tamanho=tamanho, componentes=quantidade)
+        saida.anexar(f"rotulos_{tipo}", rotulo)
+        saida.anexar(f"tamanhos_{tipo}", tamanhos)
+
+_ROTULOS_COMPONENTE = {
+    'conexas': ("GRAFO NÃO DIRECIONADO (ATOR<->ATOR)", "componentes conexas"),
+    'fracamente_conexas': ("GRAFO DIRECIONADO (ATOR->DIRETOR)", "componentes fracamente conexas"),
+    'fortemente_conexas': ("GRAFO DIRECIONADO (ATOR->DIRETOR)", "componentes fortemente conexas"),
+}
+
+def distribuicao_componentes(undirected_graph, directed_graph, rotulos=None):
+    """
+    Componentes exatas, sem amostragem: conexas do não direcionado e
+    fracamente / fortemente conexas do direcionado. Cada rotulagem é uma
+    passada O(V+E) (algoritmos.rotular_conexas e rotular_fortemente_conexas)
+    e fica guardada no grafo para as outras etapas.
+    rotulos: {tipo: (rotulo, tamanhos)} já calculados (ver rotular_componentes);
+    None calcula aqui.
+    Retorna {tipo: (rotulo, tamanhos, estatísticas de estatisticas_componentes)}.
+    """
+    if rotulos is None:
+        rotulos = rotular_componentes(undirected_graph, directed_graph)
+    return {tipo: (*rotulos[tipo], estatisticas_componentes(rotulos[tipo][1])) for tipo in _ROTULOS_COMPONENTE}
+
+def rotular_componentes(undirected_graph, directed_graph):
+    """
+    {tipo: (rotulo, tamanhos)} das três rotulagens de distribuicao_componentes
+    ('conexas', 'fracamente_conexas', 'fortemente_conexas'), só arrays, para
+    serem calculadas uma vez e repassadas (o pipeline as envia às seções que
+    dependem delas).
+    """
+    return {
+        'conexas': algoritmos.rotular_conexas(undirected_graph),
+        'fracamente_conexas': algoritmos.rotular_conexas(directed_graph),
+        'fortemente_conexas': algoritmos.rotular_fortemente_conexas(directed_graph),
+    }
+
+def estatisticas_componentes(tamanhos):
+    """
+    Estatísticas a partir dos tamanhos das componentes: componentes,
+    vertices, maior, fracao_gigante (maior / vertices), unitarias
+    (componentes de 1 nó; nos não direcionados, os nós isolados), pequenas
+    (<= 3 nós) e histograma (lista de (tamanho, componentes) em ordem de tamanho).
+    """
+    histograma = Counter(tamanhos)
+    n = sum(tamanhos)
+    maior = max(histograma, default=0)
+    return {
+        'componentes': len(tamanhos),
+        'vertices': n,
+        'maior': maior,
+        'fracao_gigante': maior / n if n else 0.0,
+        'unitarias': histograma[1],
+        'pequenas': sum(c for t, c in histograma.items() if t <= 3),
+        'histograma': sorted(histograma.items()),
+    }
 
 def get_top_actors_degree_string(graph, top_n=10):
     """
     Retorna o top 'top_n' atores/atrizes por grau (contagem de vizinhos).
     """
+    return escrita.em_texto(escrever_top_grau_atores, graph, top_n)
+
+def escrever_top_grau_atores(saida, graph, top_n=10):
+    """
+    Como get_top_actors_degree_string, escrevendo em saida (escrita.Saida).
+    """
     nodes = list(graph.nodes)
     # Grau = número de vizinhos
     degrees = [(n, len(graph_adjlist_neighbors(graph, n))) for n in nodes]
     degrees.sort(key=lambda x: x[1], reverse=True)
-    
-    info = ""
-    for i, (n, d) in enumerate(degrees[:top_n], 1):
-        info += f"{i}. {n}: {d}\n"
-    return info
+    escrever_ranking(saida, degrees[:top_n], 'grau', "{}")
 
-def fast_betweenness_actors(graph, top_n=10, sample_size=50):
+def fast_betweenness_actors(graph, top_n=10, sample_size=50, epsilon=None, delta=0.1):
     """
     Betweenness aproximada por amostragem e BFS para atores (grafo não direcionado).
+    Com epsilon, usa a amostragem adaptativa com garantia de erro
+    (algoritmos.betweenness_adaptativa) em vez de sample_size fontes fixas.
     """
-    nodes = list(graph.nodes)
-    if len(nodes) > sample_size:
-        sample = random.sample(nodes, sample_size)
+    return escrita.em_texto(escrever_top_intermediacao, graph, top_n, sample_size, epsilon, delta)
+
+@cache_resultados.memorizar(semente='semente')
+def _betweenness_amostrada(graph, sample_size, semente=None):
+    """
+    Betweenness não ponderada (BFS) de todos os vértices a partir de uma
+    amostra de fontes, dividida por sample_size. Uma única varredura serve
+    para qualquer ranking ou consulta por vértice. Só vai para o cache com
+    semente (sem ela a amostra muda a cada chamada).
+    """
+    n = len(graph.names)
+    if n > sample_size:
+        sample = random.Random(semente).sample(range(n), sample_size)
     else:
-        sample = nodes
-    
-    betw = defaultdict(float)
-    
-    for s in sample:
-        # BFS
-        queue = deque([s])
-        pred = {s: []}
-        dist = {s: 0}
-        num_paths = {s: 1}
-        stack = []
-        
-        while queue:
-            v = queue.popleft()
-            stack.append(v)
-            for w in graph_adjlist_neighbors(graph, v):
-                if w not in dist:
-                    queue.append(w)
-                    dist[w] = dist[v] + 1
-                    num_paths[w] = num_paths[v]
-                    pred[w] = [v]
-                elif dist[w] == dist[v] + 1:
-                    num_paths[w] += num_paths[v]
-                    pred[w].append(v)
-        
-        delta = dict.fromkeys(stack, 0)
-        while stack:
-            w = stack.pop()
-            for v in pred[w]:
-                delta[v] += (num_paths[v] / num_paths[w]) * (1 + delta[w])
-            if w != s:
-                betw[w] += delta[w]
-    
-    for k in betw:
-        betw[k] /= sample_size
-    
-    top = sorted(betw.items(), key=lambda x: x[1], reverse=True)[:top_n]
-    info = ""
+        sample = range(n)
+    betw = algoritmos.dependencias(graph, sample, ponderado=False)
+    return array('d', (v / sample_size for v in betw))
+
+def escrever_top_intermediacao(saida, graph, top_n=10, sample_size=50, epsilon=None, delta=0.1):
+    """
+    Top 'top_n' por intermediação aproximada, escrito em saida (escrita.Saida).
+    Sem epsilon: sample_size fontes fixas; com epsilon: amostragem adaptativa.
+    """
+    if epsilon is None:
+        top = algoritmos.top_k(graph, _betweenness_amostrada(graph, sample_size), top_n)
+        escrever_ranking(saida, top, 'intermediacao', "{:.2f}")
+        return
+
+    valores, garantia = algoritmos.betweenness_adaptativa(graph, epsilon, delta)
+    escrever_ranking(saida, algoritmos.top_k(graph, valores, top_n), 'intermediacao', "{:.6f}")
+    saida.escrever(f"(intermediação normalizada; {garantia['amostras']} caminhos amostrados, "
+                   f"erro <= {garantia['epsilon_atingido']:.4f} com probabilidade >= {1 - delta:.2f})\n")
+    saida.registro('garantia', amostras=garantia['amostras'], epsilon=garantia['epsilon_atingido'], delta=delta)
+
+def escrever_ranking(saida, top, metrica, formato):
+    """
+    Escreve as linhas "i. nome: valor" de top (lista de (nome, valor)) em
+    saida, com um registro por posição.
+    """
     for i, (n, v) in enumerate(top, 1):
-        info += f"{i}. {n}: {v:.2f}\n"
-    return info
+        saida.escrever(f"{i}. {n}: {formato.format(v)}\n")
+        saida.registro('ranking', metrica=metrica, posicao=i, vertice=n, valor=v)
 
 def get_top_directors_string(graph, top_n=10):
     """
     Top diretores por grau de entrada (quantos atores apontam para cada diretor).
+    Usa os graus de entrada mantidos pelo grafo: O(V log top_n).
     """
-    nodes = list(graph.nodes)
-    in_degrees = []
-    for node in nodes:
-        # Soma de '1' para cada aresta que chega em 'node'
-        in_deg = sum(
-            1 for adjacency in graph.adj_list.values()
-            for (v, _) in adjacency
-            if v == node
-        )
-        in_degrees.append((node, in_deg))
-    
-    in_degrees.sort(key=lambda x: x[1], reverse=True)
-    info = ""
-    for i, (n, d) in enumerate(in_degrees[:top_n], 1):
-        info += f"{i}. {n}: {d}\n"
-    return info
-
-def get_top_directors_betweenness_string_fast(graph, top_n=10, sample_size=50):
+    return escrita.em_texto(escrever_top_grau_diretores, graph, top_n)
+
+def escrever_top_grau_diretores(saida, graph, top_n=10):
+    """
+    Como get_top_directors_string, escrevendo em saida (escrita.Saida).
+    """
+    in_degrees = graph.in_degrees()
+    top = heapq.nlargest(top_n, range(len(in_degrees)), key=in_degrees.__getitem__)
+    escrever_ranking(saida, [(graph.names[n], in_degrees[n]) for n in top], 'grau_entrada', "{}")
+
+def get_top_directors_betweenness_string_fast(graph, top_n=10, sample_size=50, epsilon=None, delta=0.1):
     """
     Betweenness aproximada para diretores (grafo direcionado).
+    Com epsilon, usa a amostragem adaptativa com garantia de erro.
     """
-    nodes = list(graph.nodes)
-    if len(nodes) > sample_size:
-        sample = random.sample(nodes, sample_size)
-    else:
-        sample = nodes
-    
-    betw = defaultdict(float)
-    for s in sample:
-        queue = deque([s])
-        pred = {s: []}
-        dist = {s: 0}
-        num_paths = {s: 1}
-        stack = []
-        
-        while queue:
-            v = queue.popleft()
-            stack.append(v)
-            for (w, _) in graph.adj_list.get(v, []):
-                if w not in dist:
-                    queue.append(w)
-                    dist[w] = dist[v] + 1
-                    num_paths[w] = num_paths[v]
-                    pred[w] = [v]
-                elif dist[w] == dist[v] + 1:
-                    num_paths[w] += num_paths[v]
-                    pred[w].append(v)
-        
-        delta = dict.fromkeys(stack, 0)
-        while stack:
-            w = stack.pop()
-            for v in pred[w]:
-                delta[v] += (num_paths[v] / num_paths[w]) * (1 + delta[w])
-            if w != s:
-                betw[w] += delta[w]
-    
-    for k in betw:
-        betw[k] /= sample_size
-    
-    top = sorted(betw.items(), key=lambda x: x[1], reverse=True)[:top_n]
-    info = ""
-    for i, (n, val) in enumerate(top, 1):
-        info += f"{i}. {n}: {val:.2f}\n"
-    return info
-
-def get_top_directors_closeness_string(graph, top_n=10, sample_size=50):
-    """
-    Closeness aproximada para diretores (grafo direcionado),
+    return escrita.em_texto(escrever_top_intermediacao, graph, top_n, sample_size, epsilon, delta)
+
+def get_top_directors_closeness_string(graph, top_n=10):
+    """
+    Closeness exata dos top diretores (grafo direcionado),
     penalizando nós inalcançáveis, exibindo 10 casas decimais.
     """
-    from collections import deque
-    import random
-
-    def neighbors(v):
-        return [w for (w, _) in graph.adj_list.get(v, [])]
-
-    nodes = list(graph.nodes)
-    if len(nodes) > sample_size:
-        sample = random.sample(nodes, sample_size)
-    else:
-        sample = nodes
-
-    closeness = {}
-    total_nodes = len(nodes)  # total de nós no grafo
-
-    for n in sample:
-        visited = {n: 0}
-        queue = deque([(n, 0)])
-        while queue:
-            v, dist = queue.popleft()
-            for w in neighbors(v):
-                if w not in visited:
-                    visited[w] = dist + 1
-                    queue.append((w, dist + 1))
-
-        # Penaliza nós não alcançáveis, atribuindo-lhes distância grande
-        dist_sum = sum(visited.values())
-        unreachable = total_nodes - len(visited)
-        dist_sum += unreachable * total_nodes
-
-        if dist_sum > 0:
-            # Closeness = (nós alcançados) / (soma das distâncias)
-            closeness[n] = (len(visited) - 1) / dist_sum
-        else:
-            closeness[n] = 0
-
-    # Ordena e gera texto final, com 10 casas decimais
-    top = sorted(closeness.items(), key=lambda x: x[1], reverse=True)[:top_n]
-    info = ""
-    for i, (director, val) in enumerate(top, 1):
-        info += f"{i}. {director}: {val:.10f}\n"
-    return info
+    return escrita.em_texto(escrever_top_proximidade, graph, top_n)
 
-def get_top_actors_closeness_string(graph, top_n=10, sample_size=50):
+def get_top_actors_closeness_string(graph, top_n=10):
     """
-    Closeness aproximada para atores (grafo não direcionado),
+    Closeness exata dos top atores (grafo não direcionado),
     penalizando nós inalcançáveis, exibindo 10 casas decimais.
     """
-    from collections import deque
-    import random
+    return escrita.em_texto(escrever_top_proximidade, graph, top_n)
 
-    nodes = list(graph.nodes)
-    if len(nodes) > sample_size:
-        sample = random.sample(nodes, sample_size)
-    else:
-        sample = nodes
-
-    closeness = {}
-    total_nodes = len(graph.nodes)
-
-    for n in sample:
-        visited = {n: 0}
-        queue = deque([(n, 0)])
-        while queue:
-            v, d = queue.popleft()
-            for w, _ in graph.adj_list.get(v, []):
-                if w not in visited:
-                    visited[w] = d + 1
-                    queue.append((w, d + 1))
-
-        # Penaliza nós não alcançáveis
-        dist_sum = sum(visited.values())
-        unreachable = total_nodes - len(visited)
-        dist_sum += unreachable * total_nodes
-
-        if dist_sum > 0:
-            closeness[n] = (len(visited) - 1) / dist_sum
-        else:
-            closeness[n] = 0
-
-    top = sorted(closeness.items(), key=lambda x: x[1], reverse=True)[:top_n]
-    info = ""
-    for i, (actor, val) in enumerate(top, 1):
-        info += f"{i}. {actor}: {val:.10f}\n"
-    return info
\ No newline at end of file
+def escrever_top_proximidade(saida, graph, top_n=10):
+    """
+    Top 'top_n' por proximidade exata, escrito em saida (escrita.Saida).
+    """
+    # BFS com poda: só os candidatos que podem entrar no top são varridos inteiros
+    escrever_ranking(saida, algoritmos.top_k_closeness(graph, top_n), 'proximidade', "{:.10f}")
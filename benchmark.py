@@ -0,0 +1,371 @@
+"""
+Benchmark das funções de algoritmos e analises sobre catálogos sintéticos.
+
+gerar_catalogo cria títulos no mesmo formato do csv da Netflix/Amazon/Disney,
+com elencos de tamanho de cauda pesada (Pareto), atores escolhidos por
+popularidade (Zipf) e diretores reaproveitados de forma preferencial (alguns
+diretores também atuam, o que cria ciclos no grafo direcionado).
+
+Para cada tamanho, mede a construção dos grafos e cada função pública de
+algoritmos e analises: tempo (menor de algumas repetições) e pico de memória
+(tracemalloc). Cada medida vira uma linha JSON em --saida; com --comparar,
+aponta as funções que ficaram mais lentas que uma execução anterior.
+
+    python benchmark.py --tamanhos 1000,5000,20000
+    python benchmark.py --sem-memoria                # só tempo (tracemalloc é lento)
+    python benchmark.py --funcoes closeness --comparar resultados/benchmark_antes.jsonl
+    python benchmark.py --sem-scipy                  # sem o backend esparso (Python puro)
+"""
+import algoritmos
+import analises
+import argparse
+import cache_resultados
+import collections
+import contextlib
+import csv
+import escrita
+import esparso
+import grafos
+import inspect
+import io
+import json
+import os
+import platform
+import random
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from array import array
+from itertools import accumulate
+
+SAIDA = os.path.join('resultados', 'benchmark.jsonl')
+
+# ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚
+
+# CATÁLOGO SINTÉTICO
+
+def gerar_catalogo(n_titulos, atores_por_titulo=2.0, alfa_elenco=1.4, max_elenco=60,
+                   zipf_atores=0.9, reuso_diretores=0.75, diretor_ator=0.02, semente=1):
+    """
+    Lista de (diretores, elenco) por título, com nomes já em maiúsculas.
+
+    atores_por_titulo: tamanho do universo de atores (n_titulos * isso)
+    alfa_elenco: expoente de Pareto do tamanho do elenco (menor = cauda mais pesada)
+    zipf_atores: expoente da popularidade dos atores (o ator i tem peso 1/(i+1)^zipf)
+    reuso_diretores: chance de um crédito de direção ir para um diretor que já
+    existe, escolhido proporcionalmente aos créditos que ele já tem
+    diretor_ator: chance desse diretor ser, na verdade, um dos atores
+
+    Cerca de 3% dos títulos ficam sem diretor e 3% sem elenco, como no csv real.
+    """
+    rng = random.Random(semente)
+    n_atores = max(1, int(n_titulos * atores_por_titulo))
+    atores = [f"ATOR {i}" for i in range(n_atores)]
+    # ordem de popularidade embaralhada, para o id não dizer quem é famoso
+    populares = atores[:]
+    rng.shuffle(populares)
+    pesos = list(accumulate(1 / (i + 1) ** zipf_atores for i in range(n_atores)))
+
+    creditos = [] # um item por crédito de direção (reuso preferencial)
+    n_diretores = 0
+    catalogo = []
+    for _ in range(n_titulos):
+        k = min(max_elenco, int(rng.paretovariate(alfa_elenco)))
+        elenco = list(dict.fromkeys(rng.choices(populares, cum_weights=pesos, k=k)))
+        if rng.random() < 0.03:
+            elenco = []
+
+        diretores = []
+        for _ in range(rng.choice((0, 1, 1, 1, 1, 1, 2, 3))):
+            if creditos and rng.random() < reuso_diretores:
+                nome = rng.choice(creditos)
+            elif rng.random() < diretor_ator:
+                nome = rng.choices(populares, cum_weights=pesos)[0]
+            else:
+                nome = f"DIRETOR {n_diretores}"
+                n_diretores += 1
+            if nome not in diretores:
+                diretores.append(nome)
+                creditos.append(nome)
+        catalogo.append((diretores, elenco))
+    return catalogo
+
+def listas(catalogo):
+    """(cast_list, director_list) como grafos.read_csv devolve: só títulos com elenco e diretor."""
+    cast_list = []
+    director_list = []
+    for diretores, elenco in catalogo:
+        if diretores and elenco:
+            cast_list.append(elenco)
+            director_list.append(diretores)
+    return cast_list, director_list
+
+def escrever_csv(caminho, catalogo):
+    """Grava o catálogo com as colunas que grafos.iter_csv lê."""
+    with open(caminho, 'w', newline='', encoding='utf-8') as arquivo:
+        escritor = csv.writer(arquivo)
+        escritor.writerow(['show_id', 'type', 'title', 'director', 'cast'])
+        for i, (diretores, elenco) in enumerate(catalogo):
+            escritor.writerow([f"s{i + 1}", 'Movie', f"TITULO {i}", ', '.join(diretores), ', '.join(elenco)])
+
+# ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚
+
+# CASOS
+# nome da função -> chamada com os dados preparados em _preparar; os
+# parâmetros limitam as varreduras completas (fontes, amostras) para que
+# os tamanhos maiores terminem em tempo razoável
+
+def _saida():
+    # as funções escrever_* escrevem texto e registros em memória
+    return escrita.Saida(io.StringIO(), io.StringIO())
+
+CASOS = {
+    'algoritmos.comp_conexas': lambda d: algoritmos.comp_conexas(d['u']),
+    'algoritmos.rotular_conexas': lambda d: algoritmos.rotular_conexas(d['d']),
+    'algoritmos.rotular_fortemente_conexas': lambda d: algoritmos.rotular_fortemente_conexas(d['d']),
+    'algoritmos.comp_fortemente_conexas': lambda d: algoritmos.comp_fortemente_conexas(d['d']),
+    'algoritmos.agrupar_componentes': lambda d: algoritmos.agrupar_componentes(d['d'], algoritmos.rotular_fortemente_conexas(d['d'])),
+    'algoritmos.peso_maximo_baldes': lambda d: algoritmos.peso_maximo_baldes(d['u']),
+    'algoritmos.caminhos_minimos': lambda d: algoritmos.caminhos_minimos(d['u'], d['id_u']),
+    'algoritmos.mst_prim': lambda d: algoritmos.mst_prim(d['u'], d['no_u']),
+    'algoritmos.mst_do_vertice': lambda d: algoritmos.mst_do_vertice(d['u'], d['no_u']),
+    'algoritmos.floresta_geradora_minima': lambda d: algoritmos.floresta_geradora_minima(d['u']),
+    'algoritmos.get_component_nodes': lambda d: algoritmos.get_component_nodes(d['u'], d['no_u']),
+    'algoritmos.get_mst_info_string': lambda d: algoritmos.get_mst_info_string(d['no_u'], *d['mst']),
+    'algoritmos.escrever_mst': lambda d: algoritmos.escrever_mst(_saida(), d['no_u'], *d['mst']),
+    'algoritmos.degree_centrality': lambda d: algoritmos.degree_centrality(d['u'], d['no_u']),
+    'algoritmos.print_degree_centrality': lambda d: algoritmos.print_degree_centrality(d['u'], d['no_u']),
+    'algoritmos.get_degree_centrality_string': lambda d: algoritmos.get_degree_centrality_string(d['u'], d['no_u']),
+    'algoritmos.escrever_centralidade_grau': lambda d: algoritmos.escrever_centralidade_grau(_saida(), d['u'], d['no_u']),
+    'algoritmos.betweenness_centrality': lambda d: algoritmos.betweenness_centrality(d['u'], d['no_u'], max_sources=50, semente=1),
+    'algoritmos.betweenness_todos': lambda d: algoritmos.betweenness_todos(d['u'], max_sources=50, semente=1),
+    'algoritmos.top_k': lambda d: algoritmos.top_k(d['u'], d['valores'], 10),
+    'algoritmos.top_betweenness': lambda d: algoritmos.top_betweenness(d['u'], 10, max_sources=50, semente=1),
+    'algoritmos.brandes_fonte': lambda d: algoritmos.brandes_fonte(d['u'], d['id_u']),
+    'algoritmos.dependencias': lambda d: algoritmos.dependencias(d['u'], d['fontes']),
+    'algoritmos.betweenness_adaptativa': lambda d: algoritmos.betweenness_adaptativa(d['u'], epsilon=0.05, semente=1),
+    'algoritmos.get_betweenness_centrality_string': lambda d: algoritmos.get_betweenness_centrality_string(d['u'], d['no_u']),
+    'algoritmos.escrever_centralidade_intermediacao': lambda d: algoritmos.escrever_centralidade_intermediacao(_saida(), d['u'], d['no_u']),
+    'algoritmos.closeness_centrality': lambda d: algoritmos.closeness_centrality(d['u'], [d['no_u']]),
+    'algoritmos.get_closeness_centrality_string': lambda d: algoritmos.get_closeness_centrality_string(d['u'], d['no_u']),
+    'algoritmos.escrever_centralidade_proximidade': lambda d: algoritmos.escrever_centralidade_proximidade(_saida(), d['u'], d['no_u']),
+    'algoritmos.top_k_closeness': lambda d: algoritmos.top_k_closeness(d['u'], 10),
+    'algoritmos.separacao': lambda d: algoritmos.separacao(d['u'], d['no_u'], d['alvo_u']),
+    'algoritmos.caminho_ponderado': lambda d: algoritmos.caminho_ponderado(d['u'], d['no_u'], d['alvo_u']),
+    'algoritmos.preparar_marcos': lambda d: algoritmos.preparar_marcos(d['u']),
+
+    'analises.graph_adjlist_neighbors': lambda d: analises.graph_adjlist_neighbors(d['u'], d['no_u']),
+    'analises.analyze_degree_distribution': lambda d: analises.analyze_degree_distribution(d['u'], "U"),
+    'analises.analyze_component_distribution': lambda d: analises.analyze_component_distribution(d['u'], d['d']),
+    'analises.get_top_actors_degree_string': lambda d: analises.get_top_actors_degree_string(d['u'], 10),
+    'analises.fast_betweenness_actors': lambda d: analises.fast_betweenness_actors(d['u'], 10),
+    'analises.get_top_directors_string': lambda d: analises.get_top_directors_string(d['d'], 10),
+    'analises.get_top_directors_betweenness_string_fast': lambda d: analises.get_top_directors_betweenness_string_fast(d['d'], 10),
+    'analises.get_top_directors_closeness_string': lambda d: analises.get_top_directors_closeness_string(d['d'], 10),
+    'analises.get_top_actors_closeness_string': lambda d: analises.get_top_actors_closeness_string(d['u'], 10),
+    'analises.escrever_distribuicao_graus': lambda d: analises.escrever_distribuicao_graus(_saida(), d['u'], "U"),
+    'analises.distribuicao_graus': lambda d: analises.distribuicao_graus(d['d']),
+    'analises.estatisticas_graus': lambda d: analises.estatisticas_graus(d['histograma']),
+    'analises.ajustar_lei_de_potencia': lambda d: analises.ajustar_lei_de_potencia(d['histograma']),
+    'analises.ccdf_em': lambda d: analises.ccdf_em(analises.estatisticas_graus(d['histograma'])['ccdf'], 8),
+    'analises.escrever_distribuicao_componentes': lambda d: analises.escrever_distribuicao_componentes(_saida(), d['u'], d['d']),
+    'analises.distribuicao_componentes': lambda d: analises.distribuicao_componentes(d['u'], d['d']),
+    'analises.rotular_componentes': lambda d: analises.rotular_componentes(d['u'], d['d']),
+    'analises.estatisticas_componentes': lambda d: analises.estatisticas_componentes(d['tamanhos']),
+    'analises.escrever_top_grau_atores': lambda d: analises.escrever_top_grau_atores(_saida(), d['u'], 10),
+    'analises.escrever_top_grau_diretores': lambda d: analises.escrever_top_grau_diretores(_saida(), d['d'], 10),
+    'analises.escrever_top_intermediacao': lambda d: analises.escrever_top_intermediacao(_saida(), d['u'], 10),
+    'analises.escrever_top_proximidade': lambda d: analises.escrever_top_proximidade(_saida(), d['u'], 10),
+    'analises.escrever_ranking': lambda d: analises.escrever_ranking(
+        _saida(), algoritmos.top_k(d['u'], d['valores'], 1000), 'grau', "{}"),
+}
+
+# funções públicas que não entram no benchmark, e por quê
+IGNORADAS = {
+    'algoritmos.test_degree_centrality': "demonstração que lê o csv real",
+}
+
+def funcoes_publicas():
+    """Nomes 'modulo.funcao' de todas as funções públicas de algoritmos e analises."""
+    nomes = []
+    for modulo in (algoritmos, analises):
+        for nome, funcao in inspect.getmembers(modulo, inspect.isfunction):
+            if funcao.__module__ == modulo.__name__ and not nome.startswith('_'):
+                nomes.append(f"{modulo.__name__}.{nome}")
+    return nomes
+
+def _preparar(gd, gu):
+    # vértices e entradas usados pelos casos: o ator de maior grau, uma
+    # amostra fixa de fontes (a primeira é o destino dos caminhos), um vetor
+    # de valores para top_k, a MST dele, o histograma de graus e os tamanhos
+    # das componentes
+    id_u = max(range(len(gu.names)), key=gu.degree)
+    no_u = gu.names[id_u]
+    with contextlib.redirect_stdout(io.StringIO()):
+        mst = algoritmos.mst_prim(gu, no_u)
+    fontes = random.Random(1).sample(range(len(gu.names)), min(20, len(gu.names)))
+    return {'d': gd, 'u': gu, 'id_u': id_u, 'no_u': no_u, 'alvo_u': gu.names[fontes[0]], 'fontes': fontes,
+            'valores': [float(gu.degree(i)) for i in range(len(gu.names))], 'mst': mst,
+            'histograma': collections.Counter(map(gu.degree, range(len(gu.names)))),
+            'tamanhos': array('i', gu.components().size_counts.elements())}
+
+# ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚
+
+# MEDIÇÃO
+
+def medir(funcao, repeticoes=3, antes=None, memoria=True):
+    """
+    (menor tempo em s, pico de memória em bytes) de funcao().
+    antes() roda antes de cada repetição (fora do tempo), para apagar
+    resultados guardados de chamadas anteriores. O pico é medido numa
+    execução separada com tracemalloc, que deixa o código bem mais lento
+    (memoria=False pula essa execução e o pico fica None).
+    """
+    tempos = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeticoes):
+            if antes:
+                antes()
+            inicio = time.perf_counter()
+            funcao()
+            tempos.append(time.perf_counter() - inicio)
+
+        if not memoria:
+            return min(tempos), None
+        if antes:
+            antes()
+        tracemalloc.start()
+        try:
+            funcao()
+            _, pico = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return min(tempos), pico
+
+def _limpar(*grafos_medidos):
+    # apaga o que os grafos guardam de chamadas anteriores (floresta, digital)
+    for grafo in grafos_medidos:
+        grafo._derivados = {}
+
+def executar(tamanhos, repeticoes=3, filtro=None, saida=SAIDA, semente=1, memoria=True, scipy=True):
+    """
+    Roda os casos escolhidos (filtro: regex sobre 'modulo.funcao') para cada
+    número de títulos em tamanhos e grava uma linha JSON por medida em saida.
+    scipy=False mede as versões em Python puro mesmo com SciPy instalado.
+    Retorna a lista de medidas.
+    """
+    cache_resultados.configurar(ativo=False) # mede o cálculo, não o disco
+    esparso.configurar(ativo=scipy)
+    padrao = re.compile(filtro) if filtro else None
+    escolhidos = [n for n in CASOS if not padrao or padrao.search(n)]
+    sem_caso = sorted(set(funcoes_publicas()) - set(CASOS) - set(IGNORADAS))
+    if sem_caso:
+        print(f"aviso: funções públicas sem caso de benchmark: {', '.join(sem_caso)}")
+
+    medidas = []
+    os.makedirs(os.path.dirname(saida) or '.', exist_ok=True)
+    with open(saida, 'w', encoding='utf-8') as arquivo:
+        def registrar(medida):
+            medidas.append(medida)
+            arquivo.write(json.dumps(medida, ensure_ascii=False) + "\n")
+            arquivo.flush()
+
+        registrar({'tipo': 'ambiente', 'python': platform.python_version(),
+                   'plataforma': platform.platform(), 'cpus': os.cpu_count(),
+                   'data': time.strftime('%Y-%m-%dT%H:%M:%S'), 'repeticoes': repeticoes,
+                   'semente': semente, 'memoria': memoria, 'scipy': scipy and esparso.disponivel(),
+                   'sem_caso': sem_caso})
+
+        for n_titulos in tamanhos:
+            catalogo = gerar_catalogo(n_titulos, semente=semente)
+            cast_list, director_list = listas(catalogo)
+            gu = grafos.undirected_graph(cast_list)
+            gd = grafos.directed_graph(cast_list, director_list)
+            nodes_u, edges_u = gu.get_numbers()
+            nodes_d, edges_d = gd.get_numbers()
+            base = {'tipo': 'medida', 'titulos': n_titulos,
+                    'vertices_u': nodes_u, 'arestas_u': edges_u,
+                    'vertices_d': nodes_d, 'arestas_d': edges_d}
+            print(f"{n_titulos} títulos: {nodes_u} atores / {edges_u} arestas, "
+                  f"{nodes_d} vértices / {edges_d} arcos no direcionado")
+
+            with tempfile.TemporaryDirectory() as pasta:
+                caminho = os.path.join(pasta, 'catalogo.csv')
+                escrever_csv(caminho, catalogo)
+                construcao = {
+                    'grafos.read_csv': lambda: grafos.read_csv(caminho),
+                    'grafos.undirected_graph': lambda: grafos.undirected_graph(cast_list),
+                    'grafos.directed_graph': lambda: grafos.directed_graph(cast_list, director_list),
+                    'grafos.graphs_from_csv': lambda: grafos.graphs_from_csv(caminho),
+                }
+                for nome, funcao in construcao.items():
+                    if padrao and not padrao.search(nome):
+                        continue
+                    tempo, pico = medir(funcao, repeticoes, memoria=memoria)
+                    registrar(dict(base, funcao=nome, tempo_s=tempo, pico_bytes=pico))
+                    print(_linha(nome, tempo, pico))
+
+            dados = _preparar(gd, gu)
+            for nome in escolhidos:
+                try:
+                    tempo, pico = medir(lambda: CASOS[nome](dados), repeticoes, lambda: _limpar(gd, gu), memoria)
+                except Exception as erro:  # registra e segue para o próximo caso
+                    registrar(dict(base, funcao=nome, erro=repr(erro)))
+                    print(f"  {nome}: ERRO {erro!r}")
+                    continue
+                registrar(dict(base, funcao=nome, tempo_s=tempo, pico_bytes=pico))
+                print(_linha(nome, tempo, pico))
+    return medidas
+
+def _linha(nome, tempo, pico):
+    memoria = f", {pico / (1 << 20):.1f} MB" if pico is not None else ""
+    return f"  {nome}: {tempo:.4f} s{memoria}"
+
+def comparar(medidas, arquivo_anterior, limiar=1.5, folga=0.01):
+    """
+    Compara com uma execução anterior (mesmo formato) e retorna as regressões:
+    (funcao, titulos, tempo antes, tempo agora) com agora > limiar * antes.
+    Diferenças menores que folga (s) são ruído de medição e não contam.
+    """
+    anteriores = {}
+    with open(arquivo_anterior, encoding='utf-8') as arquivo:
+        for linha in arquivo:
+            medida = json.loads(linha)
+            if medida.get('tipo') == 'medida' and 'tempo_s' in medida:
+                anteriores[(medida['funcao'], medida['titulos'])] = medida['tempo_s']
+    regressoes = []
+    for medida in medidas:
+        chave = (medida.get('funcao'), medida.get('titulos'))
+        antes = anteriores.get(chave)
+        if antes is None or 'tempo_s' not in medida:
+            continue
+        agora = medida['tempo_s']
+        if agora > limiar * antes and agora - antes > folga:
+            regressoes.append((*chave, antes, agora))
+    return regressoes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de algoritmos e analises em catálogos sintéticos.")
+    parser.add_argument('--tamanhos', default='1000,5000,20000', help="números de títulos, separados por vírgula")
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--funcoes', help="regex sobre 'modulo.funcao' (padrão: todas)")
+    parser.add_argument('--saida', default=SAIDA)
+    parser.add_argument('--semente', type=int, default=1)
+    parser.add_argument('--sem-memoria', action='store_true', help="não mede o pico de memória (tracemalloc é lento)")
+    parser.add_argument('--sem-scipy', action='store_true', help="não usa o backend SciPy (esparso)")
+    parser.add_argument('--comparar', help="jsonl de uma execução anterior")
+    parser.add_argument('--limiar', type=float, default=1.5, help="razão de tempo considerada regressão")
+    args = parser.parse_args()
+
+    tamanhos = [int(t) for t in args.tamanhos.split(',')]
+    medidas = executar(tamanhos, args.repeticoes, args.funcoes, args.saida, args.semente, not args.sem_memoria,
+                       not args.sem_scipy)
+    print(f"Medidas salvas em '{args.saida}'")
+    if args.comparar:
+        regressoes = comparar(medidas, args.comparar, args.limiar)
+        for funcao, titulos, antes, agora in regressoes:
+            print(f"REGRESSÃO {funcao} ({titulos} títulos): {antes:.4f} s -> {agora:.4f} s")
+        sys.exit(1 if regressoes else 0)
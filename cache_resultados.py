@@ -0,0 +1,224 @@
+"""
+Cache em disco dos resultados pesados de algoritmos e analises.
+
+Cada resultado fica num arquivo pickle em DIRETORIO, identificado pela
+impressão digital do grafo (Grafo.fingerprint), pelo nome da função, pelos
+parâmetros da chamada e pela versão do código (VERSAO e o hash das fontes
+de MODULOS: mudar qualquer algoritmo invalida os pickles antigos). Funções
+que sorteiam só são guardadas quando recebem uma semente. Quando o total
+passa de LIMITE_BYTES, os arquivos usados há mais tempo são apagados (LRU
+pela data de modificação, que é atualizada a cada leitura).
+
+Uso:
+    @cache_resultados.memorizar(ignorar=('workers',))
+    def funcao_pesada(grafo, k=10, workers=1): ...
+
+    @cache_resultados.memorizar(semente='semente')
+    def funcao_amostrada(grafo, amostras=50, semente=None): ...
+
+    cache_resultados.invalidar(funcao_pesada)   # só essa função
+    cache_resultados.invalidar(grafo=g)         # tudo que foi calculado em g
+    cache_resultados.invalidar()                # tudo
+"""
+import functools
+import hashlib
+import importlib.util
+import inspect
+import os
+import pickle
+
+DIRETORIO = os.path.join('cache', 'resultados')
+LIMITE_BYTES = 512 << 20 # 512 MB
+EXTENSAO = '.pkl'
+# módulos de que os resultados guardados dependem; o código deles entra na chave
+MODULOS = ('grafos', 'algoritmos', 'analises', 'esparso')
+VERSAO = 1 # aumente para invalidar tudo (ex.: mudança num módulo fora de MODULOS)
+
+_config = {'diretorio': DIRETORIO, 'limite_bytes': LIMITE_BYTES, 'ativo': True}
+
+
+def configurar(diretorio=None, limite_bytes=None, ativo=None):
+    """Troca o diretório, o limite de tamanho ou liga/desliga o cache."""
+    if diretorio is not None:
+        _config['diretorio'] = diretorio
+    if limite_bytes is not None:
+        _config['limite_bytes'] = limite_bytes
+    if ativo is not None:
+        _config['ativo'] = ativo
+
+
+def memorizar(ignorar=(), semente=None):
+    """
+    Decorador que guarda o retorno da função em disco.
+    ignorar: parâmetros que não mudam o resultado (ex.: workers, chunk_size)
+    e por isso ficam fora da chave.
+    semente: nome do parâmetro com a semente de uma função que sorteia; a
+    semente entra na chave e, quando ela é None, cada chamada sorteia de
+    novo e nada é lido nem gravado.
+    """
+    def decorador(funcao):
+        assinatura = inspect.signature(funcao)
+        nome = f"{funcao.__module__}.{funcao.__qualname__}"
+
+        @functools.wraps(funcao)
+        def envolvida(*args, **kwargs):
+            if not _config['ativo']:
+                return funcao(*args, **kwargs)
+            chamada = assinatura.bind(*args, **kwargs)
+            chamada.apply_defaults()
+            if semente is not None and chamada.arguments[semente] is None:
+                return funcao(*args, **kwargs)  # sorteio sem semente: sem cache
+            digitais = []
+            parametros = []
+            for parametro, valor in chamada.arguments.items():
+                if parametro in ignorar:
+                    continue
+                if hasattr(valor, 'fingerprint'):
+                    digitais.append(valor.fingerprint())
+                else:
+                    parametros.append((parametro, valor))
+            try:
+                caminho = _caminho(nome, digitais, parametros, (VERSAO, _hash_das_fontes(MODULOS)))
+            except (pickle.PicklingError, TypeError, AttributeError):
+                return funcao(*args, **kwargs)  # parâmetro que não vira chave: sem cache
+
+            achou, resultado = _ler(caminho)
+            if not achou:
+                resultado = funcao(*args, **kwargs)
+                _gravar(caminho, resultado)
+            return resultado
+
+        return envolvida
+    return decorador
+
+
+def invalidar(funcao=None, grafo=None):
+    """
+    Apaga as entradas da função e/ou do grafo dados (sem nenhum dos dois,
+    apaga tudo). Retorna quantos arquivos foram apagados.
+    """
+    prefixo = ''
+    if funcao is not None:
+        funcao = getattr(funcao, '__wrapped__', funcao)
+        prefixo = funcao if isinstance(funcao, str) else f"{funcao.__module__}.{funcao.__qualname__}"
+        prefixo += '__'
+    digital = grafo.fingerprint()[:16] if grafo is not None else None
+
+    apagados = 0
+    for nome, _, _ in _entradas():
+        if not nome.startswith(prefixo):
+            continue
+        if digital is not None and digital not in nome.rsplit('__', 2)[1].split('-'):
+            continue
+        if _apagar(nome):
+            apagados += 1
+    return apagados
+
+
+def tamanho():
+    """(número de entradas, bytes ocupados) do cache."""
+    entradas = _entradas()
+    return len(entradas), sum(ocupado for _, ocupado, _ in entradas)
+
+
+@functools.lru_cache(maxsize=None)
+def _hash_das_fontes(modulos):
+    # hash das fontes dos módulos (lidas uma vez por processo; os que não
+    # existem ficam de fora). find_spec não importa o módulo
+    h = hashlib.sha256()
+    for modulo in modulos:
+        try:
+            with open(importlib.util.find_spec(modulo).origin, 'rb') as arquivo:
+                fonte = arquivo.read()
+        except (AttributeError, ImportError, OSError, TypeError, ValueError):
+            continue
+        h.update(modulo.encode() + b'\0' + hashlib.sha256(fonte).digest())
+    return h.hexdigest()[:16]
+
+
+def _caminho(nome, digitais, parametros, versao):
+    # nome do arquivo: função__digitais dos grafos__hash da versão e dos parâmetros
+    h = hashlib.sha256(pickle.dumps((versao, parametros), protocol=4)).hexdigest()[:24]
+    grafos = '-'.join(d[:16] for d in digitais) or 'sem_grafo'
+    return os.path.join(_config['diretorio'], f"{nome}__{grafos}__{h}{EXTENSAO}")
+
+
+def _ler(caminho):
+    try:
+        with open(caminho, 'rb') as arquivo:
+            resultado = pickle.load(arquivo)
+    except FileNotFoundError:
+        return False, None
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        _apagar(os.path.basename(caminho))  # entrada corrompida ou de outra versão
+        return False, None
+    try:
+        os.utime(caminho)  # marca como usada agora (LRU)
+    except OSError:
+        pass
+    return True, resultado
+
+
+def _gravar(caminho, resultado):
+    try:
+        dados = pickle.dumps(resultado, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return  # resultado que não serializa: só não fica no cache
+    if len(dados) > _config['limite_bytes']:
+        return
+    os.makedirs(_config['diretorio'], exist_ok=True)
+    # grava num temporário e renomeia: leitores (ou outro processo) nunca
+    # veem um arquivo pela metade
+    tmp = f"{caminho}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as arquivo:
+        arquivo.write(dados)
+    os.replace(tmp, caminho)
+    _podar()
+
+
+def _podar():
+    # apaga as entradas usadas há mais tempo até caber no limite
+    entradas = _entradas()
+    total = sum(ocupado for _, ocupado, _ in entradas)
+    limite = _config['limite_bytes']
+    for nome, ocupado, _ in sorted(entradas, key=lambda e: e[2]):
+        if total <= limite:
+            break
+        if _apagar(nome):
+            total -= ocupado
+
+
+def _entradas():
+    # (nome do arquivo, bytes, último uso) de cada entrada
+    entradas = []
+    try:
+        nomes = os.listdir(_config['diretorio'])
+    except FileNotFoundError:
+        return entradas
+    for nome in nomes:
+        if not nome.endswith(EXTENSAO):
+            continue
+        try:
+            info = os.stat(os.path.join(_config['diretorio'], nome))
+        except FileNotFoundError:
+            continue
+        entradas.append((nome, info.st_size, info.st_mtime))
+    return entradas
+
+
+def _apagar(nome):
+    try:
+        os.remove(os.path.join(_config['diretorio'], nome))
+        return True
+    except FileNotFoundError:
+        return False
+
+
+if __name__ == "__main__":
+    import sys
+    if sys.argv[1:] == ['limpar']:
+        print(f"{invalidar()} entradas apagadas de {_config['diretorio']}")
+    else:
+        n, total = tamanho()
+        print(f"{n} entradas em {_config['diretorio']} ({total / (1 << 20):.1f} MB)")
+        print("uso: python cache_resultados.py [limpar]")
@@ -0,0 +1,101 @@
+"""
+Saída dos relatórios em streaming: cada seção escreve o texto direto no
+arquivo, sem acumular a string inteira em memória, e ao lado grava um
+registro JSON por linha (JSON Lines) com os mesmos números, para quem for
+consumir os resultados sem ler o texto.
+
+    with escrita.secao('resultados', 'cfc') as saida:
+        saida.escrever("Componente Fortemente Conexa 1 (3 nós):\\n")
+        saida.registro('componente', indice=1, tamanho=3, vertices=[...])
+
+O texto de cada seção fica em resultados/secoes/<nome>.txt e os registros em
+resultados/dados/<nome>.jsonl; o relatório final é montado copiando os
+arquivos das seções aos pedaços (copiar). Quem só quer a string usa em_texto.
+
+Arrays grandes (ex.: o rótulo de componente de cada vértice) são anexados à
+seção em binário, em resultados/dados/<nome>.<array>.bin, para outras etapas
+lerem de volta com ler_array sem refazer a conta.
+"""
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+from array import array
+
+
+class Saida:
+    """Destino de uma seção: texto corrido e, opcionalmente, registros JSON Lines."""
+
+    def __init__(self, texto, dados=None, base=None):
+        self.texto = texto  # arquivo (ou StringIO) de texto
+        self.dados = dados  # arquivo dos registros (None = descarta)
+        self.base = base    # prefixo dos arquivos binários da seção (None = descarta)
+
+    def escrever(self, texto):
+        self.texto.write(texto)
+
+    def registro(self, tipo, **campos):
+        # uma linha {"tipo": ..., campos...}; valores precisam ser serializáveis em JSON
+        if self.dados is not None:
+            self.dados.write(json.dumps({'tipo': tipo, **campos}, ensure_ascii=False))
+            self.dados.write("\n")
+
+    def anexar(self, nome, valores):
+        # grava o array.array valores cru em <base>.<nome>.bin e registra onde ficou
+        if self.base is None:
+            return
+        caminho = f"{self.base}.{nome}.bin"
+        with open(caminho, 'wb') as arquivo:
+            valores.tofile(arquivo)
+        self.registro('array', nome=nome, arquivo=os.path.basename(caminho),
+                      typecode=valores.typecode, itens=len(valores), ordem=sys.byteorder)
+
+
+def em_texto(escritor, *args, **kwargs):
+    """Roda escritor(saida, *args, **kwargs) em memória e retorna só o texto."""
+    buffer = io.StringIO()
+    escritor(Saida(buffer), *args, **kwargs)
+    return buffer.getvalue()
+
+
+def caminhos(pasta, nome):
+    """(arquivo de texto, arquivo JSON Lines) da seção nome dentro de pasta."""
+    return (os.path.join(pasta, 'secoes', nome + '.txt'),
+            os.path.join(pasta, 'dados', nome + '.jsonl'))
+
+
+@contextlib.contextmanager
+def secao(pasta, nome):
+    """Abre os arquivos da seção nome (regravando-os) e entrega a Saida que escreve neles."""
+    caminho_texto, caminho_dados = caminhos(pasta, nome)
+    os.makedirs(os.path.dirname(caminho_texto), exist_ok=True)
+    os.makedirs(os.path.dirname(caminho_dados), exist_ok=True)
+    with open(caminho_texto, 'w', encoding='utf-8') as texto, \
+            open(caminho_dados, 'w', encoding='utf-8') as dados:
+        yield Saida(texto, dados, os.path.splitext(caminho_dados)[0])
+
+
+def copiar(destino, pasta, nome):
+    """Acrescenta o texto da seção nome ao arquivo aberto destino, aos pedaços."""
+    with open(caminhos(pasta, nome)[0], encoding='utf-8') as origem:
+        shutil.copyfileobj(origem, destino)
+
+
+def ler_array(pasta, nome, array_nome):
+    """Array anexado com Saida.anexar na seção nome (KeyError se não existe)."""
+    caminho_dados = caminhos(pasta, nome)[1]
+    with open(caminho_dados, encoding='utf-8') as dados:
+        for linha in dados:
+            registro = json.loads(linha)
+            if registro['tipo'] == 'array' and registro['nome'] == array_nome:
+                break
+        else:
+            raise KeyError(f"Array {array_nome} não encontrado na seção {nome}")
+    valores = array(registro['typecode'])
+    with open(os.path.join(os.path.dirname(caminho_dados), registro['arquivo']), 'rb') as arquivo:
+        valores.frombytes(arquivo.read())
+    if registro['ordem'] != sys.byteorder:
+        valores.byteswap()
+    return valores
@@ -0,0 +1,160 @@
+"""
+Backend opcional com SciPy: exporta o Grafo como matriz esparsa CSR
+(scipy.sparse, montada uma vez a partir dos arrays do grafo) e roda componentes,
+Dijkstra, árvore geradora mínima e BFS em scipy.sparse.csgraph, em código
+compilado em vez de laços do interpretador.
+
+    esparso.disponivel()             # False sem SciPy/NumPy instalados
+    esparso.configurar(ativo=False)  # volta para as versões em Python puro
+
+Com o backend ativo, rotular_conexas, rotular_fortemente_conexas,
+closeness_centrality, floresta_geradora_minima (Kruskal) e
+get_component_nodes de algoritmos delegam para cá, com os mesmos
+resultados. Sem SciPy nada muda. Só vale para o Grafo: a ProjecaoBipartida
+teria de ser materializada inteira para virar matriz.
+"""
+import grafos
+import instrumentacao
+from array import array
+
+try:
+    import numpy as np
+    from scipy import sparse
+    from scipy.sparse import csgraph
+except ImportError:  # sem SciPy: algoritmos usa as implementações em Python
+    np = sparse = csgraph = None
+
+BLOCO_FONTES = 256 # fontes por chamada do dijkstra (limita a matriz de distâncias)
+
+_config = {'ativo': True}
+
+
+def disponivel():
+    """True se SciPy e NumPy puderam ser importados."""
+    return csgraph is not None
+
+
+def configurar(ativo=None):
+    """ativo: liga/desliga o backend (ligado por padrão quando disponível)."""
+    if ativo is not None:
+        _config['ativo'] = ativo
+
+
+def usar(grafo):
+    # as funções de algoritmos perguntam isto antes de delegar
+    return _config['ativo'] and csgraph is not None and isinstance(grafo, grafos.Grafo) and len(grafo.names) > 0
+
+
+def matriz(grafo):
+    """
+    scipy.sparse.csr_array n x n com os pesos (linha = origem), copiada dos
+    arrays do grafo (também dos mapeados de snapshot) já nos tipos que o
+    csgraph usa (float64, índices int32 quando cabem), para nenhuma chamada
+    converter de novo. Fica guardada no grafo até a próxima alteração.
+    """
+    m = grafo._derivados.get('matriz_esparsa')
+    if m is None:
+        offsets, targets, weights = grafo.csr()
+        n = len(grafo.names)
+        indice = np.int32 if max(n, len(targets)) < 2**31 else np.int64
+        dados = (np.asarray(memoryview(weights), dtype=np.float64),
+                 np.asarray(memoryview(targets), dtype=indice),
+                 np.asarray(memoryview(offsets), dtype=indice))
+        m = grafo._derivados['matriz_esparsa'] = sparse.csr_array(dados, shape=(n, n))
+    return m
+
+
+def _para_array(valores, typecode='i'):
+    # numpy -> array.array (o formato que o resto do código usa)
+    saida = array(typecode)
+    saida.frombytes(np.ascontiguousarray(valores, dtype=saida.typecode).tobytes())
+    return saida
+
+
+@instrumentacao.medido()
+def rotular_conexas(grafo):
+    """
+    (rotulo, tamanhos) como algoritmos.rotular_conexas: componentes
+    fracamente conexas, renumeradas na ordem do primeiro vértice de cada uma.
+    """
+    _, rotulo = csgraph.connected_components(matriz(grafo), directed=True, connection='weak')
+    _, primeiro = np.unique(rotulo, return_index=True)
+    novo = np.empty(len(primeiro), dtype=np.int64)
+    novo[np.argsort(primeiro)] = np.arange(len(primeiro))
+    rotulo = novo[rotulo]
+    return _para_array(rotulo), _para_array(np.bincount(rotulo))
+
+
+@instrumentacao.medido()
+def rotular_fortemente_conexas(grafo):
+    """
+    (rotulo, tamanhos) como algoritmos.rotular_fortemente_conexas. O
+    csgraph usa o algoritmo de Pearce, que fecha as componentes na mesma
+    sequência do Tarjan quando a DFS segue a mesma ordem; como ele visita
+    os vizinhos de cada linha do último para o primeiro, a matriz vai com
+    as linhas invertidas e os rótulos (em ordem topológica reversa) saem iguais.
+    Os dados precisam já estar em float64: numa conversão o csgraph
+    reordenaria os índices de cada linha.
+    """
+    m = matriz(grafo)
+    offsets = m.indptr
+    linha = np.repeat(np.arange(m.shape[0]), np.diff(offsets))
+    invertida = offsets[linha] + offsets[linha + 1] - 1 - np.arange(len(m.indices))
+    m = sparse.csr_array((m.data[invertida], m.indices[invertida], offsets), shape=m.shape)
+    _, rotulo = csgraph.connected_components(m, directed=True, connection='strong')
+    return _para_array(rotulo), _para_array(np.bincount(rotulo))
+
+
+@instrumentacao.medido()
+def closeness_centrality(grafo, vertices):
+    """
+    Como algoritmos.closeness_centrality: Dijkstra de cada vértice pedido
+    (BLOCO_FONTES fontes por chamada). Com pesos inteiros as somas são
+    exatas e os valores, idênticos; com pesos reais podem diferir no último
+    bit pela ordem da soma.
+    """
+    n = len(grafo.names)
+    centralidade = {}
+    ids = []
+    for v in vertices:
+        s_id = grafo.node_id(v)
+        if s_id is None:
+            centralidade[v] = 0.0
+        else:
+            ids.append((v, s_id))
+    m = matriz(grafo)
+    for k in range(0, len(ids), BLOCO_FONTES):
+        bloco = ids[k:k + BLOCO_FONTES]
+        distancias = csgraph.dijkstra(m, directed=True, indices=[s for _, s in bloco])
+        instrumentacao.contar('fontes', len(bloco))
+        for (v, _), linha in zip(bloco, distancias):
+            alcancados = linha[np.isfinite(linha)]
+            reach = len(alcancados) - 1
+            total_dist = alcancados.sum().item()
+            if reach > 0 and total_dist > 0:
+                centralidade[v] = reach / total_dist * ((n - 1) / reach)
+            else:
+                centralidade[v] = 0.0
+    return centralidade
+
+
+@instrumentacao.medido()
+def kruskal(grafo):
+    """
+    Arestas (u, v, peso) da floresta geradora mínima, com u < v e na ordem
+    de algoritmos._kruskal (peso, depois u, depois v).
+    """
+    floresta = sparse.coo_array(csgraph.minimum_spanning_tree(matriz(grafo)))
+    u = np.minimum(floresta.row, floresta.col)
+    v = np.maximum(floresta.row, floresta.col)
+    pesos = floresta.data
+    ordem = np.lexsort((v, u, pesos))
+    inteiros = grafos._tipo(grafo.csr()[2]) != 'd'
+    return [(a, b, int(w) if inteiros else w)
+            for a, b, w in zip(u[ordem].tolist(), v[ordem].tolist(), pesos[ordem].tolist())]
+
+
+@instrumentacao.medido()
+def alcancaveis(grafo, s):
+    """Ids dos vértices alcançados a partir de s numa BFS (s incluso)."""
+    return csgraph.breadth_first_order(matriz(grafo), s, directed=True, return_predecessors=False).tolist()
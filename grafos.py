@@ -1,82 +1,986 @@
 import csv
-from collections import defaultdict
+import hashlib
+import instrumentacao
+import mmap
+import operator
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Mapping, Set
+from itertools import accumulate, chain, combinations, islice, product, repeat
+
+
+class _NodeView(Set):
+    """Visão somente leitura dos nomes dos vértices (substitui o antigo set)."""
+
+    def __init__(self, grafo):
+        self._grafo = grafo
+
+    def __contains__(self, v):
+        return v in self._grafo._ids
+
+    def __iter__(self):
+        return iter(self._grafo.names)
+
+    def __len__(self):
+        return len(self._grafo.names)
+
+
+class _AdjView(Mapping):
+    """
+    Visão somente leitura da lista de adjacências no formato antigo:
+    adj_list[nome] -> [(vizinho, peso), ...].
+    As listas são montadas sob demanda a partir dos arrays do grafo.
+    """
+
+    def __init__(self, grafo):
+        self._grafo = grafo
+
+    def __getitem__(self, v):
+        # igual ao defaultdict antigo: vértice desconhecido não tem vizinhos
+        i = self._grafo._ids.get(v)
+        if i is None:
+            return []
+        names = self._grafo.names
+        return [(names[j], w) for j, w in self._grafo.neighbors(i)]
+
+    def __contains__(self, v):
+        return v in self._grafo._ids
+
+    def __iter__(self):
+        return iter(self._grafo.names)
+
+    def __len__(self):
+        return len(self._grafo.names)
+
+
+class UniaoBusca:
+    """
+    Conjuntos disjuntos (union-find) com compressão de caminho e união por
+    tamanho. Além do pai de cada elemento, mantém o número de conjuntos e a
+    distribuição de tamanhos (tamanho -> quantos conjuntos), então essas
+    consultas são O(1).
+    """
+
+    def __init__(self, n=0):
+        self.parent = array('i', range(n))
+        self.size = array('i', [1]) * n
+        self.n_sets = n
+        self.size_counts = Counter({1: n}) if n else Counter()
+
+    def add(self):
+        # novo conjunto unitário; retorna o id
+        i = len(self.parent)
+        self.parent.append(i)
+        self.size.append(1)
+        self.n_sets += 1
+        self.size_counts[1] += 1
+        return i
+
+    def find(self, i):
+        # raiz do conjunto de i, comprimindo o caminho no retorno
+        parent = self.parent
+        raiz = i
+        while parent[raiz] != raiz:
+            raiz = parent[raiz]
+        while parent[i] != raiz:
+            parent[i], i = raiz, parent[i]
+        return raiz
+
+    def union(self, a, b):
+        # une os conjuntos de a e b; retorna False se já eram o mesmo
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return False
+        size = self.size
+        if size[a] < size[b]:
+            a, b = b, a
+        contagem = self.size_counts
+        for s in (size[a], size[b]):
+            contagem[s] -= 1
+            if not contagem[s]:
+                del contagem[s]
+        self.parent[b] = a
+        size[a] += size[b]
+        contagem[size[a]] += 1
+        self.n_sets -= 1
+        return True
+
+    def union_all(self, ids):
+        # une todos os ids de uma sequência num só conjunto
+        for a, b in zip(ids, ids[1:]):
+            self.union(a, b)
+
 
 class Grafo:
-    def __init__(self, directed=False):
+    """
+    Grafo ponderado com armazenamento compacto (CSR).
+
+    Cada vértice recebe um id inteiro (ordem de inserção). As arestas ficam em
+    três arrays: offsets (início da linha de cada vértice), targets (id do
+    vizinho) e weights (peso). As linhas ficam ordenadas pelo id do vizinho.
+
+    Arestas adicionadas com add_edge ficam num buffer (_pending) até o
+    finalize(), que junta tudo nos arrays. As leituras já enxergam o buffer,
+    então chamar finalize() é opcional, mas libera a memória dos dicts.
+
+    O grau de entrada de cada vértice é mantido a cada aresta nova, e o
+    índice reverso (predecessores) é montado no primeiro uso e depois
+    atualizado junto com as arestas.
+
+    Com track_components=True um UniaoBusca é atualizado a cada aresta, e
+    número de componentes, componente de cada vértice e distribuição de
+    tamanhos viram consultas quase O(1), mesmo durante a construção. Sem a
+    opção, a estrutura é montada na primeira consulta e mantida dali em diante.
+    No grafo direcionado as componentes são as fracamente conexas.
+
+    adj_list e nodes continuam disponíveis como visões no formato antigo.
+    """
+
+    def __init__(self, directed=False, track_components=False):
         self.directed = directed # se o grafo é direcionado ou não
-        self.adj_list = defaultdict(list)  # Lista de adjacências
-        self.nodes = set()               # Conjunto de vértices
-        self.n_edges = 0
+        self.names = []          # id -> nome do vértice
+        self._ids = {}           # nome do vértice -> id
+        self.offsets = array('q', [0])
+        self.targets = array('i')
+        self.weights = array('i')
+        self._pending = {}       # id -> {id vizinho: peso} ainda fora dos arrays
+        self.n_edges = 0         # entradas de adjacência (não direcionado conta a-b e b-a)
+        self._n_loops = 0        # laços a-a (uma entrada só, mesmo sem direção)
+        self._in_degree = array('i')  # id -> grau de entrada
+        self._rev = None         # (offsets, sources, weights) do índice reverso
+        self._rev_pending = {}   # id -> {id predecessor: peso} fora do índice reverso
+        self._uf = UniaoBusca() if track_components else None  # componentes (ver components())
+        self._snapshot = None    # caminho do snapshot mapeado (se veio de load)
+        self._faixa_pesos = None # (menor, maior) peso, ver weight_range()
+        self._derivados = {}     # resultados calculados das arestas (ex.: floresta geradora mínima)
+        self.source_hash = b''   # origem dos dados gravada no snapshot (ex.: sha256 do csv)
+        self.adj_list = _AdjView(self)  # Lista de adjacências (visão)
+        self.nodes = _NodeView(self)    # Conjunto de vértices (visão)
 
     def add_node(self, v):
-        #Adiciona um vértice 
-        self.nodes.add(v)
+        #Adiciona um vértice e retorna o seu id
+        i = self._ids.get(v)
+        if i is None:
+            i = len(self.names)
+            self._ids[v] = i
+            self.names.append(v)
+            self._in_degree.append(0)
+            if self._uf is not None:
+                self._uf.add()
+            self._snapshot = None  # já não é igual ao arquivo mapeado
+            self._derivados = {}
+        return i
+
+    def node_id(self, v):
+        # id do vértice, ou None se ele não existir
+        return self._ids.get(v)
 
     def add_edge(self, u, v, weight=1): # u e v são os vértices e weight é o peso da aresta (se n tiver peso fica 1)
         """
         add aresta entre dois vértices
         se o grafo for direcionado, adiciona a aresta no sentido u -> v
         se o grafo não for direcionado, adiciona a aresta nos 2 sentidos
+        se a aresta já existir, soma o peso
+        """
+        iu = self.add_node(u)
+        iv = self.add_node(v)
+        self._add_entry(iu, iv, weight)
+        if not self.directed and iu != iv:
+            self._add_entry(iv, iu, weight)
+        if self._uf is not None:
+            self._uf.union(iu, iv)
+
+    def _add_entry(self, i, j, weight):
+        self._snapshot = None
+        self._faixa_pesos = None
+        self._derivados = {}
+        linha = self._pending.get(i)
+        if linha is None:
+            linha = self._pending[i] = {}
+        if j not in linha and not self._in_base(i, j):
+            self.n_edges += 1
+            self._in_degree[j] += 1
+            if i == j:
+                self._n_loops += 1
+        linha[j] = linha.get(j, 0) + weight
+        if self._rev is not None:
+            reversa = self._rev_pending.setdefault(j, {})
+            reversa[i] = reversa.get(i, 0) + weight
+        if _tipo(self.weights) == 'i' and not isinstance(weight, int):
+            self.weights = array('d', self.weights)
+            if self._rev is not None:
+                self._rev = self._rev[:2] + (array('d', self._rev[2]),)
+
+    def _in_base(self, i, j):
+        # busca binária na linha i dos arrays (linhas ordenadas por vizinho)
+        if i + 1 >= len(self.offsets):
+            return False
+        a, b = self.offsets[i], self.offsets[i + 1]
+        k = bisect_left(self.targets, j, a, b)
+        return k < b and self.targets[k] == j
+
+    def add_pair_counts(self, contagem, union=True):
+        """
+        Adiciona de uma vez as arestas de um dict {(id u, id v): peso}.
+        Os ids já devem existir (add_node). Num grafo vazio os arrays CSR são
+        montados direto por contagem (sem passar pelo buffer de pendentes).
+        union=False indica que as componentes já foram unidas por quem chamou.
+        """
+        if union and self._uf is not None:
+            for i, j in contagem:
+                self._uf.union(i, j)
+
+        if self.n_edges or self._pending:
+            for (i, j), w in contagem.items():
+                self._add_entry(i, j, w)
+                if not self.directed and i != j:
+                    self._add_entry(j, i, w)
+            return
+
+        n = len(self.names)
+        itens = sorted(contagem.items())
+        offsets = array('q', bytes(8 * (n + 1)))
+        for (i, j), _ in itens:
+            offsets[i + 1] += 1
+            if not self.directed and i != j:
+                offsets[j + 1] += 1
+        for i in range(n):
+            offsets[i + 1] += offsets[i]
+
+        # com as chaves ordenadas, cada linha já sai ordenada pelo vizinho
+        pos = offsets[:-1]
+        total = offsets[n]
+        targets = array('i', bytes(4 * total))
+        tipo = 'i' if all(isinstance(w, int) for w in contagem.values()) else 'd'
+        weights = array(tipo, bytes(array(tipo).itemsize * total))
+        for (i, j), w in itens:
+            k = pos[i]
+            targets[k] = j
+            weights[k] = w
+            pos[i] = k + 1
+            if i == j:
+                self._n_loops += 1
+            elif not self.directed:
+                k = pos[j]
+                targets[k] = i
+                weights[k] = w
+                pos[j] = k + 1
+
+        self.offsets, self.targets, self.weights = offsets, targets, weights
+        self.n_edges = total
+        self._count_in_degrees()
+        # o grafo podia ter vértices (sem arestas) e resultados já calculados
+        self._rev, self._rev_pending = None, {}
+        self._snapshot = self._faixa_pesos = None
+        self._derivados = {}
+
+    @instrumentacao.medido()
+    def add_titles(self, titulos):
+        """
+        Atualização incremental: acrescenta títulos novos, cada um como
+        (elenco, diretores) no formato de iter_csv. No direcionado entram os
+        arcos ator -> diretor; no não direcionado, os pares de atores do mesmo
+        elenco. Os pares são gerados como no ConstrutorGrafo, então o grafo
+        fica igual (ids, arrays e fingerprint) ao reconstruído com o catálogo
+        completo.
+
+        Vértices, pesos, graus de entrada e componentes (se já montadas) são
+        atualizados no lugar; as linhas tocadas ficam no buffer de pendentes
+        até o próximo finalize(), então o custo é proporcional ao delta.
+        Funciona também sobre um grafo mapeado de snapshot.
+
+        Retorna dict com:
+          titulos, vertices_novos (nomes), arestas_novas, arestas_atualizadas
+          (já existiam e tiveram o peso somado), tocados (ids, ordenados, dos
+          vértices com vizinhança ou grau alterados) e componentes_unidas
+          (None se as componentes ainda não foram montadas).
         """
-        self.nodes.update([u, v])
+        n_antes = len(self.names)
+        arestas_antes = self.get_numbers()[1]
+        componentes_antes = self._uf.n_sets if self._uf is not None else None
+
+        contagem = Counter()  # (id u, id v) -> peso, como no ConstrutorGrafo
+        n_titulos = 0
+        for cast, directors in titulos:
+            n_titulos += 1
+            if self.directed:
+                atores = list(map(self.add_node, cast))
+                contagem.update(product(atores, list(map(self.add_node, directors))))
+            elif len(cast) > 1:
+                contagem.update(combinations(sorted(map(self.add_node, cast)), 2))
+        self.add_pair_counts(contagem)
 
-        # se a aresta já existir, soma o peso
-        for idx, (viz, peso_atual) in enumerate(self.adj_list[u]):
-            if viz == v:
-                self.adj_list[u][idx] = (viz, peso_atual + weight)
-                if not self.directed:
-                    for jdx, (viz2, peso_atual2) in enumerate(self.adj_list[v]):
-                        if viz2 == u:
-                            self.adj_list[v][jdx] = (viz2, peso_atual2 + weight)
-                return
+        tocados = set(range(n_antes, len(self.names)))
+        for i, j in contagem:
+            tocados.add(i)
+            tocados.add(j)
+        arestas_novas = self.get_numbers()[1] - arestas_antes
+        unidas = None
+        if componentes_antes is not None:
+            unidas = componentes_antes + len(self.names) - n_antes - self._uf.n_sets
 
-        # se a aresta ainda não existir, cria
-        self.adj_list[u].append((v, weight))
-        self.n_edges += 1
+        instrumentacao.contar('titulos', n_titulos)
+        instrumentacao.contar('pares', len(contagem))
+        return {
+            'titulos': n_titulos,
+            'vertices_novos': self.names[n_antes:],
+            'arestas_novas': arestas_novas,
+            'arestas_atualizadas': len(contagem) - arestas_novas,
+            'tocados': sorted(tocados),
+            'componentes_unidas': unidas,
+        }
 
+    def _count_in_degrees(self):
+        # recalcula os graus de entrada a partir dos arrays (sem pendentes)
+        self._in_degree = array('i', bytes(4 * len(self.names)))
+        for j, c in Counter(self.targets).items():
+            self._in_degree[j] = c
+
+    def finalize(self):
+        """
+        Junta o buffer de arestas pendentes aos arrays CSR.
+        Retorna o próprio grafo, então dá pra encadear: g = Grafo().finalize()
+        """
+        n = len(self.names)
+        if not self._pending and len(self.offsets) == n + 1:
+            return self
+
+        self.offsets, self.targets, self.weights = _merge_rows(
+            self.offsets, self.targets, self.weights, self._pending, n)
+        self._pending = {}
+        if self._rev is not None and (self._rev_pending or len(self._rev[0]) != n + 1):
+            self._rev = _merge_rows(*self._rev, self._rev_pending, n)
+            self._rev_pending = {}
+        return self
+
+    @property
+    def frozen(self):
+        # True quando não há arestas fora dos arrays
+        return not self._pending and len(self.offsets) == len(self.names) + 1
+
+    def csr(self):
+        """Retorna (offsets, targets, weights) já com o buffer incorporado."""
+        self.finalize()
+        return self.offsets, self.targets, self.weights
+
+    def weight_range(self):
+        """
+        (menor, maior) peso das arestas, ou None se o grafo não tem arestas.
+        Fica guardado até a próxima aresta inserida.
+        """
+        if self._faixa_pesos is None:
+            weights = self.csr()[2]
+            if len(weights):
+                self._faixa_pesos = (min(weights), max(weights))
+        return self._faixa_pesos
+
+    def fingerprint(self):
+        """
+        sha256 (hex) do conteúdo do grafo: direção, nomes e arrays CSR.
+        Identifica o grafo no cache de resultados; fica guardado até a
+        próxima alteração.
+        """
+        digital = self._derivados.get('fingerprint')
+        if digital is None:
+            offsets, targets, weights = self.csr()
+            h = hashlib.sha256(b'D' if self.directed else b'U')
+            h.update(_tipo(weights).encode())
+            for dados in (offsets, targets, weights):
+                h.update(dados)
+            h.update('\x00'.join(self.names).encode('utf-8'))
+            digital = self._derivados['fingerprint'] = h.hexdigest()
+        return digital
+
+    def _bounds(self, i):
+        if i + 1 < len(self.offsets):
+            return self.offsets[i], self.offsets[i + 1]
+        return 0, 0
+
+    def neighbors(self, i):
+        """Itera (id vizinho, peso) do vértice de id i."""
+        a, b = self._bounds(i)
+        extra = self._pending.get(i) if self._pending else None
+        if extra:
+            return _merge_row(self.targets[a:b], self.weights[a:b], extra)
+        return zip(self.targets[a:b], self.weights[a:b])
+
+    def neighbor_ids(self, i):
+        """Sequência com os ids dos vizinhos do vértice de id i."""
+        if self._pending and i in self._pending:
+            return [j for j, _ in self.neighbors(i)]
+        a, b = self._bounds(i)
+        return self.targets[a:b]
+
+    def degree(self, i):
+        # grau de saída do vértice de id i
+        if self._pending and i in self._pending:
+            return len(self.neighbor_ids(i))
+        a, b = self._bounds(i)
+        return b - a
+
+    def in_degree(self, i):
+        # grau de entrada do vértice de id i (O(1), mantido a cada aresta)
+        return self._in_degree[i]
+
+    def degrees(self):
+        """Array id -> grau de saída, lido dos offsets do CSR em O(V)."""
+        offsets = self.csr()[0]
+        return array('i', map(operator.sub, offsets[1:], offsets[:-1]))
+
+    def in_degrees(self):
+        """Array id -> grau de entrada (no não direcionado é igual ao grau)."""
+        return self._in_degree
+
+    def _reverse_index(self):
+        # monta o índice reverso (CSR por destino) na primeira chamada
+        if self._rev is None:
+            offsets, targets, weights = self.csr()
+            n = len(self.names)
+            rev_offsets = array('q', accumulate(self._in_degree, initial=0))
+            pos = rev_offsets[:-1]
+            sources = array('i', bytes(4 * len(targets)))
+            rev_weights = array(_tipo(weights), bytes(array(_tipo(weights)).itemsize * len(targets)))
+            for i in range(n):
+                for k in range(offsets[i], offsets[i + 1]):
+                    j = targets[k]
+                    p = pos[j]
+                    sources[p] = i
+                    rev_weights[p] = weights[k]
+                    pos[j] = p + 1
+            self._rev = (rev_offsets, sources, rev_weights)
+        return self._rev
+
+    def predecessors(self, i):
+        """Itera (id predecessor, peso) das arestas que chegam no vértice de id i."""
         if not self.directed:
-            # se a aresta pro outro sentido ainda não existir, cria
-            if not any(viz == u for viz, _ in self.adj_list[v]):
-                self.adj_list[v].append((u, weight))
+            return self.neighbors(i)
+        rev_offsets, sources, rev_weights = self._reverse_index()
+        a, b = (rev_offsets[i], rev_offsets[i + 1]) if i + 1 < len(rev_offsets) else (0, 0)
+        extra = self._rev_pending.get(i) if self._rev_pending else None
+        if extra:
+            return _merge_row(sources[a:b], rev_weights[a:b], extra)
+        return zip(sources[a:b], rev_weights[a:b])
+
+    def components(self):
+        """
+        UniaoBusca com as componentes do grafo. É montado a partir das arestas
+        na primeira chamada (se o grafo não foi criado com track_components)
+        e depois é mantido a cada add_edge.
+        """
+        if self._uf is None:
+            uf = UniaoBusca(len(self.names))
+            for i in range(len(self.names)):
+                for j in self.neighbor_ids(i):
+                    uf.union(i, j)
+            self._uf = uf
+        return self._uf
+
+    def component_id(self, i):
+        # id da componente (raiz do union-find) do vértice de id i
+        return self.components().find(i)
+
+    def n_components(self):
+        return self.components().n_sets
+
+    def component_sizes(self):
+        """Counter tamanho -> número de componentes com esse tamanho."""
+        return self.components().size_counts
 
     def get_numbers(self):
         # número de vértices e arestas do grafo
-        n_nodes = len(self.nodes)
+        n_nodes = len(self.names)
         if self.directed:
             n_edges = self.n_edges  # cada aresta contada uma vez
         else:
-            n_edges = self.n_edges // 2  # cada aresta contada duas vezes (a-b e b-a), então divide por 2
+            # cada aresta contada duas vezes (a-b e b-a), então divide por 2;
+            # laços (a-a) só têm uma entrada
+            n_edges = (self.n_edges + self._n_loops) // 2
         return n_nodes, n_edges
 
 
+    # ------------------------------------------------------------------
+    # snapshot binário
+    # ------------------------------------------------------------------
+
+    def save(self, path, source_hash=None):
+        """
+        Salva o grafo num snapshot binário versionado (ver SNAPSHOT_VERSION):
+        cabeçalho, offsets, targets, weights e a tabela de nomes.
+        source_hash identifica a origem (ex.: sha256 do csv).
+        """
+        if source_hash is None:
+            source_hash = self.source_hash
+        offsets, targets, weights = self.csr()
+        nomes = '\x00'.join(self.names).encode('utf-8')
+        flags = (_FLAG_DIRECTED if self.directed else 0) | (_FLAG_FLOAT if _tipo(weights) == 'd' else 0)
+        if sys.byteorder == 'big':
+            flags |= _FLAG_BIG_ENDIAN
+        cabecalho = _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, flags, len(self.names),
+                                 len(targets), self._n_loops, len(nomes), source_hash[:32])
+
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(cabecalho)
+            f.write(offsets)
+            f.write(targets)
+            f.write(b'\x00' * (-f.tell() % 8))  # alinha os pesos em 8 bytes
+            f.write(weights)
+            f.write(nomes)
+        os.replace(tmp, path)  # escrita atômica, um leitor nunca vê arquivo pela metade
+
+    @classmethod
+    def load(cls, path, use_mmap=True):
+        """
+        Carrega um snapshot salvo com save(). Com use_mmap os arrays são visões
+        do arquivo mapeado em memória (somente leitura), então vários processos
+        que abrirem o mesmo snapshot compartilham as mesmas páginas.
+        Levanta ValueError se o arquivo não for um snapshot compatível.
+        """
+        with open(path, 'rb') as f:
+            if use_mmap:
+                dados = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+            else:
+                dados = memoryview(f.read())
+
+        info = read_snapshot_header(dados)
+        if bool(info['flags'] & _FLAG_BIG_ENDIAN) != (sys.byteorder == 'big'):
+            raise ValueError(f"Snapshot '{path}' foi gerado com outra ordem de bytes")
+
+        n, m = info['n_nodes'], info['n_entries']
+        pos = _HEADER.size
+        offsets = dados[pos:pos + 8 * (n + 1)].cast('q')
+        pos += 8 * (n + 1)
+        targets = dados[pos:pos + 4 * m].cast('i')
+        pos += 4 * m
+        pos += -pos % 8
+        tipo = 'd' if info['flags'] & _FLAG_FLOAT else 'i'
+        tamanho = 8 if tipo == 'd' else 4
+        weights = dados[pos:pos + tamanho * m].cast(tipo)
+        pos += tamanho * m
+        nomes = bytes(dados[pos:pos + info['names_len']]).decode('utf-8')
+
+        grafo = cls(directed=bool(info['flags'] & _FLAG_DIRECTED))
+        grafo.names = nomes.split('\x00') if n else []
+        grafo._ids = dict(zip(grafo.names, range(n)))
+        if use_mmap:
+            grafo.offsets, grafo.targets, grafo.weights = offsets, targets, weights
+            grafo._snapshot = path
+        else:
+            grafo.offsets, grafo.targets, grafo.weights = array('q', offsets), array('i', targets), array(tipo, weights)
+        grafo.n_edges = m
+        grafo._n_loops = info['n_loops']
+        grafo._count_in_degrees()
+        grafo.source_hash = info['source_hash'].rstrip(b'\x00')
+        return grafo
+
+    def __getstate__(self):
+        # grafo mapeado de snapshot viaja só como caminho: o outro processo
+        # mapeia o mesmo arquivo em vez de receber uma cópia dos arrays
+        if self._snapshot is not None and self.frozen:
+            return {'_snapshot': self._snapshot}
+        estado = self.__dict__.copy()
+        del estado['adj_list'], estado['nodes']
+        estado['_rev'], estado['_rev_pending'] = None, {}  # remontado sob demanda
+        for nome in ('offsets', 'targets', 'weights'):
+            if isinstance(estado[nome], memoryview):
+                estado[nome] = array(_tipo(estado[nome]), estado[nome])
+        estado['_snapshot'] = None
+        return estado
+
+    def __setstate__(self, estado):
+        if set(estado) == {'_snapshot'}:
+            estado = Grafo.load(estado['_snapshot']).__dict__
+        self.__dict__.update(estado)
+        self.adj_list = _AdjView(self)
+        self.nodes = _NodeView(self)
+
+
+# formato do snapshot: cabeçalho fixo seguido dos arrays em ordem de bytes nativa
+SNAPSHOT_MAGIC = b'GRAFOCSR'
+SNAPSHOT_VERSION = 1
+_HEADER = struct.Struct('<8sIIqqqq32s')
+_FLAG_DIRECTED = 1
+_FLAG_FLOAT = 2
+_FLAG_BIG_ENDIAN = 4
+
+
+def read_snapshot_header(dados):
+    # lê e valida o cabeçalho de um snapshot (bytes ou memoryview)
+    if len(dados) < _HEADER.size:
+        raise ValueError("Arquivo pequeno demais para ser um snapshot de grafo")
+    magic, versao, flags, n, m, loops, names_len, origem = _HEADER.unpack_from(dados, 0)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError("Arquivo não é um snapshot de grafo")
+    if versao != SNAPSHOT_VERSION:
+        raise ValueError(f"Versão de snapshot {versao} não suportada (esperada {SNAPSHOT_VERSION})")
+    return {'flags': flags, 'n_nodes': n, 'n_entries': m, 'n_loops': loops,
+            'names_len': names_len, 'source_hash': origem}
+
+
+def _merge_row(targets, weights, extra):
+    # linha dos arrays somada às entradas pendentes, ordenada pelo vizinho
+    linha = dict(zip(targets, weights))
+    for j, w in extra.items():
+        linha[j] = linha.get(j, 0) + w
+    return sorted(linha.items())
+
+
+def _merge_rows(offsets, targets, weights, pending, n):
+    # novos arrays CSR com as linhas pendentes incorporadas
+    n_base = len(offsets) - 1
+    novos_offsets = array('q', [0])
+    novos_targets = array('i')
+    novos_weights = array(_tipo(weights))
+
+    for i in range(n):
+        a, b = (offsets[i], offsets[i + 1]) if i < n_base else (0, 0)
+        extra = pending.get(i)
+        if extra:
+            for j, w in _merge_row(targets[a:b], weights[a:b], extra):
+                novos_targets.append(j)
+                novos_weights.append(w)
+        elif b > a:
+            novos_targets.extend(targets[a:b])
+            novos_weights.extend(weights[a:b])
+        novos_offsets.append(len(novos_targets))
+
+    return novos_offsets, novos_targets, novos_weights
+
+
+def _tipo(seq):
+    # typecode de um array ou formato de uma memoryview ('i', 'd', 'q')
+    return getattr(seq, 'typecode', None) or seq.format
+
+
+class ConstrutorGrafo:
+    """
+    Construção em lote dos grafos a partir das listas de elenco/diretores.
+
+    Em vez de chamar add_edge para cada par, os pares (id, id) de cada lote
+    de títulos são gerados com itertools e contados num Counter (tudo em C),
+    e no build() o grafo ponderado é montado direto nos arrays CSR.
+    O custo fica linear no número de pares, e não no grau².
+    """
+
+    def __init__(self, directed=False, batch_size=10000, max_pairs=2_000_000, track_components=False):
+        self.graph = Grafo(directed=directed, track_components=track_components)
+        self.batch_size = batch_size
+        self.max_pairs = max_pairs  # acima disso o contador é descarregado no grafo
+        self.contagem = Counter()   # (id u, id v) -> peso acumulado
+        self._sem_uniao = False     # há pares contados sem union-find (unidos no build)
+
+    def add_casts(self, cast_list):
+        # pares ator <-> ator de cada elenco (ids ordenados, u <= v);
+        # elenco de uma pessoa só não gera par nem vértice
+        add_node = self.graph.add_node
+        uf = self.graph._uf
+        for lote in _lotes(cast_list, self.batch_size):
+            elencos = [sorted(map(add_node, cast)) for cast in lote if len(cast) > 1]
+            self.contagem.update(chain.from_iterable(map(combinations, elencos, repeat(2))))
+            if uf is not None:
+                # k-1 uniões por elenco já bastam, e as componentes ficam
+                # atualizadas antes mesmo do build()
+                for ids in elencos:
+                    uf.union_all(ids)
+            else:
+                self._sem_uniao = True
+            self._flush_if_full()
+        return self
+
+    def add_credits(self, cast_list, director_list):
+        # pares ator -> diretor de cada título
+        add_node = self.graph.add_node
+        uf = self.graph._uf
+        for lote in _lotes(zip(cast_list, director_list), self.batch_size):
+            creditos = [(list(map(add_node, cast)), list(map(add_node, directors)))
+                        for cast, directors in lote]
+            self.contagem.update(chain.from_iterable(product(a, d) for a, d in creditos))
+            if uf is not None:
+                for a, d in creditos:
+                    if a and d:
+                        uf.union_all(a + d)
+            else:
+                self._sem_uniao = True
+            self._flush_if_full()
+        return self
+
+    def _flush_if_full(self):
+        # limita a memória do contador em entradas muito grandes
+        if len(self.contagem) > self.max_pairs:
+            self.build()
+
+    def build(self):
+        # monta o grafo ponderado com todos os pares contados
+        with instrumentacao.etapa('grafos.construir') as etapa:
+            graph = self.graph
+            etapa.contar('pares', len(self.contagem))
+            # pares contados antes de existir o union-find (montado por uma
+            # consulta no meio da leitura) ainda precisam ser unidos
+            graph.add_pair_counts(self.contagem, union=self._sem_uniao)
+            self.contagem = Counter()
+            self._sem_uniao = False
+            graph.finalize()
+            etapa.contar('vertices', len(graph.names))
+            etapa.contar('arestas', graph.get_numbers()[1])
+        return graph
+
+
+class ProjecaoBipartida:
+    """
+    Grafo ator <-> ator implícito: guarda só a incidência título <-> ator
+    (o elenco de cada título e os títulos de cada ator, em arrays CSR) e
+    calcula os vizinhos e pesos de um ator quando alguém pede, como a linha
+    dele no produto Bᵀ·B. A memória fica proporcional à soma dos tamanhos
+    dos elencos, e não ao número de pares (elenco de k atores = k² / 2
+    pares), então catálogos com elencos enormes cabem em memória.
+
+    Tem a mesma interface de leitura do Grafo (names, node_id, neighbors,
+    neighbor_ids, degree, components, weight_range, fingerprint...), então
+    as buscas (BFS, Dijkstra, Prim) de algoritmos e analises rodam direto
+    nela, com os mesmos ids, linhas e pesos do undirected_graph. O preço é
+    recalcular cada linha a cada consulta; graus, número de arestas e faixa
+    de pesos saem de uma varredura completa feita no primeiro uso.
+    csr() e to_graph() materializam a projeção inteira (para Kruskal e quem
+    mais precisar de todas as arestas de uma vez).
+    """
+
+    directed = False
+
+    def __init__(self):
+        self.names = []          # id -> nome do ator
+        self._ids = {}           # nome do ator -> id
+        self.elenco_offsets = array('q', [0])  # título -> início do elenco em elencos
+        self.elencos = array('i')              # ids dos atores de cada título (ordenados)
+        self._titulos = None     # (offsets, títulos) de cada ator, montado sob demanda
+        self._graus = None       # id -> grau, da varredura completa (ver _varrer)
+        self._n_loops = 0
+        self._faixa_pesos = None
+        self._uf = None
+        self._derivados = {}
+        self.adj_list = _AdjView(self)  # Lista de adjacências (visão)
+        self.nodes = _NodeView(self)    # Conjunto de vértices (visão)
+
+    def add_node(self, v):
+        # id do ator, criando se for novo
+        i = self._ids.get(v)
+        if i is None:
+            i = self._ids[v] = len(self.names)
+            self.names.append(v)
+        return i
+
+    def node_id(self, v):
+        # id do vértice, ou None se ele não existir
+        return self._ids.get(v)
+
+    def add_casts(self, cast_list):
+        """
+        Acrescenta os elencos (listas de nomes). Como em ConstrutorGrafo.add_casts,
+        elenco de uma pessoa só não gera vértice. Retorna a própria projeção.
+        """
+        add_node = self.add_node
+        elencos = self.elencos
+        for cast in cast_list:
+            if len(cast) > 1:
+                elencos.extend(sorted(map(add_node, cast)))
+                self.elenco_offsets.append(len(elencos))
+        self._titulos = self._graus = self._faixa_pesos = self._uf = None
+        self._derivados = {}
+        return self
+
+    @property
+    def n_titles(self):
+        return len(self.elenco_offsets) - 1
+
+    def _indice(self):
+        # (offsets, títulos) de cada ator: a incidência transposta, por contagem
+        if self._titulos is None:
+            n = len(self.names)
+            por_ator = Counter(self.elencos)
+            offsets = array('q', accumulate((por_ator[i] for i in range(n)), initial=0))
+            pos = offsets[:-1]
+            titulos = array('i', bytes(4 * len(self.elencos)))
+            eo, elencos = self.elenco_offsets, self.elencos
+            for t in range(self.n_titles):
+                for k in range(eo[t], eo[t + 1]):
+                    a = elencos[k]
+                    titulos[pos[a]] = t
+                    pos[a] += 1
+            self._titulos = (offsets, titulos)
+        return self._titulos
+
+    def titles(self, i):
+        """Ids dos títulos do ator de id i (repetidos se ele aparece repetido no elenco)."""
+        offsets, titulos = self._indice()
+        return titulos[offsets[i]:offsets[i + 1]]
+
+    def cast(self, t):
+        """Ids dos atores do título t."""
+        return self.elencos[self.elenco_offsets[t]:self.elenco_offsets[t + 1]]
+
+    def _linha(self, i):
+        # Counter vizinho -> peso do ator i (linha i de Bᵀ·B), sem ordenar
+        offsets, titulos = self._indice()
+        eo, elencos = self.elenco_offsets, self.elencos
+        linha = Counter()
+        for t in titulos[offsets[i]:offsets[i + 1]]:
+            linha.update(elencos[eo[t]:eo[t + 1]])
+        # o próprio ator soma m² por título (m = vezes no elenco); o laço do
+        # grafo materializado tem m(m - 1) / 2, e só existe com m > 1
+        laco = (linha.pop(i, 0) - (offsets[i + 1] - offsets[i])) // 2
+        if laco:
+            linha[i] = laco
+        return linha
+
+    def neighbors(self, i):
+        """(id vizinho, peso) do ator de id i, ordenados pelo vizinho como no Grafo."""
+        return sorted(self._linha(i).items())
+
+    def neighbor_ids(self, i):
+        """Ids dos vizinhos do ator de id i, em ordem."""
+        return sorted(self._linha(i))
+
+    def predecessors(self, i):
+        return self.neighbors(i)
+
+    def _varrer(self):
+        # uma passada por todas as linhas: graus, laços e faixa de pesos
+        if self._graus is None:
+            graus = array('i')
+            lacos = 0
+            menor = maior = None
+            for i in range(len(self.names)):
+                linha = self._linha(i)
+                graus.append(len(linha))
+                if linha:
+                    lacos += i in linha
+                    pesos = linha.values()
+                    a, b = min(pesos), max(pesos)
+                    menor = a if menor is None or a < menor else menor
+                    maior = b if maior is None or b > maior else maior
+            self._n_loops = lacos
+            self._faixa_pesos = None if menor is None else (menor, maior)
+            self._graus = graus
+        return self._graus
+
+    def degree(self, i):
+        # grau do ator de id i (vizinhos distintos); sem a varredura, só a linha dele
+        if self._graus is None:
+            return len(self._linha(i))
+        return self._graus[i]
+
+    def degrees(self):
+        """Array id -> grau (a primeira chamada varre a projeção inteira)."""
+        return self._varrer()
+
+    in_degree = degree
+    in_degrees = degrees
+
+    def weight_range(self):
+        """(menor, maior) peso das arestas, ou None se não há arestas."""
+        self._varrer()
+        return self._faixa_pesos
+
+    def get_numbers(self):
+        # número de vértices e arestas (laços contados uma vez, como no Grafo)
+        return len(self.names), (sum(self._varrer()) + self._n_loops) // 2
+
+    def components(self):
+        """
+        UniaoBusca com as componentes, montado direto dos elencos (k - 1
+        uniões por título, sem passar pelos pares).
+        """
+        if self._uf is None:
+            uf = UniaoBusca(len(self.names))
+            for t in range(self.n_titles):
+                uf.union_all(self.cast(t))
+            self._uf = uf
+        return self._uf
+
+    def component_id(self, i):
+        return self.components().find(i)
+
+    def n_components(self):
+        return self.components().n_sets
+
+    def component_sizes(self):
+        """Counter tamanho -> número de componentes com esse tamanho."""
+        return self.components().size_counts
+
+    def fingerprint(self):
+        """sha256 (hex) da incidência e dos nomes, para o cache de resultados."""
+        digital = self._derivados.get('fingerprint')
+        if digital is None:
+            h = hashlib.sha256(b'B')
+            h.update(self.elenco_offsets)
+            h.update(self.elencos)
+            h.update('\x00'.join(self.names).encode('utf-8'))
+            digital = self._derivados['fingerprint'] = h.hexdigest()
+        return digital
+
+    def to_graph(self):
+        """
+        Grafo materializado, igual (ids, arrays e fingerprint) ao de
+        undirected_graph com os mesmos elencos, montado linha a linha
+        sem o Counter de todos os pares.
+        """
+        grafo = Grafo()
+        grafo.names = list(self.names)
+        grafo._ids = dict(self._ids)
+        offsets, targets, weights = grafo.offsets, grafo.targets, grafo.weights
+        for i in range(len(self.names)):
+            linha = self._linha(i)
+            vizinhos = sorted(linha)
+            targets.extend(vizinhos)
+            weights.extend(map(linha.__getitem__, vizinhos))
+            offsets.append(len(targets))
+            grafo._n_loops += i in linha
+        grafo.n_edges = len(targets)
+        grafo._count_in_degrees()
+        return grafo
+
+    def csr(self):
+        """Arrays CSR da projeção materializada (O(pares) de memória; fica guardado)."""
+        grafo = self._derivados.get('grafo')
+        if grafo is None:
+            grafo = self._derivados['grafo'] = self.to_graph()
+        return grafo.csr()
+
+
+def _lotes(iterable, tamanho):
+    # divide um iterável em listas de até 'tamanho' itens
+    it = iter(iterable)
+    while True:
+        lote = list(islice(it, tamanho))
+        if not lote:
+            return
+        yield lote
+
 
 def directed_graph(cast_list, director_list):
     """
     grafo direcionado atores -> diretores
     peso = quantas vezes o ator trabalhou com o diretor
     """
-    graph = Grafo(directed=True)
-
-    for cast, director_list in zip(cast_list, director_list):
-        for actor in cast:
-            for director in director_list:
-                graph.add_edge(actor, director, 1)
-
-    return graph
+    return ConstrutorGrafo(directed=True).add_credits(cast_list, director_list).build()
 
 def undirected_graph(cast_list):
     """
     grafo não direcionado atores <-> atores
     peso = quantas vezes os atores atuaram juntos
     """
-    graph = Grafo(directed=False)
+    return ConstrutorGrafo(directed=False).add_casts(cast_list).build()
 
-    for cast in cast_list:
-        for i in range(len(cast)):
-            for j in range(i + 1, len(cast)):
-                graph.add_edge(cast[i], cast[j], 1)
 
-    return graph
+def bipartite_projection(cast_list):
+    """
+    grafo não direcionado atores <-> atores implícito (ProjecaoBipartida):
+    mesmos vértices e pesos de undirected_graph, sem materializar os pares
+    """
+    return ProjecaoBipartida().add_casts(cast_list)
 
 
 def to_upper(name):
@@ -84,38 +988,127 @@ def to_upper(name):
     return name.strip().upper()
 
 
+def _parse_row(row):
+    # normaliza uma linha do csv em (elenco, diretores); None se faltar algum
+    # processa diretores
+    directors = [to_upper(d) for d in row['director'].split(',') if d.strip()]
+
+    # processa elenco
+    cast = [to_upper(a) for a in row['cast'].split(',') if a.strip()]
+
+    # ignora entradas com diretor ou elenco vazios
+    if directors and cast:
+        return cast, directors
+    return None
+
+
+def iter_csv(file_csv, chunk_size=5000):
+    """
+    Lê o csv de forma incremental e gera blocos de até chunk_size registros
+    (elenco, diretores) já normalizados. Só um bloco fica em memória por vez.
+    """
+    with open(file_csv, 'r', encoding='utf-8', newline='') as file:
+        registros = filter(None, map(_parse_row, csv.DictReader(file)))
+        yield from _lotes(registros, chunk_size)
+
+
 def read_csv(file_csv):
     # lê os dados do csv e retorna listas de elenco e diretores
     cast_list = []
     director_list = []
-    
-    with open(file_csv, 'r', encoding='utf-8') as file:
-        reader = csv.DictReader(file)
-        for row in reader:
-            # processa diretores
-            directors = [to_upper(d) for d in row['director'].split(',') if d.strip()]
-            
-            # processa elenco
-            cast = [to_upper(a) for a in row['cast'].split(',') if a.strip()]
-            
-            # ignora entradas com diretor ou elenco vazios
-            if directors and cast:
-                director_list.append(directors)
-                cast_list.append(cast)
-    
+
+    for bloco in iter_csv(file_csv):
+        for cast, directors in bloco:
+            director_list.append(directors)
+            cast_list.append(cast)
+
     return cast_list, director_list
 
 
+@instrumentacao.medido()
+def graphs_from_csv(file_csv, chunk_size=5000, track_components=False):
+    """
+    Constrói os dois grafos lendo o csv em blocos, sem montar as listas
+    completas de elenco/diretores. Retorna (grafo_direcionado, grafo_nao_direcionado).
+    Com track_components as componentes são mantidas durante a leitura.
+    """
+    direcionado = ConstrutorGrafo(directed=True, track_components=track_components)
+    nao_direcionado = ConstrutorGrafo(directed=False, track_components=track_components)
+
+    for bloco in iter_csv(file_csv, chunk_size):
+        casts = [cast for cast, _ in bloco]
+        directors = [d for _, d in bloco]
+        direcionado.add_credits(casts, directors)
+        nao_direcionado.add_casts(casts)
+        instrumentacao.contar('titulos', len(bloco))
+
+    return direcionado.build(), nao_direcionado.build()
+
+
+@instrumentacao.medido()
+def projection_from_csv(file_csv, chunk_size=5000):
+    """
+    Lê o csv em blocos e monta só a projeção implícita ator <-> ator
+    (ProjecaoBipartida), no lugar do grafo não direcionado de graphs_from_csv.
+    """
+    projecao = ProjecaoBipartida()
+    for bloco in iter_csv(file_csv, chunk_size):
+        projecao.add_casts(cast for cast, _ in bloco)
+        instrumentacao.contar('titulos', len(bloco))
+    instrumentacao.contar('incidencias', len(projecao.elencos))
+    return projecao
+
+
+def update_graphs_from_csv(file_csv, grafo_direcionado, grafo_nao_direcionado, chunk_size=5000):
+    """
+    Acrescenta aos dois grafos os títulos de um csv de delta (só as linhas
+    novas do catálogo, mesmas colunas do original). Retorna os relatórios de
+    Grafo.add_titles: (direcionado, não direcionado).
+    """
+    titulos = [titulo for bloco in iter_csv(file_csv, chunk_size) for titulo in bloco]
+    return grafo_direcionado.add_titles(titulos), grafo_nao_direcionado.add_titles(titulos)
+
+
+def file_hash(file_csv):
+    # sha256 do conteúdo do arquivo, lido em blocos
+    h = hashlib.sha256()
+    with open(file_csv, 'rb') as file:
+        for bloco in iter(lambda: file.read(1 << 20), b''):
+            h.update(bloco)
+    return h.digest()
+
+
+@instrumentacao.medido()
+def load_graphs(file_csv, cache_dir='cache', chunk_size=5000):
+    """
+    Igual a graphs_from_csv, mas guarda os grafos em snapshots binários em
+    cache_dir, identificados pelo hash do csv. Se o csv não mudou desde a
+    última execução, os grafos são apenas mapeados em memória (sem reconstruir).
+    """
+    digest = file_hash(file_csv)
+    base = os.path.join(cache_dir, f"grafos_{digest.hex()[:16]}")
+    caminhos = (base + "_direcionado.bin", base + "_nao_direcionado.bin")
+
+    try:
+        grafos = tuple(Grafo.load(c) for c in caminhos)
+        if all(g.source_hash == digest for g in grafos):
+            instrumentacao.contar('snapshots_reaproveitados', len(grafos))
+            return grafos
+    except (OSError, ValueError):
+        pass  # snapshot ausente, antigo ou de outra versão: reconstrói
+
+    os.makedirs(cache_dir, exist_ok=True)
+    grafos = graphs_from_csv(file_csv, chunk_size)
+    for grafo, caminho in zip(grafos, caminhos):
+        grafo.save(caminho, digest)
+    return tuple(Grafo.load(c) for c in caminhos)
+
+
 if __name__ == "__main__":
-    # lê os dados do csv
-    cast_list, director_list = read_csv('netflix_amazon_disney_titles.csv')
-    
-    # constrói o grafo direcionado (ator -> diretor)
-    grafo_direcionado = directed_graph(cast_list, director_list)
+    # lê o csv em blocos e constrói o grafo direcionado (ator -> diretor)
+    # e o não direcionado (ator <-> ator)
+    grafo_direcionado, grafo_atores = graphs_from_csv('netflix_amazon_disney_titles.csv')
     nodes_d, edges_d = grafo_direcionado.get_numbers()
-    
-    # constrói o grafo não direcionado (ator <-> ator)
-    grafo_atores = undirected_graph(cast_list)
     nodes_u, edges_u = grafo_atores.get_numbers()
     
     # exibe os resultados
@@ -0,0 +1,237 @@
+"""
+Medição por etapa: tempo de parede, tempo de CPU, pico de memória e
+contadores (vértices, arestas, fontes...) de cada etapa da execução.
+
+    with instrumentacao.etapa('carregar_grafos') as e:
+        ...
+        e.contar('vertices', n)
+
+    @instrumentacao.medido()
+    def comp_conexas(grafo): ...
+        instrumentacao.contar('arestas', m)   # soma na etapa mais interna
+
+As etapas podem ser aninhadas. Cada uma vira um evento na linha do tempo do
+processo, exportada em JSON com exportar_json ao final da execução. O pico de
+RSS vem de resource (Unix); o de tracemalloc só é medido se ligado com
+configurar(tracemalloc=True), porque deixa o código bem mais lento.
+"""
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+try:
+    import resource
+except ImportError:  # Windows: sem pico de RSS
+    resource = None
+
+MAX_EVENTOS = 100000 # os mais antigos são descartados (processos de longa duração)
+
+_config = {'ativo': True, 'tracemalloc': False, 'log_ate': -1}
+_eventos = deque(maxlen=MAX_EVENTOS)  # etapas já terminadas, na ordem em que terminaram
+_local = threading.local()   # pilha de etapas abertas de cada thread
+
+
+def configurar(ativo=None, tracemalloc=None, log_ate=None):
+    """
+    ativo: liga/desliga a medição (desligada, etapa() e contar() não fazem nada)
+    tracemalloc: mede também o pico de memória alocada pelo Python
+    log_ate: imprime uma linha ao fim de cada etapa com profundidade <= log_ate
+    (0 = só as de fora; -1 = nenhuma, o padrão)
+    """
+    if ativo is not None:
+        _config['ativo'] = ativo
+    if tracemalloc is not None:
+        _config['tracemalloc'] = tracemalloc
+    if log_ate is not None:
+        _config['log_ate'] = log_ate
+
+
+def configuracao():
+    """Cópia da configuração atual (para repassar a outros processos)."""
+    return dict(_config)
+
+
+class Etapa:
+    """Uma etapa em andamento; os números são preenchidos ao sair do bloco."""
+
+    def __init__(self, nome, contadores):
+        self.nome = nome
+        self.contadores = dict(contadores)
+        self.profundidade = 0
+        self.pai = None
+        self.pico_tracemalloc = None
+
+    def contar(self, chave, n=1):
+        # soma n no contador chave desta etapa
+        self.contadores[chave] = self.contadores.get(chave, 0) + n
+
+    def __enter__(self):
+        pilha = _pilha()
+        if pilha:
+            self.pai = pilha[-1].nome
+            self.profundidade = pilha[-1].profundidade + 1
+        if _config['tracemalloc']:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            # o pico até aqui pertence à etapa de fora; zera para medir esta
+            if pilha:
+                pilha[-1]._ver_pico()
+            tracemalloc.reset_peak()
+            self.pico_tracemalloc = 0
+        pilha.append(self)
+        self._inicio = time.time()
+        self._parede = time.perf_counter()
+        self._cpu = time.process_time()
+        return self
+
+    def __exit__(self, *erro):
+        parede = time.perf_counter() - self._parede
+        cpu = time.process_time() - self._cpu
+        pilha = _pilha()
+        pilha.pop()
+        if self.pico_tracemalloc is not None:
+            self._ver_pico()
+            if pilha and pilha[-1].pico_tracemalloc is not None:
+                pilha[-1].pico_tracemalloc = max(pilha[-1].pico_tracemalloc, self.pico_tracemalloc)
+                tracemalloc.reset_peak()
+
+        evento = {
+            'nome': self.nome,
+            'pid': os.getpid(),
+            'pai': self.pai,
+            'profundidade': self.profundidade,
+            'inicio': self._inicio,
+            'parede_s': parede,
+            'cpu_s': cpu,
+            'rss_pico_bytes': pico_rss(),
+            'tracemalloc_pico_bytes': self.pico_tracemalloc,
+            'contadores': self.contadores,
+        }
+        if erro[0] is not None:
+            evento['erro'] = erro[0].__name__
+        _eventos.append(evento)
+        if self.profundidade <= _config['log_ate']:
+            print(resumo(evento))
+        return False
+
+    def _ver_pico(self):
+        self.pico_tracemalloc = max(self.pico_tracemalloc or 0, tracemalloc.get_traced_memory()[1])
+
+
+class _Desligada:
+    # etapa que não mede nada (instrumentação desligada)
+    def contar(self, chave, n=1):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *erro):
+        return False
+
+
+def _pilha():
+    pilha = getattr(_local, 'pilha', None)
+    if pilha is None:
+        pilha = _local.pilha = []
+    return pilha
+
+
+def etapa(nome, **contadores):
+    """Context manager que mede o bloco como uma etapa chamada nome."""
+    if not _config['ativo']:
+        return _Desligada()
+    return Etapa(nome, contadores)
+
+
+def medido(nome=None):
+    """Decorador: cada chamada da função vira uma etapa (nome padrão: modulo.funcao)."""
+    def decorador(funcao):
+        rotulo = nome or f"{funcao.__module__}.{funcao.__qualname__}"
+
+        @functools.wraps(funcao)
+        def envolvida(*args, **kwargs):
+            with etapa(rotulo):
+                return funcao(*args, **kwargs)
+        return envolvida
+    return decorador
+
+
+def contar(chave, n=1):
+    """Soma n no contador chave da etapa aberta mais interna (se houver)."""
+    pilha = getattr(_local, 'pilha', None)
+    if pilha:
+        pilha[-1].contar(chave, n)
+
+
+def pico_rss():
+    # maior memória residente do processo até agora, em bytes (None sem resource)
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico if sys.platform == 'darwin' else pico * 1024  # Linux informa em KB
+
+
+def eventos():
+    """Cópia dos eventos registrados neste processo."""
+    return list(_eventos)
+
+
+def registrar(novos):
+    """Junta eventos vindos de outro processo (ex.: tarefas do pool)."""
+    _eventos.extend(novos)
+
+
+def limpar():
+    """Esquece os eventos registrados até agora."""
+    _eventos.clear()
+
+
+def resumo(evento):
+    """Uma linha legível com os números de um evento."""
+    texto = f"{evento['nome']}: {evento['parede_s']:.2f} s (cpu {evento['cpu_s']:.2f} s)"
+    if evento['rss_pico_bytes'] is not None:
+        texto += f", pico RSS {evento['rss_pico_bytes'] / (1 << 20):.0f} MB"
+    if evento['tracemalloc_pico_bytes'] is not None:
+        texto += f", pico alocado {evento['tracemalloc_pico_bytes'] / (1 << 20):.1f} MB"
+    if evento['contadores']:
+        texto += ", " + ", ".join(f"{k}={v}" for k, v in evento['contadores'].items())
+    return texto
+
+
+def linha_do_tempo():
+    """
+    Eventos em ordem de início, com inicio_s relativo ao primeiro evento
+    (vale entre processos, porque usa o relógio do sistema).
+    """
+    ordenados = sorted(_eventos, key=lambda e: e['inicio'])
+    if not ordenados:
+        return []
+    zero = ordenados[0]['inicio']
+    linha = []
+    for evento in ordenados:
+        evento = dict(evento)
+        evento['inicio_s'] = evento.pop('inicio') - zero
+        linha.append(evento)
+    return linha
+
+
+def exportar_json(caminho):
+    """Grava a linha do tempo em caminho (JSON) e retorna o caminho."""
+    pasta = os.path.dirname(caminho)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+    linha = linha_do_tempo()
+    dados = {
+        'inicio': min((e['inicio'] for e in _eventos), default=None),
+        'total_s': max((e['inicio_s'] + e['parede_s'] for e in linha), default=0.0),
+        'eventos': linha,
+    }
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        json.dump(dados, arquivo, ensure_ascii=False, indent=1)
+    return caminho
@@ -0,0 +1,419 @@
+"""
+Executa as seções de main.py (resultados_completos.txt) e de relatorio.py
+(relatorio_completo.txt) como tarefas com dependências declaradas.
+
+Os grafos são construídos (ou mapeados do cache) uma vez só, as tarefas cujas
+dependências já terminaram rodam em paralelo num pool de processos, e dá pra
+escolher quais seções rodar. O tempo total fica limitado pelo caminho
+crítico (a tarefa mais lenta), não pela soma das seções.
+
+    python pipeline.py                          # os dois arquivos
+    python pipeline.py --secoes cfc,mst         # só essas seções (e dependências)
+    python pipeline.py --relatorio relatorio_completo.txt --workers 4
+    python pipeline.py --listar
+
+Cada seção escreve direto em disco (escrita.py): o texto em
+resultados/secoes/<seção>.txt e os mesmos números em JSON Lines em
+resultados/dados/<seção>.jsonl. Os relatórios são montados copiando os
+textos das seções, sem juntar tudo numa string.
+
+Cada seção é medida como uma etapa de instrumentacao.py (tempo, CPU, pico de
+memória e contadores); ao final a linha do tempo vai para
+resultados/linha_do_tempo.json.
+"""
+import algoritmos
+import analises
+import argparse
+import concurrent.futures
+import escrita
+import grafos
+import instrumentacao
+import multiprocessing
+import os
+
+ARQUIVO_CSV = 'netflix_amazon_disney_titles.csv'
+TEST_NODE = "BOB ODENKIRK"
+PASTA = 'resultados'
+LINHA_DO_TEMPO = os.path.join(PASTA, 'linha_do_tempo.json')
+
+# ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚
+
+# TAREFAS
+# cada tarefa recebe o contexto (grafos e opções), os resultados das suas
+# dependências e a saída da sua seção (escrita.Saida), onde escreve o texto
+# e os registros à medida que calcula
+
+def _info_resultados(ctx, entradas, saida):
+    nodes_d, edges_d = ctx['direcionado'].get_numbers()
+    nodes_u, edges_u = ctx['nao_direcionado'].get_numbers()
+    saida.escrever("⋆⁺₊⋆ ━━━━⊱❀ TDE 5 - REDES COMPLEXAS ❀⊰━━━━ ⋆⁺₊⋆\n")
+    saida.escrever("ˋ°•*⁀➷ Alex Menegatti Secco, Mariana de Castro e Tarso Bertolini Rodrigues ✶࿐\n\n")
+    saida.escrever("╰┈┈➤ Criação dos Grafos\n")
+    _escrever_tamanhos(saida, nodes_d, edges_d, nodes_u, edges_u)
+
+def _escrever_tamanhos(saida, nodes_d, edges_d, nodes_u, edges_u):
+    saida.escrever(f"Grafo Direcionado (Ator->Diretor): {nodes_d} vértices, {edges_d} arestas\n")
+    saida.escrever(f"Grafo Não Direcionado (Ator<->Ator): {nodes_u} vértices, {edges_u} arestas\n\n")
+    saida.registro('grafo', nome='direcionado', vertices=nodes_d, arestas=edges_d)
+    saida.registro('grafo', nome='nao_direcionado', vertices=nodes_u, arestas=edges_u)
+
+def _rotulos_componentes(ctx, entradas, saida):
+    # rotulagens compartilhadas (conexas, fracamente e fortemente conexas):
+    # calculadas uma vez e repassadas como arrays às tarefas que dependem desta
+    rotulos = analises.rotular_componentes(ctx['nao_direcionado'], ctx['direcionado'])
+    for tipo, (_, tamanhos) in rotulos.items():
+        saida.registro('rotulos', conexao=tipo, componentes=len(tamanhos))
+    return rotulos
+
+def _cfc(ctx, entradas, saida):
+    # Componentes fortemente conexas (direcionado)
+    saida.escrever("╰┈┈➤ Componentes Fortemente conexas (direcionado)\n")
+    _listar_componentes(saida, "Componente Fortemente Conexa", "componentes fortemente conexas",
+                        algoritmos.agrupar_componentes(ctx['direcionado'],
+                                                       entradas['rotulos_componentes']['fortemente_conexas']))
+
+def _cc(ctx, entradas, saida):
+    # Componentes conexas (não direcionado)
+    saida.escrever("╰┈┈➤ Componentes Conexas (não direcionado)\n")
+    _listar_componentes(saida, "Componente Conexa", "componentes conexas",
+                        algoritmos.agrupar_componentes(ctx['nao_direcionado'],
+                                                       entradas['rotulos_componentes']['conexas']))
+
+def _listar_componentes(saida, rotulo, plural, componentes):
+    # uma componente por vez: o texto vai direto para o arquivo da seção
+    saida.escrever(f"Número de {plural}: {len(componentes)}\n\n")
+    saida.registro('resumo', componentes=len(componentes))
+    for i, componente in enumerate(componentes, 1):
+        saida.escrever(f"{rotulo} {i} ({len(componente)} nós):\n")
+        saida.escrever(f"  {', '.join(componente)}\n\n")
+        saida.registro('componente', indice=i, tamanho=len(componente), vertices=componente)
+
+def _mst(ctx, entradas, saida):
+    saida.escrever("╰┈┈➤ Árvore Geradora Mínima\n")
+    mst_edges, total_cost = algoritmos.mst_prim(ctx['nao_direcionado'], ctx['test_node'])
+    algoritmos.escrever_mst(saida, ctx['test_node'], mst_edges, total_cost)
+
+def _grau(ctx, entradas, saida):
+    saida.escrever("╰┈┈➤ Centralidade de Grau\n")
+    saida.escrever("✿ GRAFO NÃO DIRECIONADO ✿\n")
+    algoritmos.escrever_centralidade_grau(saida, ctx['nao_direcionado'], ctx['test_node'])
+    saida.escrever("━⊱⋆⊰"*10 + "\n")
+    saida.escrever("✿ GRAFO DIRECIONADO ✿\n")
+    algoritmos.escrever_centralidade_grau(saida, ctx['direcionado'], ctx['test_node'])
+
+def _intermediacao(ctx, entradas, saida):
+    saida.escrever("╰┈┈➤ Centralidade de Intermediação\n")
+    algoritmos.escrever_centralidade_intermediacao(
+        saida, ctx['nao_direcionado'], ctx['test_node'], workers=ctx['workers_internos'])
+
+def _proximidade(ctx, entradas, saida):
+    saida.escrever("╰┈┈➤ Centralidade de Proximidade\n")
+    algoritmos.escrever_centralidade_proximidade(saida, ctx['nao_direcionado'], ctx['test_node'])
+
+def _info_relatorio(ctx, entradas, saida):
+    nodes_d, edges_d = ctx['direcionado'].get_numbers()
+    nodes_u, edges_u = ctx['nao_direcionado'].get_numbers()
+    saida.escrever("ִ ࣪𖤐 RELATÓRIO COMPLETO - ANÁLISE DE REDES COMPLEXAS ִ ࣪𖤐\n\n")
+    saida.escrever("INFORMAÇÕES BÁSICAS DOS GRAFOS\n")
+    saida.escrever("=" * 50 + "\n")
+    _escrever_tamanhos(saida, nodes_d, edges_d, nodes_u, edges_u)
+
+def _distribuicao_graus(ctx, entradas, saida):
+    saida.escrever("1) DISTRIBUIÇÃO DE GRAUS\n")
+    saida.escrever("-" * 40 + "\n\n")
+    analises.escrever_distribuicao_graus(saida, ctx['direcionado'], "GRAFO DIRECIONADO (ATOR->DIRETOR)")
+    analises.escrever_distribuicao_graus(saida, ctx['nao_direcionado'], "GRAFO NÃO DIRECIONADO (ATOR<->ATOR)")
+
+def _distribuicao_componentes(ctx, entradas, saida):
+    saida.escrever("2) DISTRIBUIÇÃO DE COMPONENTES\n")
+    saida.escrever("-" * 40 + "\n\n")
+    analises.escrever_distribuicao_componentes(saida, ctx['nao_direcionado'], ctx['direcionado'],
+                                               entradas['rotulos_componentes'])
+
+def _ranking(titulo, funcao, chave_grafo, **parametros):
+    # tarefa de top 10: título da seção + linhas do ranking
+    def tarefa(ctx, entradas, saida):
+        saida.escrever(titulo + "\n")
+        saida.escrever("-" * 60 + "\n")
+        funcao(saida, ctx[chave_grafo], 10, **parametros)
+    return tarefa
+
+def _explicacoes(ctx, entradas, saida):
+    # Explicação das métricas de centralidade
+    saida.escrever("EXPLICAÇÃO DAS MÉTRICAS DE CENTRALIDADE\n")
+    saida.escrever("-" * 40 + "\n\n")
+
+    saida.escrever("CENTRALIDADE DE GRAU:\n")
+    saida.escrever("- Mede quantas conexões diretas um nó tem.\n")
+    saida.escrever("- Para diretores: quantos atores trabalharam com ele.\n")
+    saida.escrever("- Para atores: quantos outros atores trabalharam com ele.\n\n")
+
+    saida.escrever("CENTRALIDADE DE INTERMEDIAÇÃO:\n")
+    saida.escrever("- Mede o quão importante um nó é como 'ponte' entre outros nós.\n")
+    saida.escrever("- Nós com alta centralidade controlam o fluxo de informação/influência.\n")
+    saida.escrever("- Para diretores: conectam diferentes grupos de atores.\n")
+    saida.escrever("- Para atores: conectam diferentes comunidades de atores.\n\n")
+
+    saida.escrever("CENTRALIDADE DE PROXIMIDADE:\n")
+    saida.escrever("- Mede quão próximo um nó está de todos os outros nós.\n")
+    saida.escrever("- Nós com alta centralidade podem influenciar rapidamente toda a rede.\n")
+    saida.escrever("- Para diretores: podem alcançar muitos atores rapidamente.\n")
+    saida.escrever("- Para atores: podem influenciar toda a comunidade rapidamente.\n\n")
+
+    # Explicação das características de rede complexa
+    saida.escrever("CARACTERÍSTICAS DE REDE COMPLEXA\n")
+    saida.escrever("-" * 40 + "\n\n")
+
+    saida.escrever("✓ Distribuição de Graus:\n")
+    saida.escrever("  - Análise da heterogeneidade dos graus\n")
+    saida.escrever("  - Identificação de hubs (nós com grau muito alto)\n")
+    saida.escrever("  - Verificação de características scale-free\n\n")
+
+    saida.escrever("✓ Componentes:\n")
+    saida.escrever("  - Presença de componente gigante\n")
+    saida.escrever("  - Fragmentação da rede\n")
+    saida.escrever("  - Isolamento de nós\n\n")
+
+    saida.escrever("✓ Interpretação:\n")
+    saida.escrever("  - Redes scale-free têm alta heterogeneidade (CV > 1.0)\n")
+    saida.escrever("  - Componente gigante indica alta conectividade\n")
+    saida.escrever("  - Hubs são nós com grau muito superior à média\n\n")
+
+    saida.escrever("✓ Contexto da Indústria do Entretenimento:\n")
+    saida.escrever("  - Hubs representam atores/diretores muito ativos\n")
+    saida.escrever("  - Componente gigante mostra a conectividade da indústria\n")
+    saida.escrever("  - Centralidade indica influência e acesso a oportunidades\n")
+
+# nome -> (dependências, função); o que uma tarefa retorna chega às que
+# dependem dela em entradas[nome]
+TAREFAS = {
+    'rotulos_componentes': ((), _rotulos_componentes),
+
+    'info_resultados': ((), _info_resultados),
+    'cfc': (('rotulos_componentes',), _cfc),
+    'cc': (('rotulos_componentes',), _cc),
+    'mst': ((), _mst),
+    'grau': ((), _grau),
+    'intermediacao': ((), _intermediacao),
+    'proximidade': ((), _proximidade),
+
+    'info_relatorio': ((), _info_relatorio),
+    'distribuicao_graus': ((), _distribuicao_graus),
+    'distribuicao_componentes': (('rotulos_componentes',), _distribuicao_componentes),
+    'top_grau_diretores': ((), _ranking(
+        "3) TOP 10 DIRETORES MAIS INFLUENTES (Centralidade de Grau)",
+        analises.escrever_top_grau_diretores, 'direcionado')),
+    'top_intermediacao_diretores': ((), _ranking(
+        "4) TOP 10 DIRETORES MAIS INFLUENTES (Centralidade de Intermediação)",
+        analises.escrever_top_intermediacao, 'direcionado', epsilon=0.01, delta=0.1)),
+    'top_proximidade_diretores': ((), _ranking(
+        "5) TOP 10 DIRETORES MAIS INFLUENTES (Centralidade de Proximidade)",
+        analises.escrever_top_proximidade, 'direcionado')),
+    'top_grau_atores': ((), _ranking(
+        "6) TOP 10 ATORES/ATRIZES MAIS INFLUENTES (Centralidade de Grau)",
+        analises.escrever_top_grau_atores, 'nao_direcionado')),
+    'top_intermediacao_atores': ((), _ranking(
+        "7) TOP 10 ATORES/ATRIZES MAIS INFLUENTES (Centralidade de Intermediação)",
+        analises.escrever_top_intermediacao, 'nao_direcionado', epsilon=0.01, delta=0.1)),
+    'top_proximidade_atores': ((), _ranking(
+        "8) TOP 10 ATORES/ATRIZES MAIS INFLUENTES (Centralidade de Proximidade)",
+        analises.escrever_top_proximidade, 'nao_direcionado')),
+    'explicacoes': ((), _explicacoes),
+}
+
+# arquivo -> (tarefa de cabeçalho, partes); cada parte é (título, tarefas) e
+# o título só entra se alguma tarefa da parte foi escolhida
+RELATORIOS = {
+    'resultados_completos.txt': ('info_resultados', [
+        ("", ['cfc', 'cc', 'mst', 'grau', 'intermediacao', 'proximidade']),
+    ]),
+    'relatorio_completo.txt': ('info_relatorio', [
+        ("PARTE 1: ANÁLISE ESTRUTURAL DOS GRAFOS\n" + "=" * 60 + "\n\n",
+         ['distribuicao_graus', 'distribuicao_componentes']),
+        ("PARTE 2: ANÁLISE DE CENTRALIDADE\n" + "=" * 60 + "\n\n",
+         ['top_grau_diretores', 'top_intermediacao_diretores', 'top_proximidade_diretores',
+          'top_grau_atores', 'top_intermediacao_atores', 'top_proximidade_atores']),
+        ("PARTE 3: EXPLICAÇÕES E INTERPRETAÇÕES\n" + "=" * 60 + "\n\n",
+         ['explicacoes']),
+    ]),
+}
+
+# ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚ ଘ(੭ˊᵕˋ)੭* ੈ✩‧₊˚
+
+# EXECUÇÃO
+
+def executar(secoes=None, relatorios=None, workers=None, arquivo_csv=ARQUIVO_CSV, test_node=TEST_NODE,
+             linha_do_tempo=LINHA_DO_TEMPO):
+    """
+    Roda as seções escolhidas e grava os relatórios que elas compõem.
+
+    secoes: nomes de TAREFAS (None = todas as dos relatórios escolhidos);
+    as dependências entram automaticamente.
+    relatorios: arquivos de RELATORIOS a gerar (None = todos); cada arquivo
+    é regravado só com as seções que rodaram.
+    workers: processos do pool (None = todos os núcleos, 1 = sem pool).
+    linha_do_tempo: onde gravar as etapas medidas (JSON; None = não grava).
+    Retorna dict tarefa -> resultado (o que a tarefa retornou; o texto e os
+    registros de cada seção ficam nos arquivos de escrita.caminhos).
+    """
+    if relatorios is None:
+        relatorios = list(RELATORIOS)
+    for arquivo in relatorios:
+        if arquivo not in RELATORIOS:
+            raise ValueError(f"Relatório desconhecido: {arquivo}")
+    if secoes is None:
+        secoes = [t for arquivo in relatorios for _, tarefas in RELATORIOS[arquivo][1] for t in tarefas]
+    escolhidas = set(secoes)
+    # cada relatório com alguma seção escolhida leva o seu cabeçalho
+    for arquivo in relatorios:
+        cabecalho, partes = RELATORIOS[arquivo]
+        if any(t in escolhidas for _, tarefas in partes for t in tarefas):
+            escolhidas.add(cabecalho)
+    ordem = ordem_topologica(escolhidas)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(ordem)))
+
+    # carrega o grafo direcionado (ator -> diretor) e o não direcionado (ator <-> ator);
+    # na primeira execução lê o csv e salva snapshots em cache/, depois só mapeia
+    instrumentacao.limpar()
+    instrumentacao.configurar(log_ate=0)
+    with instrumentacao.etapa('carregar_grafos') as medida:
+        grafo_direcionado, grafo_nao_direcionado = grafos.load_graphs(arquivo_csv)
+        vertices, arestas_d = grafo_direcionado.get_numbers()
+        medida.contar('vertices', vertices)
+        medida.contar('arestas_direcionado', arestas_d)
+        medida.contar('arestas_nao_direcionado', grafo_nao_direcionado.get_numbers()[1])
+    ctx = {
+        'direcionado': grafo_direcionado,
+        'nao_direcionado': grafo_nao_direcionado,
+        'test_node': test_node,
+        'pasta': PASTA,
+        # com o pool já ocupando os núcleos, cada tarefa roda num processo só
+        'workers_internos': None if workers == 1 else 1,
+    }
+    resultados = _rodar(ordem, ctx, workers)
+
+    for arquivo in relatorios:
+        cabecalho, partes = RELATORIOS[arquivo]
+        if cabecalho not in resultados:
+            continue
+        caminho = os.path.join(PASTA, arquivo)
+        with open(caminho, "w", encoding="utf-8") as destino:
+            escrita.copiar(destino, PASTA, cabecalho)
+            for titulo, tarefas in partes:
+                feitas = [t for t in tarefas if t in resultados]
+                if feitas:
+                    destino.write(titulo)
+                for t in feitas:
+                    escrita.copiar(destino, PASTA, t)
+        print(f"Resultados salvos em '{caminho}'")
+    if linha_do_tempo:
+        instrumentacao.exportar_json(linha_do_tempo)
+        print(f"Linha do tempo salva em '{linha_do_tempo}'")
+    return resultados
+
+def ordem_topologica(escolhidas):
+    """
+    As tarefas escolhidas mais as suas dependências (transitivas), em uma
+    ordem em que cada tarefa vem depois das que ela depende.
+    """
+    ordem = []
+    estado = {} # 1: em visita, 2: pronta
+    for inicio in sorted(escolhidas):
+        if inicio not in TAREFAS:
+            raise ValueError(f"Seção desconhecida: {inicio}")
+        pilha = [(inicio, False)]
+        while pilha:
+            nome, pronta = pilha.pop()
+            if pronta:
+                estado[nome] = 2
+                ordem.append(nome)
+                continue
+            if estado.get(nome) == 2:
+                continue
+            if estado.get(nome) == 1:
+                raise ValueError(f"Dependência circular em: {nome}")
+            estado[nome] = 1
+            pilha.append((nome, True))
+            for dep in TAREFAS[nome][0]:
+                if dep not in TAREFAS:
+                    raise ValueError(f"Seção desconhecida: {dep}")
+                if estado.get(dep) != 2:
+                    pilha.append((dep, False))
+    return ordem
+
+def _rodar(ordem, ctx, workers):
+    resultados = {}
+    if workers == 1:
+        for nome in ordem:
+            resultados[nome] = _executar_tarefa(nome, ctx, resultados)
+        return resultados
+
+    faltam = {nome: set(TAREFAS[nome][0]) for nome in ordem}
+    metodos = multiprocessing.get_all_start_methods()
+    contexto = multiprocessing.get_context('fork' if 'fork' in metodos else None)
+    with concurrent.futures.ProcessPoolExecutor(workers, mp_context=contexto, initializer=_iniciar_worker,
+                                                initargs=(ctx, instrumentacao.configuracao())) as pool:
+        rodando = {}
+        while faltam or rodando:
+            # manda para o pool toda tarefa cujas dependências já terminaram
+            for nome in [n for n, deps in faltam.items() if not deps]:
+                del faltam[nome]
+                entradas = {d: resultados[d] for d in TAREFAS[nome][0]}
+                rodando[pool.submit(_tarefa_worker, nome, entradas)] = nome
+            prontas, _ = concurrent.futures.wait(rodando, return_when=concurrent.futures.FIRST_COMPLETED)
+            for futuro in prontas:
+                nome = rodando.pop(futuro)
+                # o worker devolve o resultado e as etapas que mediu
+                resultados[nome], eventos = futuro.result()
+                instrumentacao.registrar(eventos)
+                for deps in faltam.values():
+                    deps.discard(nome)
+    return resultados
+
+def _executar_tarefa(nome, ctx, resultados):
+    deps, funcao = TAREFAS[nome]
+    with instrumentacao.etapa(nome), escrita.secao(ctx['pasta'], nome) as saida:
+        return funcao(ctx, {d: resultados[d] for d in deps}, saida)
+
+_ctx_worker = None # contexto (grafos e opções) de cada processo do pool
+
+def _iniciar_worker(ctx, config):
+    global _ctx_worker
+    _ctx_worker = ctx
+    instrumentacao.configurar(**config)
+
+def _tarefa_worker(nome, entradas):
+    # só as etapas desta tarefa voltam para o processo principal
+    instrumentacao.limpar()
+    resultado = _executar_tarefa(nome, _ctx_worker, entradas)
+    return resultado, instrumentacao.eventos()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera os relatórios de análise dos grafos.")
+    parser.add_argument('--secoes', help="seções separadas por vírgula (padrão: todas)")
+    parser.add_argument('--relatorio', action='append', choices=list(RELATORIOS),
+                        help="arquivo a gerar (pode repetir; padrão: todos)")
+    parser.add_argument('--workers', type=int, default=None, help="processos (padrão: todos os núcleos)")
+    parser.add_argument('--csv', default=ARQUIVO_CSV)
+    parser.add_argument('--no', default=TEST_NODE, help="vértice de teste das seções de main.py")
+    parser.add_argument('--listar', action='store_true', help="mostra as seções e sai")
+    parser.add_argument('--linha-do-tempo', default=LINHA_DO_TEMPO, help="JSON com as etapas medidas")
+    parser.add_argument('--tracemalloc', action='store_true',
+                        help="mede também o pico de memória alocada (mais lento)")
+    args = parser.parse_args()
+
+    if args.listar:
+        for arquivo, (cabecalho, partes) in RELATORIOS.items():
+            print(arquivo)
+            for _, tarefas in partes:
+                for t in tarefas:
+                    deps = TAREFAS[t][0]
+                    print(f"  {t}" + (f" (depende de {', '.join(deps)})" if deps else ""))
+    else:
+        secoes = args.secoes.split(',') if args.secoes else None
+        instrumentacao.configurar(tracemalloc=args.tracemalloc)
+        executar(secoes, args.relatorio, args.workers, args.csv, args.no, args.linha_do_tempo)
@@ -0,0 +1,271 @@
+"""
+Servidor de consultas: carrega os grafos uma vez (snapshots de load_graphs)
+e responde perguntas sobre um vértice por HTTP, em JSON, na máquina local
+(TCP em 127.0.0.1 ou socket Unix).
+
+    python servidor.py                                  # http://127.0.0.1:8765
+    python servidor.py --socket /tmp/grafos.sock
+    curl 'http://127.0.0.1:8765/grau?no=BOB%20ODENKIRK'
+    curl --unix-socket /tmp/grafos.sock 'http://x/mst?no=BOB%20ODENKIRK&limite=20'
+
+Consultas (GET), todas com ?no=NOME, &grafo=direcionado (padrão:
+nao_direcionado) e &limite=N para cortar as listas:
+    /grau /proximidade /intermediacao /componente /mst /vizinhos
+    /separacao /caminho (cadeia até &destino=NOME, sem pesos ou de menor peso)
+/info mostra os grafos e o estado do cache; /limpar esvazia o cache.
+Erros também voltam em JSON ({"erro": ...}): 404 para consulta ou vértice
+desconhecido, 400 para parâmetro inválido (limite negativo, por exemplo)
+e 500 para falhas inesperadas.
+
+Os resultados por vértice ficam num cache LRU em memória (--cache), então
+uma pergunta repetida não refaz nenhuma conta. A intermediação é calculada
+para todos os vértices na primeira consulta (uma varredura de Brandes serve
+para todos) e depois é só leitura; com --aquecer ela é calculada em segundo
+plano logo ao iniciar.
+"""
+import algoritmos
+import argparse
+import functools
+import grafos
+import http.server
+import json
+import os
+import socketserver
+import threading
+import time
+import traceback
+import urllib.parse
+
+ARQUIVO_CSV = 'netflix_amazon_disney_titles.csv'
+PORTA = 8765
+TAMANHO_CACHE = 4096 # resultados por vértice guardados no LRU
+SEMENTE = 0 # amostra de fontes da intermediação: a mesma em toda execução (e reaproveitada do cache em disco)
+
+CONSULTAS = ('grau', 'proximidade', 'intermediacao', 'componente', 'mst', 'vizinhos', 'separacao', 'caminho')
+COM_DESTINO = ('separacao', 'caminho') # consultas sobre um par de vértices
+
+
+class Consultas:
+    """
+    Responde as consultas sobre os dois grafos, com cache LRU por
+    (consulta, grafo, vértice, destino). KeyError: vértice ou consulta desconhecidos;
+    ValueError: parâmetro inválido.
+    """
+
+    def __init__(self, grafo_direcionado, grafo_nao_direcionado, tamanho_cache=TAMANHO_CACHE,
+                 max_sources=500, workers=1):
+        self.grafos = {'direcionado': grafo_direcionado, 'nao_direcionado': grafo_nao_direcionado}
+        self.max_sources = max_sources
+        self.workers = workers
+        # estruturas montadas sob demanda, (tipo, grafo) -> valor: intermediação de
+        # todos os vértices, rótulos das componentes, floresta geradora mínima,
+        # marcos e índice reverso. Cada uma tem a sua trava, então uma consulta
+        # só espera pela estrutura que ela usa (nunca pela varredura de outra)
+        self._estruturas = {}
+        self._travas = {}
+        self._trava = threading.Lock() # protege só a criação das travas
+        self._consultar = functools.lru_cache(maxsize=tamanho_cache)(self._calcular)
+
+    def responder(self, consulta, parametros):
+        # dict JSON da consulta; listas cortadas em 'limite' (o cache guarda inteiras)
+        if consulta == 'info':
+            return self.info()
+        if consulta == 'limpar':
+            self.limpar()
+            return {'cache': 'vazio'}
+        if consulta not in CONSULTAS:
+            raise KeyError(f"Consulta desconhecida: {consulta}")
+        nome_grafo = parametros.get('grafo', 'nao_direcionado')
+        if nome_grafo not in self.grafos:
+            raise ValueError(f"Grafo desconhecido: {nome_grafo}")
+        if 'no' not in parametros:
+            raise ValueError("Falta o parâmetro 'no'")
+        no = grafos.to_upper(parametros['no'])
+        if self.grafos[nome_grafo].node_id(no) is None:
+            raise KeyError(f"Vértice não encontrado: {no}")
+        destino = None
+        if consulta in COM_DESTINO:
+            if 'destino' not in parametros:
+                raise ValueError("Falta o parâmetro 'destino'")
+            destino = grafos.to_upper(parametros['destino'])
+            if self.grafos[nome_grafo].node_id(destino) is None:
+                raise KeyError(f"Vértice não encontrado: {destino}")
+        try:
+            limite = int(parametros.get('limite', 100))
+        except ValueError:
+            raise ValueError("'limite' deve ser um inteiro")
+        if limite < 0:
+            raise ValueError("'limite' não pode ser negativo")
+
+        resposta = {'consulta': consulta, 'grafo': nome_grafo, 'no': no}
+        if destino is not None:
+            resposta['destino'] = destino
+        for chave, valor in self._consultar(consulta, nome_grafo, no, destino).items():
+            if isinstance(valor, list):
+                resposta[f"total_{chave}"] = len(valor)
+                valor = valor[:limite]
+            resposta[chave] = valor
+        return resposta
+
+    def _calcular(self, consulta, nome_grafo, no, destino):
+        grafo = self.grafos[nome_grafo]
+        i = grafo.node_id(no)
+        if consulta == 'grau':
+            resultado = {'centralidade': algoritmos.degree_centrality(grafo, no), 'grau': grafo.degree(i)}
+            if grafo.directed:
+                resultado['grau_entrada'] = grafo.in_degree(i)
+            return resultado
+        if consulta == 'proximidade':
+            return {'centralidade': algoritmos.closeness_centrality(grafo, [no])[no]}
+        if consulta == 'intermediacao':
+            return {'centralidade': self._intermediacao_de(nome_grafo)[i],
+                    'fontes': min(self.max_sources, len(grafo.names))}
+        if consulta == 'componente':
+            # rótulo compacto e estável da componente (no direcionado, a fracamente conexa)
+            rotulo, tamanhos = self._estrutura('rotulos', nome_grafo, algoritmos.rotular_conexas)
+            resultado = {'componente': rotulo[i], 'tamanho': tamanhos[rotulo[i]]}
+            if not grafo.directed:
+                resultado['vertices'] = sorted(algoritmos.get_component_nodes(grafo, no))
+            return resultado
+        if consulta == 'separacao':
+            cadeia = algoritmos.separacao(grafo, no, destino)
+            return {'graus': None if cadeia is None else len(cadeia) - 1, 'cadeia': cadeia or []}
+        if consulta == 'caminho':
+            marcos = None if grafo.directed else self._estrutura('marcos', nome_grafo, algoritmos.preparar_marcos)
+            cadeia, custo = algoritmos.caminho_ponderado(grafo, no, destino, marcos)
+            return {'custo': None if cadeia is None else custo, 'cadeia': cadeia or []}
+        if consulta == 'mst':
+            # a floresta fica guardada no grafo; mst_do_vertice só consulta
+            self._estrutura('floresta', nome_grafo, algoritmos.floresta_geradora_minima)
+            arestas, custo = algoritmos.mst_do_vertice(grafo, no)
+            return {'custo': custo, 'arestas': [list(a) for a in arestas]}
+        # vizinhos, do maior peso para o menor
+        nomes = grafo.names
+        resultado = {'vizinhos': [[nomes[j], w] for j, w in sorted(grafo.neighbors(i), key=lambda p: -p[1])]}
+        if grafo.directed:
+            self._estrutura('indice_reverso', nome_grafo, lambda g: g._reverse_index())
+            resultado['predecessores'] = [[nomes[j], w] for j, w in
+                                          sorted(grafo.predecessors(i), key=lambda p: -p[1])]
+        return resultado
+
+    def _estrutura(self, tipo, nome_grafo, montar):
+        # montar(grafo) roda uma vez por estrutura, com a trava só dela; o
+        # valor é publicado quando fica pronto (e vai para o dicionário da
+        # época em que começou, para limpar() não receber uma estrutura antiga)
+        estruturas = self._estruturas
+        chave = (tipo, nome_grafo)
+        if chave not in estruturas:
+            with self._trava:
+                trava = self._travas.setdefault(chave, threading.Lock())
+            with trava:
+                if chave not in estruturas:
+                    estruturas[chave] = montar(self.grafos[nome_grafo])
+        return estruturas[chave]
+
+    def _intermediacao_de(self, nome_grafo):
+        # uma varredura para todos os vértices, com a amostra de fontes fixa
+        return self._estrutura('intermediacao', nome_grafo, lambda grafo: algoritmos.betweenness_todos(
+            grafo, self.max_sources, self.workers, semente=SEMENTE))
+
+    def aquecer(self):
+        """
+        Calcula já a intermediação dos dois grafos (a consulta mais lenta).
+        Só as consultas de intermediação esperam por ela; as outras respondem
+        enquanto isso.
+        """
+        for nome_grafo in self.grafos:
+            self._intermediacao_de(nome_grafo)
+
+    def info(self):
+        cache = self._consultar.cache_info()
+        return {
+            'grafos': {nome: dict(zip(('vertices', 'arestas'), g.get_numbers())) for nome, g in self.grafos.items()},
+            'cache': {'acertos': cache.hits, 'faltas': cache.misses, 'itens': cache.currsize, 'maximo': cache.maxsize},
+            'consultas': list(CONSULTAS),
+            'estruturas': sorted(f"{tipo}/{nome_grafo}" for tipo, nome_grafo in self._estruturas),
+        }
+
+    def limpar(self):
+        """Esvazia o cache (ex.: depois de alterar os grafos com add_titles)."""
+        self._estruturas = {}
+        self._consultar.cache_clear()
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    # self.server.consultas é o objeto Consultas do servidor
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        inicio = time.perf_counter()
+        try:
+            corpo = self.server.consultas.responder(url.path.strip('/'), dict(urllib.parse.parse_qsl(url.query)))
+            status = 200
+        except KeyError as erro:
+            corpo, status = {'erro': erro.args[0]}, 404
+        except ValueError as erro:
+            corpo, status = {'erro': str(erro)}, 400
+        except Exception as erro:
+            # falha inesperada: responde em JSON e deixa o traceback no log
+            self.log_error("%s", traceback.format_exc())
+            corpo, status = {'erro': f"Erro interno: {erro!r}"}, 500
+        corpo['tempo_ms'] = round((time.perf_counter() - inicio) * 1000, 3)
+
+        dados = json.dumps(corpo, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(dados)))
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def address_string(self):
+        # no socket Unix o endereço do cliente é vazio
+        return self.client_address[0] if self.client_address else 'unix'
+
+
+class _ServidorUnix(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def criar_servidor(consultas, host='127.0.0.1', porta=PORTA, socket_unix=None):
+    """
+    Servidor HTTP (uma thread por conexão) que responde com consultas;
+    com socket_unix escuta nesse caminho em vez de host:porta.
+    Rode com serve_forever().
+    """
+    if socket_unix:
+        if os.path.exists(socket_unix):
+            os.remove(socket_unix) # socket antigo de uma execução anterior
+        servidor = _ServidorUnix(socket_unix, _Handler)
+    else:
+        servidor = http.server.ThreadingHTTPServer((host, porta), _Handler)
+    servidor.consultas = consultas
+    return servidor
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor de consultas sobre os grafos.")
+    parser.add_argument('--csv', default=ARQUIVO_CSV)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=PORTA)
+    parser.add_argument('--socket', help="caminho de um socket Unix (em vez de TCP)")
+    parser.add_argument('--cache', type=int, default=TAMANHO_CACHE, help="itens no cache LRU")
+    parser.add_argument('--max-fontes', type=int, default=500, help="fontes amostradas na intermediação")
+    parser.add_argument('--workers', type=int, default=1, help="processos da intermediação")
+    parser.add_argument('--aquecer', action='store_true',
+                        help="calcula a intermediação em segundo plano já ao iniciar")
+    args = parser.parse_args()
+
+    grafo_direcionado, grafo_nao_direcionado = grafos.load_graphs(args.csv)
+    consultas = Consultas(grafo_direcionado, grafo_nao_direcionado, args.cache, args.max_fontes, args.workers)
+    servidor = criar_servidor(consultas, args.host, args.porta, args.socket)
+    if args.aquecer:
+        threading.Thread(target=consultas.aquecer, daemon=True).start()
+    print(f"Respondendo em {args.socket or f'http://{args.host}:{args.porta}'} (Ctrl+C para parar)")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+        if args.socket and os.path.exists(args.socket):
+            os.remove(args.socket)
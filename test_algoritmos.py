@@ -0,0 +1,12 @@
+import algoritmos
+import grafos
+
+
+def test_mst_do_vertice_fora_do_grafo():
+    construtor = grafos.ConstrutorGrafo(directed=False)
+    construtor.add_casts([['A', 'B', 'C']])
+    grafo = construtor.build()
+    assert algoritmos.mst_do_vertice(grafo, 'NINGUEM') == ([], 0)
+    assert algoritmos.mst_do_vertice(grafo, 'NINGUEM', metodo='prim') == ([], 0)
+    arestas, custo = algoritmos.mst_do_vertice(grafo, 'A')
+    assert len(arestas) == 2 and custo == 2
@@ -0,0 +1,72 @@
+import algoritmos
+import cache_resultados
+import grafos
+import pytest
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache_resultados.configurar(diretorio=str(tmp_path))
+    yield tmp_path
+    cache_resultados.configurar(diretorio=cache_resultados.DIRETORIO)
+
+
+def _contador():
+    chamadas = []
+    def sorteio(amostras=10, semente=None):
+        chamadas.append(semente)
+        return amostras
+    return sorteio, chamadas
+
+
+def test_sem_semente_nao_guarda(cache):
+    sorteio, chamadas = _contador()
+    sorteio = cache_resultados.memorizar(semente='semente')(sorteio)
+    sorteio()
+    sorteio()
+    assert chamadas == [None, None]
+    assert cache_resultados.tamanho()[0] == 0
+
+
+def test_semente_entra_na_chave(cache):
+    sorteio, chamadas = _contador()
+    sorteio = cache_resultados.memorizar(semente='semente')(sorteio)
+    sorteio(semente=1)
+    sorteio(semente=1)
+    sorteio(semente=2)
+    assert chamadas == [1, 2]
+
+
+def test_versao_nova_invalida_os_pickles(cache, monkeypatch):
+    sorteio, chamadas = _contador()
+    cache_resultados.memorizar()(sorteio)(semente=1)
+    cache_resultados.memorizar()(sorteio)(semente=1)
+    monkeypatch.setattr(cache_resultados, 'VERSAO', cache_resultados.VERSAO + 1)
+    cache_resultados.memorizar()(sorteio)(semente=1)
+    assert chamadas == [1, 1]
+
+
+def test_mudar_um_modulo_dependente_invalida_os_pickles(cache, monkeypatch, tmp_path):
+    modulo = tmp_path / 'modulo_dependente.py'
+    modulo.write_text('X = 1\n')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(cache_resultados, 'MODULOS', ('modulo_dependente',))
+    sorteio, chamadas = _contador()
+    sorteio = cache_resultados.memorizar()(sorteio)
+    sorteio(semente=1)
+    sorteio(semente=1)
+    modulo.write_text('X = 2\n')
+    cache_resultados._hash_das_fontes.cache_clear()
+    sorteio(semente=1)
+    assert chamadas == [1, 1]
+
+
+def test_intermediacao_amostrada_com_semente(cache):
+    construtor = grafos.ConstrutorGrafo(directed=False)
+    construtor.add_casts([['A', 'B', 'C'], ['C', 'D'], ['D', 'E', 'F']])
+    grafo = construtor.build()
+    primeira = algoritmos.betweenness_todos(grafo, max_sources=3, semente=7)
+    assert cache_resultados.tamanho()[0] == 1
+    assert algoritmos.betweenness_todos(grafo, max_sources=3, semente=7) == primeira
+    algoritmos.betweenness_todos(grafo, max_sources=3)
+    assert cache_resultados.tamanho()[0] == 1
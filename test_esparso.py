@@ -0,0 +1,58 @@
+import pytest
+
+pytest.importorskip('scipy')
+
+import algoritmos
+import benchmark
+import cache_resultados
+import esparso
+import grafos
+
+
+@pytest.fixture(autouse=True)
+def sem_cache_em_disco():
+    cache_resultados.configurar(ativo=False)
+    yield
+    cache_resultados.configurar(ativo=True)
+    esparso.configurar(ativo=True)
+
+
+def _grafos(semente, n_titulos=300):
+    cast_list, director_list = benchmark.listas(benchmark.gerar_catalogo(n_titulos, semente=semente))
+    return grafos.undirected_graph(cast_list), grafos.directed_graph(cast_list, director_list)
+
+
+def _nos_dois_backends(grafo, calcular):
+    # (SciPy, Python puro), sem reaproveitar o que ficou guardado no grafo
+    resultados = []
+    for ativo in (True, False):
+        esparso.configurar(ativo=ativo)
+        grafo._derivados = {}
+        resultados.append(calcular(grafo))
+    grafo._derivados = {}
+    return resultados
+
+
+@pytest.mark.parametrize('semente', range(1, 6))
+def test_mesmos_resultados_com_e_sem_scipy(semente):
+    nao_direcionado, direcionado = _grafos(semente)
+    assert esparso.usar(nao_direcionado) and esparso.usar(direcionado)
+
+    for grafo in (nao_direcionado, direcionado):
+        com, sem = _nos_dois_backends(grafo, algoritmos.rotular_conexas)
+        assert com == sem
+    com, sem = _nos_dois_backends(direcionado, algoritmos.rotular_fortemente_conexas)
+    assert com == sem
+
+    # muitos pesos iguais: a ordem das arestas depende do desempate
+    com, sem = _nos_dois_backends(nao_direcionado, algoritmos.floresta_geradora_minima)
+    assert com['arestas'] == sem['arestas'] and com['custo'] == sem['custo']
+    assert list(com['componente']) == list(sem['componente'])
+
+    vertices = nao_direcionado.names[::7]
+    com, sem = _nos_dois_backends(nao_direcionado, lambda g: algoritmos.closeness_centrality(g, vertices))
+    assert com == sem
+
+    inicio = nao_direcionado.names[0]
+    com, sem = _nos_dois_backends(nao_direcionado, lambda g: algoritmos.get_component_nodes(g, inicio))
+    assert com == sem
@@ -0,0 +1,19 @@
+import grafos
+
+
+def test_componentes_consultadas_no_meio_da_leitura():
+    construtor = grafos.ConstrutorGrafo(directed=False)
+    construtor.add_casts([['A', 'B'], ['C', 'D']])
+    assert construtor.graph.n_components() == 4  # pares ainda não descarregados
+    construtor.add_casts([['B', 'C']])
+    grafo = construtor.build()
+    assert grafo.n_components() == 1
+    assert grafo.component_sizes() == {4: 1}
+
+
+def test_componentes_consultadas_no_meio_da_leitura_direcionado():
+    construtor = grafos.ConstrutorGrafo(directed=True)
+    construtor.add_credits([['A'], ['C']], [['X'], ['Y']])
+    construtor.graph.n_components()
+    construtor.add_credits([['A', 'C']], [['Z']])
+    assert construtor.build().n_components() == 1
@@ -0,0 +1,50 @@
+import algoritmos
+import escrita
+import pipeline
+import pytest
+
+
+def _fonte(ctx, entradas, saida):
+    assert entradas == {}
+    return [1]
+
+def _dobro(ctx, entradas, saida):
+    return entradas['fonte'] + [2]
+
+def _final(ctx, entradas, saida):
+    return entradas['dobro'] + [3]
+
+CADEIA = {
+    'final': (('dobro',), _final),
+    'dobro': (('fonte',), _dobro),
+    'fonte': ((), _fonte),
+}
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_dependencias_em_ordem_e_resultados_repassados(monkeypatch, tmp_path, workers):
+    monkeypatch.setattr(pipeline, 'TAREFAS', CADEIA)
+    ordem = pipeline.ordem_topologica({'final'})
+    assert ordem == ['fonte', 'dobro', 'final']
+    resultados = pipeline._rodar(ordem, {'pasta': str(tmp_path)}, workers)
+    assert resultados == {'fonte': [1], 'dobro': [1, 2], 'final': [1, 2, 3]}
+
+
+def test_secoes_de_componentes_usam_os_rotulos_compartilhados(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    with open('titulos.csv', 'w', encoding='utf-8') as arquivo:
+        arquivo.write('show_id,title,director,cast\n'
+                      's1,T1,D1,"A, B"\n'
+                      's2,T2,D2,"C, D"\n'
+                      's3,T3,D1,E\n')
+    resultados = pipeline.executar(['cc', 'cfc', 'distribuicao_componentes'], workers=2,
+                                   arquivo_csv='titulos.csv', test_node='A', linha_do_tempo=None)
+    rotulos = resultados['rotulos_componentes']
+    assert set(rotulos) == {'conexas', 'fracamente_conexas', 'fortemente_conexas'}
+
+    grafo_direcionado, grafo_nao_direcionado = pipeline.grafos.load_graphs('titulos.csv')
+    componentes = algoritmos.comp_conexas(grafo_nao_direcionado)
+    with open(escrita.caminhos(pipeline.PASTA, 'cc')[0], encoding='utf-8') as texto:
+        assert f"Número de componentes conexas: {len(componentes)}\n" in texto.read()
+    assert escrita.ler_array(pipeline.PASTA, 'distribuicao_componentes', 'tamanhos_fortemente_conexas') \
+        == rotulos['fortemente_conexas'][1]
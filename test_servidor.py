@@ -0,0 +1,84 @@
+import grafos
+import json
+import pytest
+import servidor
+import threading
+import urllib.error
+import urllib.request
+
+
+@pytest.fixture
+def consultas():
+    direcionado = grafos.ConstrutorGrafo(directed=True)
+    direcionado.add_credits([['A', 'B']], [['D']])
+    nao_direcionado = grafos.ConstrutorGrafo(directed=False)
+    nao_direcionado.add_casts([['A', 'B']])
+    return servidor.Consultas(direcionado.build(), nao_direcionado.build())
+
+
+@pytest.fixture
+def url(consultas):
+    http = servidor.criar_servidor(consultas, porta=0)
+    threading.Thread(target=http.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{http.server_address[1]}"
+    http.shutdown()
+    http.server_close()
+
+
+def _get(endereco):
+    try:
+        with urllib.request.urlopen(endereco) as resposta:
+            return resposta.status, json.load(resposta)
+    except urllib.error.HTTPError as erro:
+        return erro.code, json.load(erro)
+
+
+def test_limite_negativo(consultas, url):
+    with pytest.raises(ValueError):
+        consultas.responder('vizinhos', {'no': 'A', 'limite': '-1'})
+    status, corpo = _get(url + '/vizinhos?no=A&limite=-1')
+    assert status == 400 and 'negativo' in corpo['erro']
+    status, corpo = _get(url + '/vizinhos?no=A&limite=0')
+    assert status == 200 and corpo['vizinhos'] == [] and corpo['total_vizinhos'] == 1
+
+
+def test_erro_inesperado_vira_json_500(consultas, url, monkeypatch):
+    def falha(*args):
+        raise RuntimeError("quebrou")
+    monkeypatch.setattr(consultas, '_consultar', falha)
+    status, corpo = _get(url + '/grau?no=A')
+    assert status == 500 and 'quebrou' in corpo['erro']
+
+
+def test_aquecer_nao_trava_as_outras_consultas(consultas, monkeypatch):
+    liberar = threading.Event()
+    chamadas = []
+    comecou = threading.Event()
+    def varredura_lenta(grafo, max_sources=500, workers=1, chunk_size=16, fontes=None, semente=None):
+        chamadas.append(semente)
+        comecou.set()
+        liberar.wait(10)
+        return [0.5] * len(grafo.names)
+    monkeypatch.setattr(servidor.algoritmos, 'betweenness_todos', varredura_lenta)
+    aquecimento = threading.Thread(target=consultas.aquecer)
+    aquecimento.start()
+    try:
+        assert comecou.wait(10)
+        assert consultas.responder('grau', {'no': 'A'})['grau'] == 1
+        assert consultas.responder('componente', {'no': 'A', 'grafo': 'direcionado'})['tamanho'] == 3
+        # as respostas vieram com a varredura ainda rodando
+        assert aquecimento.is_alive()
+        assert 'intermediacao/direcionado' not in consultas.info()['estruturas']
+    finally:
+        liberar.set()
+        aquecimento.join()
+    assert consultas.responder('intermediacao', {'no': 'A'})['centralidade'] == 0.5
+    assert chamadas == [servidor.SEMENTE, servidor.SEMENTE]
+
+
+def test_componente_usa_o_rotulo_estavel(consultas):
+    grafo = consultas.grafos['nao_direcionado']
+    rotulo, tamanhos = servidor.algoritmos.rotular_conexas(grafo)
+    resposta = consultas.responder('componente', {'no': 'B'})
+    assert resposta['componente'] == rotulo[grafo.node_id('B')]
+    assert resposta['tamanho'] == 2 and resposta['vertices'] == ['A', 'B']